@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+from typing import Callable, Any, List
+
+from core.algorithm_ELCO.algo_01_LEAO import LEAO
+from core.algorithm_ELCO.algo_02_PGES import PGES
+from core.baseline_algorithms.offloading.baseline_algo_01_IoTOnly import IoTOnly
+from core.baseline_algorithms.offloading.baseline_algo_02_LocalSECOnly import LocalSECOnly
+from core.baseline_algorithms.offloading.baseline_algo_03_RandomOffloading import RandomOffloading
+from core.baseline_algorithms.offloading.baseline_algo_04_MyopicLEAO import MyopicLEAO
+from core.baseline_algorithms.offloading.baseline_algo_05_CostGreedyOffloading import CostGreedyOffloading
+from core.baseline_algorithms.scheduling.baseline_algo_06_NoScheduling import NoScheduling
+from core.baseline_algorithms.scheduling.baseline_algo_07_RandomScheduling import RandomScheduling
+from core.baseline_algorithms.scheduling.baseline_algo_08_RoundRobinScheduling import RoundRobinScheduling
+from core.baseline_algorithms.scheduling.baseline_algo_09_LeastLoadedFirstScheduling import LeastLoadedFirstScheduling
+from core.baseline_algorithms.scheduling.baseline_algo_10_MinExecutionTimeScheduling import MinExecutionTimeScheduling
+from core.baseline_algorithms.scheduling.baseline_algo_11_CostGreedyScheduling import CostGreedyScheduling
+from core.strategic_profile import StrategicProfile
+from core.system_state import SystemState
+
+OFFLOADING_ALGORITHMS = [IoTOnly, LocalSECOnly, RandomOffloading, MyopicLEAO, CostGreedyOffloading, LEAO]
+SCHEDULING_ALGORITHMS = [NoScheduling, RandomScheduling, RoundRobinScheduling, LeastLoadedFirstScheduling,
+                         MinExecutionTimeScheduling, CostGreedyScheduling, PGES]
+
+# 基准测试使用的固定随机种子，保证不同版本之间输入一致
+BENCH_SEED = 0
+
+# micro 基准中每次调用 get_cr_ik 的抽样函数数量
+CR_IK_SAMPLE = 1000
+
+
+@dataclass
+class BenchmarkCase:
+    name: str  # 基准名称，如 micro/get_cost
+    scale: str  # 数据集规模
+    fn: Callable[[Any], Any]  # 被测函数
+    setup: Callable[[], Any] | None = None  # 准备函数（不计时）
+    ops: int = 1  # 每次调用包含的操作数
+
+    @property
+    def key(self) -> str:
+        return f'{self.name}[{self.scale}]'
+
+
+# 热点函数的输入剖面：随机卸载 + 随机调度（固定种子），同时覆盖策略1/2/3
+def _hot_path_profile(ss: SystemState, alloc_method: str) -> StrategicProfile:
+    sp = RandomOffloading(ss, alloc_method, seed=BENCH_SEED).run()
+    return RandomScheduling(ss, sp, alloc_method, seed=BENCH_SEED).run()
+
+
+def micro_cases(ss: SystemState, scale: str, alloc_method: str = 'WF',
+                cost_max_tasks: int | None = None) -> List[BenchmarkCase]:
+    sp = _hot_path_profile(ss, alloc_method)
+    cases = []
+
+    # StrategicProfile.get_cost
+    if cost_max_tasks is None or ss.get_function_count() <= cost_max_tasks:
+        cases.append(BenchmarkCase('micro/get_cost', scale, lambda _: sp.get_cost(alloc_method=alloc_method)))
+
+    # StrategicProfile.get_cr_ik：抽样已卸载函数在其执行SEC上的资源分配
+    # 每次计时前使这些SEC的分配缓存失效，计时包含每个SEC一次分配向量的计算，而不只是缓存读取
+    pairs = [(ss.get_function_instance(func_id), sp.get_func_current_sec(func_id))
+             for func_id, _val in sp.strategy.items() if _val['offloading'] == 1][:CR_IK_SAMPLE]
+    if pairs:
+        members = {sec.id: func.id for func, sec in pairs}  # 每个SEC取一个成员，refresh_function 使该SEC的缓存失效
+
+        def _invalidate_allocations():
+            for func_id in members.values():
+                sp.refresh_function(func_id)
+
+        def _get_cr_ik(_):
+            for func, sec in pairs:
+                sp.get_cr_ik(func=func, sec=sec, alloc_method=alloc_method)
+
+        cases.append(BenchmarkCase('micro/get_cr_ik', scale, _get_cr_ik, setup=_invalidate_allocations,
+                                   ops=len(pairs)))
+
+    # SECNetwork.get_latency_and_bandwidth：所有有序SEC对
+    sec_ids = [sec.id for sec in ss.get_sec_list()]
+    sec_pairs = [(u, v) for u in sec_ids for v in sec_ids if u != v]
+    if sec_pairs:
+        def _get_latency_and_bandwidth(_):
+            for u, v in sec_pairs:
+                ss.sec_network.get_latency_and_bandwidth(u, v)
+
+        cases.append(BenchmarkCase('micro/get_latency_and_bandwidth', scale, _get_latency_and_bandwidth,
+                                   ops=len(sec_pairs)))
+    return cases
+
+
+def macro_cases(ss: SystemState, scale: str, alloc_method: str = 'WF',
+                algorithms: List[str] | None = None) -> List[BenchmarkCase]:
+    cases = []
+
+    # 卸载算法：从全IoT执行的剖面开始
+    for ALGO in OFFLOADING_ALGORITHMS:
+        if algorithms is not None and ALGO.__name__ not in algorithms:
+            continue
+        if ALGO is IoTOnly:
+            fn = lambda _, ALGO=ALGO: ALGO(ss, seed=BENCH_SEED).run()
+        else:
+            fn = lambda _, ALGO=ALGO: ALGO(ss, alloc_method, seed=BENCH_SEED).run()
+        cases.append(BenchmarkCase(f'macro/{ALGO.__name__}', scale, fn))
+
+    # 调度算法：每次计时都从同一个 LEAO 剖面的副本开始
+    schedulers = [ALGO for ALGO in SCHEDULING_ALGORITHMS if algorithms is None or ALGO.__name__ in algorithms]
+    if schedulers:
+        leao_sp = LEAO(ss, alloc_method).run()
+        for ALGO in schedulers:
+            fn = lambda sp, ALGO=ALGO: ALGO(ss, sp, alloc_method, seed=BENCH_SEED).run()
+            cases.append(BenchmarkCase(f'macro/LEAO+{ALGO.__name__}', scale, fn, setup=leao_sp.copy))
+    return cases
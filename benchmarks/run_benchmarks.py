@@ -0,0 +1,162 @@
+"""
+run_benchmarks.py
+
+Micro and macro benchmarks for ELCO_simulation.
+
+- micro: hot paths StrategicProfile.get_cost / get_cr_ik and SECNetwork.get_latency_and_bandwidth
+- macro: every offloading algorithm, and every scheduling algorithm on top of a LEAO profile
+
+Scales are the CSV datasets in config.DATASET_SIZES plus the in-memory config.SYNTHETIC_SIZES.
+Results are written as JSON and can be compared against a stored baseline; the process exits
+with status 1 when any benchmark median regresses by more than the threshold.
+
+Usage (from the project root, no network access needed):
+    python -m benchmarks.run_benchmarks --scales tiny,small --suite micro
+    python -m benchmarks.run_benchmarks --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.cases import micro_cases, macro_cases
+from benchmarks.timing import measure
+from config import DATASET_SIZES, SYNTHETIC_SIZES
+from utils.dataset_loader import load_scale
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             cwd=Path(__file__).resolve().parent, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare benchmark medians with a baseline.
+
+    Returns:
+        list: (key, baseline median, current median, ratio, status) rows, where status is one of
+        "regression", "improvement", "ok", "new" or "missing" (in the baseline but not measured in this run,
+        e.g. a renamed or crashed case; counted as a failure).
+    """
+    rows = []
+    for key, stats in results.items():
+        base = baseline.get(key)
+        if base is None:
+            rows.append((key, None, stats['median_s'], None, 'new'))
+            continue
+        ratio = stats['median_s'] / base['median_s'] if base['median_s'] > 0 else float('inf')
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append((key, base['median_s'], stats['median_s'], ratio, status))
+    for key, base in baseline.items():
+        if key not in results:
+            rows.append((key, base['median_s'], None, None, 'missing'))
+    return rows
+
+
+def run(scales, suites, repeat, warmup, max_time, cost_max_tasks, macro_max_tasks, algorithms) -> dict:
+    results = {}
+    for scale in scales:
+        print(f'============ 基准测试 {scale} ============')
+        ss = load_scale(scale)
+
+        cases = []
+        if 'micro' in suites:
+            cases += micro_cases(ss, scale, cost_max_tasks=cost_max_tasks)
+        if 'macro' in suites and (macro_max_tasks is None or ss.get_function_count() <= macro_max_tasks):
+            cases += macro_cases(ss, scale, algorithms=algorithms)
+
+        for case in cases:
+            stats = measure(case.fn, setup=case.setup, repeat=repeat, warmup=warmup, ops=case.ops,
+                            max_time=max_time)
+            results[case.key] = stats
+            print(f'{case.key:<60} median {stats["median_s"] * 1e3:>10.3f} ms  '
+                  f'p90 {stats["p90_s"] * 1e3:>10.3f} ms  {stats["ops_per_s"]:>12.1f} ops/s  (n={stats["repeat"]})')
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='ELCO micro/macro benchmarks')
+    parser.add_argument('--scales', default=','.join(list(DATASET_SIZES) + list(SYNTHETIC_SIZES)),
+                        help='comma separated scales from DATASET_SIZES / SYNTHETIC_SIZES')
+    parser.add_argument('--suite', default='micro,macro', help='comma separated suites: micro, macro')
+    parser.add_argument('--algorithms', default=None, help='comma separated algorithm class names for macro')
+    parser.add_argument('--repeat', type=int, default=5, help='timed repetitions per benchmark')
+    parser.add_argument('--warmup', type=int, default=1, help='untimed warm-up runs per benchmark')
+    parser.add_argument('--max-time', type=float, default=30.0, help='time budget per benchmark (s)')
+    parser.add_argument('--cost-max-tasks', type=int, default=10000,
+                        help='skip micro/get_cost on scales with more function tasks')
+    parser.add_argument('--macro-max-tasks', type=int, default=max(cfg['function_task']
+                                                                   for cfg in DATASET_SIZES.values()),
+                        help='skip macro benchmarks on scales with more function tasks')
+    parser.add_argument('--output', default=None, help='result JSON path (default: benchmarks/results/)')
+    parser.add_argument('--baseline', default=None,
+                        help='baseline JSON to compare against (run the same --scales/--suite as the baseline)')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed relative slowdown of the median')
+    parser.add_argument('--save-baseline', default=None, help='also write the results to this baseline path')
+    args = parser.parse_args(argv)
+
+    algorithms = args.algorithms.split(',') if args.algorithms else None
+    results = run(args.scales.split(','), args.suite.split(','), args.repeat, args.warmup, args.max_time,
+                  args.cost_max_tasks, args.macro_max_tasks, algorithms)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': _git_revision(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+        },
+        'results': results,
+    }
+
+    out_path = Path(args.output) if args.output else \
+        RESULTS_DIR / f'bench_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f'结果已写入: {out_path}')
+
+    if args.save_baseline:
+        Path(args.save_baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f'基线已写入: {args.save_baseline}')
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))['results']
+        rows = compare(results, baseline, args.threshold)
+        print(f'============ 与基线对比 (threshold {args.threshold * 100:.0f}%) ============')
+        for key, base, curr, ratio, status in rows:
+            base_str = f'{base * 1e3:.3f} ms' if base is not None else '-'
+            ratio_str = f'x{ratio:.3f}' if ratio is not None else '-'
+            curr_str = f'{curr * 1e3:.3f} ms' if curr is not None else '-'
+            print(f'{key:<60} {base_str:>14} -> {curr_str:>13}  {ratio_str:>8}  {status}')
+        regressions = [row for row in rows if row[4] == 'regression']
+        missing = [row for row in rows if row[4] == 'missing']
+        if regressions or missing:
+            print(f'❌ {len(regressions)} 项基准性能回退，{len(missing)} 项基线中的基准未运行')
+            return 1
+        print('✅ 没有性能回退')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
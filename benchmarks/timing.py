@@ -0,0 +1,63 @@
+import gc
+import math
+import time
+from typing import Callable, Any, List
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    # 线性插值的分位数，sorted_values 需已升序排列，q ∈ [0, 100]
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def measure(fn: Callable[[Any], Any], setup: Callable[[], Any] | None = None, repeat: int = 5, warmup: int = 1,
+            ops: int = 1, max_time: float | None = None) -> dict:
+    """
+    对 fn 计时：每次计时前调用 setup()（不计入耗时）并把返回值传给 fn，计时期间关闭 GC
+    :param fn: 被测函数
+    :param setup: 准备函数，返回 fn 的输入
+    :param repeat: 计时次数
+    :param warmup: 预热次数（不记录）
+    :param ops: fn 每次调用包含的操作数，用于计算 ops/s
+    :param max_time: 计时总预算(s)，超出后提前停止（至少保留一次计时）
+    :return: 统计结果
+    """
+    for _ in range(warmup):
+        fn(setup() if setup else None)
+
+    samples = []
+    budget_start = time.perf_counter()
+    for _ in range(repeat):
+        state = setup() if setup else None
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn(state)
+            samples.append(time.perf_counter() - start)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if max_time is not None and time.perf_counter() - budget_start > max_time:
+            break
+
+    samples.sort()
+    median = percentile(samples, 50)
+    mean = sum(samples) / len(samples)
+    stdev = math.sqrt(sum((s - mean) ** 2 for s in samples) / (len(samples) - 1)) if len(samples) > 1 else 0.0
+    return {
+        'repeat': len(samples),
+        'ops_per_call': ops,
+        'min_s': samples[0],
+        'median_s': median,
+        'mean_s': mean,
+        'stdev_s': stdev,
+        'p90_s': percentile(samples, 90),
+        'p99_s': percentile(samples, 99),
+        'max_s': samples[-1],
+        'ops_per_s': ops / median if median > 0 else float('inf'),
+    }
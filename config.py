@@ -70,3 +70,33 @@ RATIO = 1.5  # cr与m的比例，计算资源MHz=内存MB*r
 T_ref = 5  # 延迟归一化参考值(s)
 E_ref = 5  # 能耗归一化参考值(J=W*s)
 OMEGA = 0.5  # 延迟的权重
+
+# BWF（有上下界的注水算法）资源分配
+BWF_MIN_CR = 100  # 每个函数的最小计算资源 (MHz)，避免小函数分到极少资源导致 T_init 过大
+BWF_MAX_CR = 3200 * 8  # 每个函数的最大计算资源 (MHz)，单个容器最多使用 8 个核
+CR_GRANULARITY = 0  # 分配粒度 (MHz)，例如 3200 表示按整核分配；0 表示连续分配
+
+# 合成数据集（在内存中生成，不写CSV），用于基准测试与大规模实验
+SYNTHETIC_SIZES = {
+    "synth-1k": {
+        "seed": 45,
+        "bs_and_sec": 20,
+        "iot_device": 50,
+        "function_type": 20,
+        "function_task": 1000
+    },
+    "synth-10k": {
+        "seed": 46,
+        "bs_and_sec": 50,
+        "iot_device": 200,
+        "function_type": 30,
+        "function_task": 10000
+    },
+    "synth-100k": {
+        "seed": 47,
+        "bs_and_sec": 100,
+        "iot_device": 1000,
+        "function_type": 40,
+        "function_task": 100000
+    }
+}
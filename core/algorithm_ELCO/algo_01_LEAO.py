@@ -1,27 +1,42 @@
-import math
+from typing import Callable
 
+from core.allocation_policies import (EqualShare, FixedAllocation, LinearProportional, WaterFilling, WeightedShare,
+                                      get_policy)
+from core.anytime import AnytimeResult, AnytimeRun, ImprovementCallback
 from core.strategic_profile import StrategicProfile
 from core.system_models.cost_model import iot_execution, loc_sec_execution, norm_to_cost
+from core.system_models.network_model import FunctionTask
 from core.system_state import SystemState
-from config import *
 
 
 # Algorithm 1: Latency-Energy-Aware Offloading
 class LEAO:
-    def __init__(self, ss: SystemState, alloc_method: str = 'WF'):
+    def __init__(self, ss: SystemState, alloc_method: str = 'WF', seed: int | None = None):
         self.ss = ss
         self.sp = StrategicProfile(ss)  # 初始化一个策略
         self.alloc_method = alloc_method  # 使用的资源分配方法：ES-平均分配，LP-线性负载比例，WF-注水算法
+        self.policy = get_policy(alloc_method)  # 分配策略只解析一次
 
         # 函数列表
         self.func_lst = ss.get_function_list()
         self.func_lst = sorted(self.func_lst, key=lambda f: (f.invocations * f.workload), reverse=True)
 
+        self.anytime: AnytimeResult | None = None  # 最近一次运行的状态和进度
+
     def __repr__(self):
         return f'Algorithm {self.__class__.__name__} with {self.alloc_method} resource alloc method'
 
-    def run(self) -> StrategicProfile:
+    # deadline：时间预算 (s)，用完时停止，其余函数保持本地IoT执行；on_improvement：接受卸载决策时回调
+    def run(self, deadline: float | None = None, on_improvement: ImprovementCallback | None = None) -> StrategicProfile:
+        anytime = AnytimeRun(self.sp, deadline=deadline, on_improvement=on_improvement)
         for func in self.func_lst:
+            if anytime.expired():
+                break
+
+            # 内存约束：本地SEC放不下该函数的容器时保持本地IoT执行
+            if not self.sp.can_admit(func.id, self.ss.f2s_mapping(func.id), self.alloc_method):
+                continue
+
             # 计算 prev_cost
             prev_cost = self._calc_cost_with_global_resource_pool()
 
@@ -32,6 +47,9 @@ class LEAO:
             # 判断是否获得正收益，如果是负收益，则回退策略至本地IoT执行
             if prev_cost < after_cost:
                 self.sp.execution_on_iot(func.id)
+            else:
+                anytime.improved(after_cost)
+        self.anytime = anytime.finish()
         return self.sp
 
     # 将SEC侧看作一个全局资源池, 计算cost
@@ -40,6 +58,10 @@ class LEAO:
 
         # 计算总的资源池
         CR_total = self.ss.get_system_available_cr()
+        params = self.sp.params
+        cr_of = self._pool_allocation(CR_total, params)
+        if cr_of is None:
+            return float('inf')
 
         for func in self.func_lst:
             iot = self.ss.f2u_mapping(func.id)
@@ -48,36 +70,50 @@ class LEAO:
 
             # 策略1
             if strategy == 1:
-                latency, energy = iot_execution(func=func, iot=iot)
+                latency, energy = iot_execution(func=func, iot=iot, params=params)
             # 策略2
             elif strategy == 2:
-                # ES-平均分配资源
-                if self.alloc_method == 'ES':
-                    offload_count = self.sp.get_offload_count()
-                    cr_ik = CR_total / offload_count
-                # LP-线性负载比例
-                elif self.alloc_method == 'LP':
-                    total_workload = self.sp.get_offload_workload()
-                    func_workload = func.invocations * func.workload
-                    cr_ik = func_workload / total_workload * CR_total
-                # WF-注水算法
-                elif self.alloc_method == 'WF':
-                    total_workload_factor = self.sp.get_offload_workload_factor()
-                    func_workload_factor = math.sqrt(func.invocations * func.workload)
-                    cr_ik = func_workload_factor / total_workload_factor * CR_total
-                # FIXED-固定分配
-                else:
-                    offload_count = self.sp.get_offload_count()
-                    cr_ik = int(self.alloc_method.split('-')[1]) * RATIO
-                    if (cr_ik * offload_count) > CR_total:
-                        return float('inf')
-                latency, energy = loc_sec_execution(func=func, iot=iot, loc_sec=loc_sec, cr_ik=cr_ik)
+                latency, energy = loc_sec_execution(func=func, iot=iot, loc_sec=loc_sec, cr_ik=cr_of(func),
+                                                    params=params)
             # 没有策略3
             else:
                 raise KeyError
             # 计算归一化cost并累加
-            cost += norm_to_cost(latency=latency, energy=energy)
+            cost += norm_to_cost(latency=latency, energy=energy, params=params)
         return cost
 
+    # 全局资源池上已卸载函数的分配：返回 func -> cr_ik，FIXED 分配超出资源池时返回 None
+    def _pool_allocation(self, CR_total: float, params) -> Callable[[FunctionTask], float] | None:
+        policy = self.policy
+        offload_count = self.sp.get_offload_count()
+        if offload_count == 0:
+            return lambda func: 0.0
+
+        # ES-平均分配资源
+        if isinstance(policy, EqualShare):
+            cr_ik = CR_total / offload_count
+            return lambda func: cr_ik
+        # LP-线性负载比例 / WF-注水算法：按权重比例分配
+        if isinstance(policy, WeightedShare):
+            if isinstance(policy, LinearProportional):
+                total_weight = self.sp.get_offload_workload()
+            elif isinstance(policy, WaterFilling):
+                total_weight = self.sp.get_offload_workload_factor()
+            else:
+                total_weight = sum(policy.weight(func) for func in self.func_lst
+                                   if self.sp.get_func_strategy(func.id) == 2)
+            return lambda func: policy.weight(func) / total_weight * CR_total
+        # FIXED-固定分配
+        if isinstance(policy, FixedAllocation):
+            cr_ik = policy.nominal_cr(params)
+            if cr_ik * offload_count > CR_total:
+                return None
+            return lambda func: cr_ik
+
+        # 其他分配策略（如 BWF）：在全局资源池上一次算出所有已卸载函数的分配
+        offloaded = [func for func in self.func_lst if self.sp.get_func_strategy(func.id) == 2]
+        pool_cr = dict(zip((func.id for func in offloaded), policy.allocate(offloaded, CR_total, params)))
+        return lambda func: pool_cr[func.id]
+
     def get_cost(self):
         return self.sp.get_cost(alloc_method=self.alloc_method)
@@ -1,14 +1,18 @@
-from config import *
+from core.anytime import BUDGET_EXHAUSTED, MAX_ITER, AnytimeResult, AnytimeRun, ImprovementCallback
+from core.system_models.cost_model import pull_latency
 from core.strategic_profile import StrategicProfile
 from core.system_state import SystemState
 
 
 class PGES:
-    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF', max_iter: int = 100000):
+    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF', max_iter: int = 100000,
+                 seed: int | None = None, track_progress: bool = True, candidates=None):
         self.ss = ss
         self.sp = sp  # 接收一个已有的策略剖面
         self.alloc_method = alloc_method  # 使用的资源分配方法：ES-平均分配，LP-线性负载比例，WF-注水算法
         self.max_iter = max_iter  # 最大博弈迭代次数
+        self.track_progress = track_progress  # 是否在每次博弈动作后记录系统 cost（每次 O(N^2)）
+        self.candidates = candidates  # 可选：func -> 候选SEC列表，用于按区域限制博弈动作；默认所有SEC
 
         # 函数列表
         self.func_lst = ss.get_function_list()
@@ -19,10 +23,18 @@ class PGES:
         self.latency_cost_changes = []
         self.energy_cost_change = []
 
+        self.anytime: AnytimeResult | None = None  # 最近一次运行的状态和进度
+
     def __repr__(self):
         return f'Algorithm PGES with {self.alloc_method} resource alloc method'
 
-    def run(self) -> StrategicProfile:
+    # func_ids 不为空时，只让这些函数参与博弈（其余函数的策略保持不变），用于热启动的增量重优化
+    # deadline：时间预算 (s)，用完时返回各轮结束时 cost 最低的剖面；on_improvement：某轮结束时 cost 更低则回调
+    def run(self, func_ids=None, deadline: float | None = None,
+            on_improvement: ImprovementCallback | None = None) -> StrategicProfile:
+        anytime = AnytimeRun(self.sp, deadline=deadline, on_improvement=on_improvement, cost_fn=self.get_cost)
+        anytime.checkpoint()
+
         # 当前迭代次数
         iter_count = 0
 
@@ -35,11 +47,13 @@ class PGES:
             migrated = False  # 是否有协作改进（如果没有博弈改进动作，则达到了纳什均衡）
 
             # 遍历所有函数
-            for func_id, _val in self.sp.strategy.items():
+            for func_id in (self.sp.strategy if func_ids is None else func_ids):
                 # 跳过在本地IoT执行的函数
                 strategy = self.sp.get_func_strategy(func_id)
                 if strategy == 1:
                     continue
+                if anytime.expired():
+                    break
 
                 func = self.ss.get_function_instance(func_id)
                 iot = self.ss.f2u_mapping(func.id)
@@ -55,11 +69,8 @@ class PGES:
                     curr_T_s2s = (func.invocations * func.data_size) / bw + lat
 
                 # 2. 计算 T^cold
-                if func.func_type.id in curr_sec.cached_functions:
-                    curr_T_pull = 0.0
-                else:
-                    curr_T_pull = func.func_type.image_size / (curr_sec.backhaul_bw / 8)
-                curr_T_init = (SEC_CONT_INIT_EFFI * func.func_type.image_size) / curr_cr_ik
+                curr_T_pull = pull_latency(func=func, sec=curr_sec)
+                curr_T_init = (self.sp.params.sec_cont_init_effi * func.func_type.image_size) / curr_cr_ik
                 curr_T_cold = curr_T_pull + curr_T_init
 
                 # 3. 计算 T^exe
@@ -74,10 +85,14 @@ class PGES:
                 best_sec = curr_sec
 
                 # === （2）计算假想效用 ===
-                for hyp_sec in self.ss.get_sec_list():
+                for hyp_sec in (self.ss.get_sec_list() if self.candidates is None else self.candidates(func)):
                     if hyp_sec.id == curr_sec.id:
                         continue
 
+                    # 内存约束：目标SEC放不下该函数的容器时不考虑
+                    if not self.sp.can_admit(func.id, hyp_sec, self.alloc_method):
+                        continue
+
                     # 模拟卸载到目标sec，计算假想分配得到的资源
                     self.sp.schedule_to_target_sec(func_id=func.id, target_sec_id=hyp_sec.id)
                     hyp_cr_ik = self.sp.get_cr_ik(func=func, sec=hyp_sec, alloc_method=self.alloc_method)
@@ -91,11 +106,8 @@ class PGES:
                         hyp_T_s2s = (func.invocations * func.data_size) / bw + lat
 
                     # 2. 计算 T^cold
-                    if func.func_type.id in hyp_sec.cached_functions:
-                        hyp_T_pull = 0.0
-                    else:
-                        hyp_T_pull = func.func_type.image_size / (hyp_sec.backhaul_bw / 8)
-                    hyp_T_init = (SEC_CONT_INIT_EFFI * func.func_type.image_size) / hyp_cr_ik
+                    hyp_T_pull = pull_latency(func=func, sec=hyp_sec)
+                    hyp_T_init = (self.sp.params.sec_cont_init_effi * func.func_type.image_size) / hyp_cr_ik
                     hyp_T_cold = hyp_T_pull + hyp_T_init
 
                     # 3. 计算 T^exe
@@ -119,16 +131,25 @@ class PGES:
                     migrated = True
 
                     # 保存博弈过程中的cost变化、energy（参考值）变化、latency（参考值）变化
-                    self.cost_changes.append(self.get_cost())
-                    latency, energy = self.get_ref_latency_energy()
-                    self.latency_cost_changes.append(latency)
-                    self.energy_cost_change.append(energy)
+                    if self.track_progress:
+                        self.cost_changes.append(self.get_cost())
+                        latency, energy = self.get_ref_latency_energy()
+                        self.latency_cost_changes.append(latency)
+                        self.energy_cost_change.append(energy)
                     # print(f'* 博弈动作：函数{func.id} SEC{curr_sec.id}->SEC{best_sec.id}')
 
+            if anytime.status == BUDGET_EXHAUSTED:
+                break
+
             # 取得纳什均衡，结束博弈
             if not migrated:
                 converged = True
+            else:
+                anytime.checkpoint()
 
+        if not converged and anytime.status != BUDGET_EXHAUSTED:
+            anytime.status = MAX_ITER
+        self.anytime = anytime.finish()
         return self.sp
 
     def get_cost(self):
@@ -0,0 +1,110 @@
+import importlib
+import time
+
+import numpy as np
+
+from core.anytime import run_anytime
+
+# 算法注册表：名称（即类名） -> (模块路径, 算法类别)，只有在使用时才导入对应模块
+_ALGORITHMS = {
+    'IoTOnly': ('core.baseline_algorithms.offloading.baseline_algo_01_IoTOnly', 'offloading'),
+    'LocalSECOnly': ('core.baseline_algorithms.offloading.baseline_algo_02_LocalSECOnly', 'offloading'),
+    'RandomOffloading': ('core.baseline_algorithms.offloading.baseline_algo_03_RandomOffloading', 'offloading'),
+    'MyopicLEAO': ('core.baseline_algorithms.offloading.baseline_algo_04_MyopicLEAO', 'offloading'),
+    'CostGreedyOffloading': ('core.baseline_algorithms.offloading.baseline_algo_05_CostGreedyOffloading',
+                             'offloading'),
+    'LEAO': ('core.algorithm_ELCO.algo_01_LEAO', 'offloading'),
+    'NoScheduling': ('core.baseline_algorithms.scheduling.baseline_algo_06_NoScheduling', 'scheduling'),
+    'RandomScheduling': ('core.baseline_algorithms.scheduling.baseline_algo_07_RandomScheduling', 'scheduling'),
+    'RoundRobinScheduling': ('core.baseline_algorithms.scheduling.baseline_algo_08_RoundRobinScheduling',
+                             'scheduling'),
+    'LeastLoadedFirstScheduling': ('core.baseline_algorithms.scheduling.baseline_algo_09_LeastLoadedFirstScheduling',
+                                   'scheduling'),
+    'MinExecutionTimeScheduling': ('core.baseline_algorithms.scheduling.baseline_algo_10_MinExecutionTimeScheduling',
+                                   'scheduling'),
+    'CostGreedyScheduling': ('core.baseline_algorithms.scheduling.baseline_algo_11_CostGreedyScheduling',
+                             'scheduling'),
+    'PGES': ('core.algorithm_ELCO.algo_02_PGES', 'scheduling'),
+    'RegionPGES': ('core.region_decomposition', 'scheduling'),
+}
+
+# 论文中使用的缩写
+_ALIASES = {
+    'IOT': 'IoTOnly',
+    'LSO': 'LocalSECOnly',
+    'RAND-O': 'RandomOffloading',
+    'M-LEAO': 'MyopicLEAO',
+    'CGO': 'CostGreedyOffloading',
+    'NS': 'NoScheduling',
+    'RAND-S': 'RandomScheduling',
+    'RR': 'RoundRobinScheduling',
+    'LLF': 'LeastLoadedFirstScheduling',
+    'MET': 'MinExecutionTimeScheduling',
+    'CGS': 'CostGreedyScheduling',
+}
+
+
+# 把缩写解析为注册名称
+def resolve_algorithm_name(name: str) -> str:
+    name = _ALIASES.get(name.upper(), name)
+    if name not in _ALGORITHMS:
+        raise KeyError(f'未知的算法: {name}，可选: {", ".join(list_algorithms())}')
+    return name
+
+
+# 获取算法类（按需导入模块）
+def get_algorithm(name: str):
+    name = resolve_algorithm_name(name)
+    module_path, _ = _ALGORITHMS[name]
+    return getattr(importlib.import_module(module_path), name)
+
+
+# 获取算法类别：offloading / scheduling
+def get_algorithm_kind(name: str) -> str:
+    return _ALGORITHMS[resolve_algorithm_name(name)][1]
+
+
+def list_algorithms(kind: str | None = None) -> list:
+    return [name for name, (_, _kind) in _ALGORITHMS.items() if kind is None or _kind == kind]
+
+
+# 解析 "LEAO+PGES" 形式的算法流水线：一个卸载算法 + 任意个调度算法
+def parse_pipeline(spec: str) -> tuple:
+    names = tuple(resolve_algorithm_name(name.strip()) for name in spec.split('+'))
+    if get_algorithm_kind(names[0]) != 'offloading':
+        raise ValueError(f'流水线 {spec} 必须以卸载算法开头')
+    for name in names[1:]:
+        if get_algorithm_kind(name) != 'scheduling':
+            raise ValueError(f'流水线 {spec} 中 {name} 不是调度算法')
+    return names
+
+
+# 为流水线的每个阶段派生互不相关的随机种子（seed 为空时各阶段都不固定种子）。
+# 所有算法的构造函数都接受 seed 参数，以便统一实例化；确定性算法忽略它
+def stage_seeds(seed: int | None, stages: int) -> list:
+    if seed is None:
+        return [None] * stages
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(stages)]
+
+
+# 实例化并运行一条算法流水线，返回最后一个算法对象
+# deadline 不为空时整条流水线共享这个时间预算 (s)：每个阶段得到剩余的预算，支持的算法协作式停止（见 core/anytime.py）
+def run_pipeline(ss, pipeline: tuple, alloc_method: str = 'WF', seed: int | None = None,
+                 deadline: float | None = None):
+    start_time = time.perf_counter()
+
+    def _run(algo):
+        if deadline is None:
+            return algo.run()
+        return run_anytime(algo, deadline=max(0.0, deadline - (time.perf_counter() - start_time))).sp
+
+    seeds = stage_seeds(seed, len(pipeline))
+    ALGO_1 = get_algorithm(pipeline[0])
+    algo = ALGO_1(ss, seed=seeds[0]) if pipeline[0] == 'IoTOnly' else ALGO_1(ss, alloc_method, seed=seeds[0])
+    sp = _run(algo)
+    sp.enforce_memory(alloc_method)  # 启用内存约束时，把超出SEC内存的函数溢出到其他SEC或本地IoT
+    for name, stage_seed in zip(pipeline[1:], seeds[1:]):
+        algo = get_algorithm(name)(ss, sp, alloc_method, seed=stage_seed)
+        sp = _run(algo)
+        sp.enforce_memory(alloc_method)
+    return algo
@@ -0,0 +1,118 @@
+import math
+from functools import lru_cache
+from typing import Callable, Dict, List
+
+from core.system_models.network_model import FunctionTask
+from core.system_models.system_params import SystemParams
+from core.system_models.water_filling import bounded_water_filling
+
+
+class AllocationPolicy:
+    """
+    资源分配策略：一次算出一个SEC上所有函数分到的计算资源 cr_ik。
+    StrategicProfile 按 (SEC, 成员版本号) 缓存分配向量，成员不变时不会重复计算。
+    """
+    name = ''
+
+    def allocate(self, funcs: List[FunctionTask], capacity: float, params: SystemParams) -> List[float]:
+        """
+        :param funcs: SEC上的函数列表
+        :param capacity: SEC可分配的计算资源 CR_k (MHz)
+        :param params: 系统模型参数
+        :return: 与 funcs 顺序对应的 cr_ik (MHz)
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f'{self.__class__.__name__} ({self.name})'
+
+
+# 按权重比例分配：cr_ik = w_i / sum(w) * CR_k
+class WeightedShare(AllocationPolicy):
+    def weight(self, func: FunctionTask) -> float:
+        raise NotImplementedError
+
+    def allocate(self, funcs, capacity, params):
+        weights = [self.weight(func) for func in funcs]
+        total = sum(weights)
+        return [w / total * capacity for w in weights]
+
+
+# ES-平均分配资源
+class EqualShare(AllocationPolicy):
+    name = 'ES'
+
+    def allocate(self, funcs, capacity, params):
+        return [capacity / len(funcs)] * len(funcs)
+
+
+# LP-线性负载比例
+class LinearProportional(WeightedShare):
+    name = 'LP'
+
+    def weight(self, func):
+        return func.invocations * func.workload
+
+
+# WF-注水算法
+class WaterFilling(WeightedShare):
+    name = 'WF'
+
+    def weight(self, func):
+        return math.sqrt(func.invocations * func.workload)
+
+
+# BWF-有上下界的注水算法，每个函数的分配在 [min_cr, max_cr] 内，可按 cr_granularity 取整
+class BoundedWaterFilling(AllocationPolicy):
+    name = 'BWF'
+
+    def allocate(self, funcs, capacity, params):
+        weights = [math.sqrt(func.invocations * func.workload) for func in funcs]
+        lows = [params.bwf_min_cr if func.min_cr is None else func.min_cr for func in funcs]
+        highs = [params.bwf_max_cr if func.max_cr is None else func.max_cr for func in funcs]
+        return bounded_water_filling(weights, lows, highs, capacity, granularity=params.cr_granularity)
+
+
+# FIXED-固定分配：每个容器分配 mem (MB) * RATIO，SEC满载时不分资源（按 1 计，防止除 0）
+class FixedAllocation(AllocationPolicy):
+    def __init__(self, mem: int):
+        self.mem = mem
+        self.name = f'FIXED-{mem}'
+
+    def nominal_cr(self, params: SystemParams) -> float:
+        return self.mem * params.ratio
+
+    def allocate(self, funcs, capacity, params):
+        cr_ik = self.nominal_cr(params)
+        if cr_ik * len(funcs) > capacity:
+            cr_ik = 1
+        return [cr_ik] * len(funcs)
+
+
+# 分配策略注册表：名称 -> 工厂函数（参数为名称中 '-' 之后的部分，如 FIXED-256 的 '256'，没有时为 None）
+_POLICIES: Dict[str, Callable[[str | None], AllocationPolicy]] = {
+    'ES': lambda arg: EqualShare(),
+    'LP': lambda arg: LinearProportional(),
+    'WF': lambda arg: WaterFilling(),
+    'BWF': lambda arg: BoundedWaterFilling(),
+    'FIXED': lambda arg: FixedAllocation(int(arg)),
+}
+
+
+# 注册新的分配策略，例如 register_policy('PRIO', lambda arg: PriorityWeighted())
+def register_policy(name: str, factory: Callable[[str | None], AllocationPolicy]):
+    _POLICIES[name] = factory
+    get_policy.cache_clear()
+
+
+def list_policies() -> list:
+    return list(_POLICIES)
+
+
+# 解析资源分配方法名称（如 'WF'、'FIXED-256'），同一名称只解析一次
+@lru_cache(maxsize=None)
+def get_policy(alloc_method: str) -> AllocationPolicy:
+    name, _, arg = alloc_method.partition('-')
+    if name not in _POLICIES:
+        raise KeyError(f'未知的资源分配方法: {alloc_method}，可选: {", ".join(list_policies())}')
+    return _POLICIES[name](arg or None)
@@ -0,0 +1,120 @@
+import inspect
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+from core.strategic_profile import StrategicProfile
+
+# 运行状态
+CONVERGED = 'converged'  # 算法正常结束（贪心算法处理完所有函数，PGES 达到纳什均衡）
+BUDGET_EXHAUSTED = 'budget_exhausted'  # 时间预算用完，返回当前最优的剖面
+MAX_ITER = 'max_iter'  # PGES 达到最大博弈迭代次数仍未收敛
+
+# on_improvement(sp, cost)：得到更优的剖面时回调，cost 为算法自身的目标值
+ImprovementCallback = Callable[[StrategicProfile, float], None]
+
+
+@dataclass
+class AnytimeResult:
+    """一次带时间预算的运行结果"""
+    sp: StrategicProfile  # 最优（best-so-far）策略剖面
+    status: str  # CONVERGED / BUDGET_EXHAUSTED / MAX_ITER
+    cost: float | None  # 最优剖面的目标值（LEAO 为全局资源池上的 cost，其余为 get_cost），未跟踪或没有改进时为 None
+    steps: int  # 已处理的决策步数（卸载/调度算法为函数数，PGES 为最优响应数）
+    improvements: int  # 改进次数
+    elapsed: float  # 耗时 (s)
+
+
+class AnytimeRun:
+    """
+    协作式的时间预算：算法在每个决策步前调用 expired()，预算用完时停止并返回已有的最优剖面。
+
+    单调算法（LEAO、CostGreedyOffloading 只接受不增加 cost 的决策）的当前剖面始终是最优的，改进时调用 improved()；
+    非单调算法（PGES 的单个函数改进不保证系统 cost 下降，调度算法逐个改变函数位置）在检查点调用 checkpoint()，
+    只在 cost 更低时保存剖面快照，预算用完时若当前剖面更差则恢复为快照。
+    deadline 为从开始运行算起的秒数，None 表示不限时间；不限时间且没有回调时不计算检查点的 cost，结果与原算法相同。
+    """
+
+    def __init__(self, sp: StrategicProfile, deadline: float | None = None,
+                 on_improvement: ImprovementCallback | None = None, cost_fn: Callable[[], float] | None = None):
+        self.sp = sp
+        self.deadline = deadline
+        self.on_improvement = on_improvement
+        self.cost_fn = cost_fn  # 非单调算法：计算当前剖面的 cost
+        self.start_time = time.perf_counter()
+        self.status = CONVERGED
+        self.steps = 0
+        self.improvements = 0
+        self.best_cost: float | None = None
+        self._snapshot: Dict[int | str, int | str | None] | None = None  # func_id -> 执行SEC id（None 为本地IoT）
+
+    # 是否需要跟踪最优剖面（有时间预算或回调时）
+    @property
+    def tracking(self) -> bool:
+        return self.deadline is not None or self.on_improvement is not None
+
+    def expired(self) -> bool:
+        if self.deadline is not None and time.perf_counter() - self.start_time >= self.deadline:
+            self.status = BUDGET_EXHAUSTED
+            return True
+        self.steps += 1
+        return False
+
+    # 单调算法：当前剖面是新的最优剖面
+    def improved(self, cost: float):
+        self.best_cost = cost
+        self.improvements += 1
+        if self.on_improvement is not None:
+            self.on_improvement(self.sp, cost)
+
+    # 非单调算法的检查点：cost 更低时保存快照（第一次调用记录初始剖面）
+    def checkpoint(self):
+        if not self.tracking:
+            return
+        cost = self.cost_fn()
+        if self.best_cost is not None and cost >= self.best_cost:
+            return
+        initial = self.best_cost is None
+        self.best_cost = cost
+        self._snapshot = {func_id: _val['scheduling'] for func_id, _val in self.sp.strategy.items()}
+        if not initial:
+            self.improvements += 1
+            if self.on_improvement is not None:
+                self.on_improvement(self.sp, cost)
+
+    # 结束运行：预算用完且当前剖面比快照差时恢复快照；正常结束时保留算法的最终剖面（与不限时间的结果相同）
+    def finish(self) -> AnytimeResult:
+        if self._snapshot is not None:
+            cost = self.cost_fn()
+            if self.status == BUDGET_EXHAUSTED and cost > self.best_cost:
+                self._restore()
+            else:
+                if cost < self.best_cost:
+                    self.improvements += 1
+                    if self.on_improvement is not None:
+                        self.on_improvement(self.sp, cost)
+                self.best_cost = cost
+        return AnytimeResult(sp=self.sp, status=self.status, cost=self.best_cost, steps=self.steps,
+                             improvements=self.improvements, elapsed=time.perf_counter() - self.start_time)
+
+    # 把策略剖面恢复为快照（通过 setter，保持成员索引和分配缓存一致）
+    def _restore(self):
+        for func_id, sec_id in self._snapshot.items():
+            if self.sp.strategy[func_id]['scheduling'] == sec_id:
+                continue
+            if sec_id is None:
+                self.sp.execution_on_iot(func_id)
+            else:
+                self.sp.schedule_to_target_sec(func_id=func_id, target_sec_id=sec_id)
+
+
+# 以统一接口运行任意算法：支持时间预算的算法（run 接受 deadline）协作式停止，其余算法完整运行
+def run_anytime(algo, deadline: float | None = None, on_improvement: ImprovementCallback | None = None,
+                **run_kwargs) -> AnytimeResult:
+    if 'deadline' in inspect.signature(algo.run).parameters:
+        algo.run(deadline=deadline, on_improvement=on_improvement, **run_kwargs)
+        return algo.anytime
+    start_time = time.perf_counter()
+    sp = algo.run(**run_kwargs)
+    return AnytimeResult(sp=sp, status=CONVERGED, cost=None, steps=len(sp.strategy), improvements=0,
+                         elapsed=time.perf_counter() - start_time)
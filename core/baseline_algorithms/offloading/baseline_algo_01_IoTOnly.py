@@ -4,7 +4,7 @@ from core.system_state import SystemState
 
 # 所有任务本地IoT执行
 class IoTOnly:
-    def __init__(self, ss: SystemState):
+    def __init__(self, ss: SystemState, seed: int | None = None):
         self.ss = ss
         self.sp = StrategicProfile(ss)  # 初始化一个策略
 
@@ -4,7 +4,7 @@ from core.system_state import SystemState
 
 # 所有任务卸载至本地SEC
 class LocalSECOnly:
-    def __init__(self, ss: SystemState, alloc_method: str = 'WF'):
+    def __init__(self, ss: SystemState, alloc_method: str = 'WF', seed: int | None = None):
         self.ss = ss
         self.sp = StrategicProfile(ss)  # 初始化一个策略
         self.alloc_method = alloc_method  # 使用的资源分配方法：ES-平均分配，LP-线性负载比例，WF-注水算法
@@ -5,10 +5,11 @@ import random
 
 # 随机卸载决策
 class RandomOffloading:
-    def __init__(self, ss: SystemState, alloc_method: str = 'WF'):
+    def __init__(self, ss: SystemState, alloc_method: str = 'WF', seed: int | None = None):
         self.ss = ss
         self.sp = StrategicProfile(ss)  # 初始化一个策略
         self.alloc_method = alloc_method  # 使用的资源分配方法：ES-平均分配，LP-线性负载比例，WF-注水算法
+        self.rng = random.Random(seed)  # 实例自己的随机数流，不依赖全局 random 状态
 
         # 函数列表
         self.func_lst = ss.get_function_list()
@@ -18,7 +19,7 @@ class RandomOffloading:
 
     def run(self) -> StrategicProfile:
         for func in self.func_lst:
-            if random.choice([0, 1]) == 0:
+            if self.rng.choice([0, 1]) == 0:
                 self.sp.execution_on_iot(func.id)
             else:
                 self.sp.offload_to_loc_sec(func.id)
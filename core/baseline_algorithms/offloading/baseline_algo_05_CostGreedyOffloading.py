@@ -1,10 +1,11 @@
+from core.anytime import CONVERGED, AnytimeResult, AnytimeRun, ImprovementCallback
 from core.system_state import SystemState
 from core.strategic_profile import StrategicProfile
 
 
 # 在每个步骤进行详尽的搜索后，迭代地卸载单个最佳任务，Cost贪心卸载
 class CostGreedyOffloading:
-    def __init__(self, ss: SystemState, alloc_method: str = 'WF'):
+    def __init__(self, ss: SystemState, alloc_method: str = 'WF', seed: int | None = None):
         self.ss = ss
         self.sp = StrategicProfile(ss)  # 初始化一个策略
         self.alloc_method = alloc_method  # 使用的资源分配方法：ES-平均分配，LP-线性负载比例，WF-注水算法
@@ -12,17 +13,25 @@ class CostGreedyOffloading:
         # 函数列表
         self.func_lst = ss.get_function_list()
 
+        self.anytime: AnytimeResult | None = None  # 最近一次运行的状态和进度
+
     def __repr__(self):
         return f'Algorithm {self.__class__.__name__} with {self.alloc_method} resource alloc method'
 
-    def run(self) -> StrategicProfile:
+    # deadline：时间预算 (s)，用完时放弃本轮未完成的搜索；on_improvement：每卸载一个函数时回调
+    def run(self, deadline: float | None = None, on_improvement: ImprovementCallback | None = None) -> StrategicProfile:
+        anytime = AnytimeRun(self.sp, deadline=deadline, on_improvement=on_improvement)
         func_lst = self.func_lst.copy()
         while len(func_lst):
             # 记录待卸载任务的收益
             cost_benefit = {}
+            after_costs = {}
 
             # 迭代每个任务，计算每个任务卸载的潜在 cost 收益
             for func in func_lst:
+                if anytime.expired():
+                    break
+
                 # 计算 prev_cost
                 prev_cost = self.get_cost()
 
@@ -33,6 +42,10 @@ class CostGreedyOffloading:
 
                 # 记录cost收益
                 cost_benefit[func.id] = prev_cost - after_cost
+                after_costs[func.id] = after_cost
+
+            if anytime.status != CONVERGED:
+                break
 
             # 选择收益最高的函数任务
             max_benefit_func_id = max(cost_benefit, key=cost_benefit.get)
@@ -42,10 +55,12 @@ class CostGreedyOffloading:
             if max_benefit > 0:
                 self.sp.offload_to_loc_sec(max_benefit_func_id)
                 func_lst.remove(self.ss.get_function_instance(max_benefit_func_id))
+                anytime.improved(after_costs[max_benefit_func_id])
             # 如果收益为负，则说明无改进空间
             else:
                 break
 
+        self.anytime = anytime.finish()
         return self.sp
 
     def get_cost(self):
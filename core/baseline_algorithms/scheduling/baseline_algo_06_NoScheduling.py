@@ -3,7 +3,7 @@ from core.strategic_profile import StrategicProfile
 
 
 class NoScheduling:
-    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF'):
+    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF', seed: int | None = None):
         self.ss = ss
         self.sp = sp  # 接收一个已有的策略剖面
         self.alloc_method = alloc_method  # 使用的资源分配方法：ES-平均分配，LP-线性负载比例，WF-注水算法
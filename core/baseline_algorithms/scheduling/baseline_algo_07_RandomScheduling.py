@@ -6,10 +6,11 @@ from core.strategic_profile import StrategicProfile
 
 
 class RandomScheduling:
-    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF'):
+    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF', seed: int | None = None):
         self.ss = ss
         self.sp = sp  # 接收一个已有的策略剖面
         self.alloc_method = alloc_method  # 使用的资源分配方法：ES-平均分配，LP-线性负载比例，WF-注水算法
+        self.rng = random.Random(seed)  # 实例自己的随机数流，不依赖全局 random 状态
 
         # 函数列表
         self.func_lst = ss.get_function_list()
@@ -20,15 +21,18 @@ class RandomScheduling:
     def run(self) -> StrategicProfile:
         # SEC服务器列表
         sec_lst = self.ss.get_sec_list()
-        random.shuffle(sec_lst)
+        self.rng.shuffle(sec_lst)
 
         for func in self.func_lst:
             strategy = self.sp.get_func_strategy(func.id)
             if strategy == 1:
                 continue
 
-            # 如果函数被卸载到SEC侧，则调度到随机的SEC服务器
-            random_sec: SECServer = random.choice(sec_lst)
+            # 如果函数被卸载到SEC侧，则调度到随机的SEC服务器（只在内存能容纳的SEC中选择）
+            candidates = [sec for sec in sec_lst if self.sp.can_admit(func.id, sec, self.alloc_method)]
+            if not candidates:
+                continue
+            random_sec: SECServer = self.rng.choice(candidates)
             self.sp.schedule_to_target_sec(func_id=func.id, target_sec_id=random_sec.id)
 
         return self.sp
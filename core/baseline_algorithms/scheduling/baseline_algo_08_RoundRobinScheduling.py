@@ -6,10 +6,11 @@ from core.system_state import SystemState
 
 # 轮询算法的负载均衡调度
 class RoundRobinScheduling:
-    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF'):
+    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF', seed: int | None = None):
         self.ss = ss
         self.sp = sp  # 接收一个已有的策略剖面
         self.alloc_method = alloc_method  # 使用的资源分配方法：ES-平均分配，LP-线性负载比例，WF-注水算法
+        self.rng = random.Random(seed)  # 实例自己的随机数流，不依赖全局 random 状态
 
         # 函数列表
         self.func_lst = ss.get_function_list()
@@ -20,7 +21,7 @@ class RoundRobinScheduling:
     def run(self) -> StrategicProfile:
         # SEC服务器列表
         sec_lst = self.ss.get_sec_list()
-        random.shuffle(sec_lst)
+        self.rng.shuffle(sec_lst)
 
         # 轮询服务器的编号
         sec_idx = 0
@@ -30,9 +31,16 @@ class RoundRobinScheduling:
             if strategy == 1:
                 continue
 
-            # 轮询选择一个目标SEC
-            target_sec = sec_lst[sec_idx]
-            sec_idx = (sec_idx + 1) % len(sec_lst)
+            # 轮询选择一个目标SEC（跳过内存不能容纳的SEC，都不能容纳时保持原有决策）
+            target_sec = None
+            for _ in range(len(sec_lst)):
+                sec = sec_lst[sec_idx]
+                sec_idx = (sec_idx + 1) % len(sec_lst)
+                if self.sp.can_admit(func.id, sec, self.alloc_method):
+                    target_sec = sec
+                    break
+            if target_sec is None:
+                continue
 
             # 调度到轮询的SEC中
             self.sp.schedule_to_target_sec(func.id, target_sec.id)
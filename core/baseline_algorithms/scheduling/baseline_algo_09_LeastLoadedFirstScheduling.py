@@ -1,10 +1,11 @@
+from core.anytime import AnytimeResult, AnytimeRun, ImprovementCallback
 from core.strategic_profile import StrategicProfile
 from core.system_state import SystemState
 
 
 # 最小负载优先的负载均衡调度
 class LeastLoadedFirstScheduling:
-    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF'):
+    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF', seed: int | None = None):
         self.ss = ss
         self.sp = sp  # 接收一个已有的策略剖面
         self.alloc_method = alloc_method  # 使用的资源分配方法：ES-平均分配，LP-线性负载比例，WF-注水算法
@@ -12,22 +13,33 @@ class LeastLoadedFirstScheduling:
         # 函数列表
         self.func_lst = ss.get_function_list()
 
+        self.anytime: AnytimeResult | None = None  # 最近一次运行的状态和进度
+
     def __repr__(self):
         return f'Algorithm {self.__class__.__name__} with {self.alloc_method} resource alloc method'
 
-    def run(self) -> StrategicProfile:
+    # deadline：时间预算 (s)，用完时停止，若当前剖面比输入剖面差则恢复输入剖面；on_improvement：结束时 cost 更低则回调
+    def run(self, deadline: float | None = None, on_improvement: ImprovementCallback | None = None) -> StrategicProfile:
+        anytime = AnytimeRun(self.sp, deadline=deadline, on_improvement=on_improvement, cost_fn=self.get_cost)
+        anytime.checkpoint()
         for func in self.func_lst:
             strategy = self.sp.get_func_strategy(func.id)
             if strategy == 1:
                 continue
+            if anytime.expired():
+                break
 
-            # 选择一个当前负载最低的SEC
-            sec_workload = {sec.id: self.sp.get_sec_workload(sec) for sec in self.ss.get_sec_list()}
+            # 选择一个当前负载最低的SEC（只在内存能容纳的SEC中选择）
+            sec_workload = {sec.id: self.sp.get_sec_workload(sec) for sec in self.ss.get_sec_list()
+                            if self.sp.can_admit(func.id, sec, self.alloc_method)}
+            if not sec_workload:
+                continue
             target_sec_id = min(sec_workload, key=sec_workload.get)
 
             # 调度到负载最低的SEC
             self.sp.schedule_to_target_sec(func_id=func.id, target_sec_id=target_sec_id)
 
+        self.anytime = anytime.finish()
         return self.sp
 
     def get_cost(self):
@@ -1,3 +1,4 @@
+from core.anytime import AnytimeResult, AnytimeRun, ImprovementCallback
 from core.strategic_profile import StrategicProfile
 from core.system_models.cost_model import loc_sec_execution
 from core.system_state import SystemState
@@ -5,7 +6,7 @@ from core.system_state import SystemState
 
 # 最小执行时间优先的调度
 class MinExecutionTimeScheduling:
-    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF'):
+    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF', seed: int | None = None):
         self.ss = ss
         self.sp = sp  # 接收一个已有的策略剖面
         self.alloc_method = alloc_method  # 使用的资源分配方法：ES-平均分配，LP-线性负载比例，WF-注水算法
@@ -13,14 +14,21 @@ class MinExecutionTimeScheduling:
         # 函数列表
         self.func_lst = ss.get_function_list()
 
+        self.anytime: AnytimeResult | None = None  # 最近一次运行的状态和进度
+
     def __repr__(self):
         return f'Algorithm {self.__class__.__name__} with {self.alloc_method} resource alloc method'
 
-    def run(self) -> StrategicProfile:
+    # deadline：时间预算 (s)，用完时停止，若当前剖面比输入剖面差则恢复输入剖面；on_improvement：结束时 cost 更低则回调
+    def run(self, deadline: float | None = None, on_improvement: ImprovementCallback | None = None) -> StrategicProfile:
+        anytime = AnytimeRun(self.sp, deadline=deadline, on_improvement=on_improvement, cost_fn=self.get_cost)
+        anytime.checkpoint()
         for func in self.func_lst:
             strategy = self.sp.get_func_strategy(func.id)
             if strategy == 1:
                 continue
+            if anytime.expired():
+                break
 
             # 计算当前函数在每个SEC的执行时间
             execution_time = {}
@@ -28,6 +36,10 @@ class MinExecutionTimeScheduling:
                 iot = self.ss.f2u_mapping(func.id)
                 curr_sec = self.sp.get_func_current_sec(func.id)
 
+                # 内存约束：不考虑放不下该函数容器的SEC（当前SEC除外）
+                if sec.id != curr_sec.id and not self.sp.can_admit(func.id, sec, self.alloc_method):
+                    continue
+
                 # 计算该函数在每个sec上分配的计算资源
                 if sec.id == curr_sec.id:
                     cr_ik = self.sp.get_cr_ik(func=func, sec=sec, alloc_method=self.alloc_method)
@@ -46,6 +58,7 @@ class MinExecutionTimeScheduling:
             # 调度到执行时间最小的SEC
             self.sp.schedule_to_target_sec(func_id=func.id, target_sec_id=target_sec_id)
 
+        self.anytime = anytime.finish()
         return self.sp
 
     def get_cost(self):
@@ -1,5 +1,6 @@
 import random
 
+from core.anytime import AnytimeResult, AnytimeRun, ImprovementCallback
 from core.strategic_profile import StrategicProfile
 from core.system_models.cost_model import loc_sec_execution, norm_to_cost
 from core.system_state import SystemState
@@ -7,7 +8,7 @@ from core.system_state import SystemState
 
 # Cost优先贪心调度
 class CostGreedyScheduling:
-    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF'):
+    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF', seed: int | None = None):
         self.ss = ss
         self.sp = sp  # 接收一个已有的策略剖面
         self.alloc_method = alloc_method  # 使用的资源分配方法：ES-平均分配，LP-线性负载比例，WF-注水算法
@@ -15,14 +16,21 @@ class CostGreedyScheduling:
         # 函数列表
         self.func_lst = ss.get_function_list()
 
+        self.anytime: AnytimeResult | None = None  # 最近一次运行的状态和进度
+
     def __repr__(self):
         return f'Algorithm {self.__class__.__name__} with {self.alloc_method} resource alloc method'
 
-    def run(self) -> StrategicProfile:
+    # deadline：时间预算 (s)，用完时停止，若当前剖面比输入剖面差则恢复输入剖面；on_improvement：结束时 cost 更低则回调
+    def run(self, deadline: float | None = None, on_improvement: ImprovementCallback | None = None) -> StrategicProfile:
+        anytime = AnytimeRun(self.sp, deadline=deadline, on_improvement=on_improvement, cost_fn=self.get_cost)
+        anytime.checkpoint()
         for func in self.func_lst:
             strategy = self.sp.get_func_strategy(func.id)
             if strategy == 1:
                 continue
+            if anytime.expired():
+                break
 
             # 计算当前函数在每个SEC的cost
             cost_in_each_sec = {}
@@ -30,6 +38,10 @@ class CostGreedyScheduling:
                 iot = self.ss.f2u_mapping(func.id)
                 curr_sec = self.sp.get_func_current_sec(func.id)
 
+                # 内存约束：不考虑放不下该函数容器的SEC（当前SEC除外）
+                if sec.id != curr_sec.id and not self.sp.can_admit(func.id, sec, self.alloc_method):
+                    continue
+
                 # 计算该函数在每个sec上分配的计算资源
                 if sec.id == curr_sec.id:
                     cr_ik = self.sp.get_cr_ik(func=func, sec=sec, alloc_method=self.alloc_method)
@@ -39,8 +51,8 @@ class CostGreedyScheduling:
                     cr_ik = self.sp.get_cr_ik(func=func, sec=sec, alloc_method=self.alloc_method)
                     self.sp.schedule_to_target_sec(func_id=func.id, target_sec_id=curr_sec.id)
 
-                latency, energy = loc_sec_execution(func=func, iot=iot, loc_sec=sec, cr_ik=cr_ik)
-                cost = norm_to_cost(latency=latency, energy=energy)
+                latency, energy = loc_sec_execution(func=func, iot=iot, loc_sec=sec, cr_ik=cr_ik, params=self.sp.params)
+                cost = norm_to_cost(latency=latency, energy=energy, params=self.sp.params)
                 cost_in_each_sec[sec.id] = cost
 
             # 选择最小cost的SEC
@@ -49,6 +61,7 @@ class CostGreedyScheduling:
             # 调度到该SEC
             self.sp.schedule_to_target_sec(func_id=func.id, target_sec_id=target_sec_id)
 
+        self.anytime = anytime.finish()
         return self.sp
 
     def get_cost(self):
@@ -0,0 +1,159 @@
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set
+
+from core.system_models.container_cache import ContainerCache
+from core.system_state import SystemState
+
+
+@dataclass
+class PlacementResult:
+    """镜像预放置的结果"""
+    placement: Dict[int | str, Set[int | str]]  # SEC id -> 预缓存的函数类型id集合
+    pull_before: float  # 预放置前（不缓存任何镜像）的期望拉取延迟 (s)
+    pull_after: float  # 预放置后的期望拉取延迟 (s)
+    evaluations: int  # 计算边际收益的次数
+    wall_time: float
+    used: Dict[int | str, float] = field(default_factory=dict)  # SEC id -> 已用缓存容量 (MB)
+
+
+class CachePlacement:
+    """
+    在每个SEC的内存预算内选择预缓存的函数类型镜像，最小化期望拉取延迟。
+
+    函数 i（类型 t，本地SEC j）的延迟按设施选址模型计算：
+    - 本地SEC缓存了 t：0；
+    - 否则取 min(在本地SEC拉取镜像 I_t / (bw_bh_j / 8), 到缓存了 t 的SEC k 的传输延迟 T^s2s_jk)。
+    目标函数（拉取延迟的减少量）是单调子模的，按“边际收益 / 镜像大小”贪心选择 (SEC, 类型)，
+    lazy=True 时用 CELF 惰性求值：边际收益只会减少，堆顶的旧收益重新计算后仍最大即可直接选中。
+    """
+
+    def __init__(self, ss: SystemState, budget_ratio: float = 0.05, budgets: Dict | None = None,
+                 func_ids: Iterable[int | str] | None = None, lazy: bool = True):
+        self.ss = ss
+        self.lazy = lazy
+        # 每个SEC的缓存预算 (MB)，默认为内存的 budget_ratio（与容器缓存的默认容量相同）
+        self.budgets = budgets if budgets is not None else {
+            sec.id: sec.memory * budget_ratio for sec in ss.get_sec_list()
+        }
+        self.func_ids = list(ss.functions) if func_ids is None else list(func_ids)
+        self.evaluations = 0
+
+    def __repr__(self):
+        mode = 'lazy greedy' if self.lazy else 'greedy'
+        return f'{self.__class__.__name__} ({mode})'
+
+    # 按函数类型分组：每个函数的候选延迟 {SEC id: 由该SEC提供镜像时的延迟}，以及当前延迟（初始为本地拉取延迟）
+    def _build(self):
+        ss = self.ss
+        self.demand: Dict[int | str, List[dict]] = {}
+        self.current: Dict[int | str, List[float]] = {}
+        for func_id in self.func_ids:
+            func = ss.get_function_instance(func_id)
+            loc_sec = ss.f2s_mapping(func_id)
+            pull = func.func_type.image_size / (loc_sec.backhaul_bw / 8)
+            candidates = {loc_sec.id: 0.0}
+            for sec in ss.get_sec_list():
+                if sec.id == loc_sec.id:
+                    continue
+                lat, bw = ss.sec_network.get_latency_and_bandwidth(loc_sec.id, sec.id)
+                if lat and bw:
+                    T_s2s = (func.invocations * func.data_size) / (bw / 8) + lat
+                    if T_s2s < pull:
+                        candidates[sec.id] = T_s2s
+            self.demand.setdefault(func.func_type.id, []).append(candidates)
+            self.current.setdefault(func.func_type.id, []).append(pull)
+
+    # 在 sec_id 上缓存 type_id 的边际收益（期望拉取延迟的减少量）
+    def _gain(self, type_id, sec_id) -> float:
+        self.evaluations += 1
+        gain = 0.0
+        for candidates, curr in zip(self.demand[type_id], self.current[type_id]):
+            lat = candidates.get(sec_id)
+            if lat is not None and lat < curr:
+                gain += curr - lat
+        return gain
+
+    def _commit(self, type_id, sec_id):
+        current = self.current[type_id]
+        for n, candidates in enumerate(self.demand[type_id]):
+            lat = candidates.get(sec_id)
+            if lat is not None and lat < current[n]:
+                current[n] = lat
+
+    def _expected_pull(self) -> float:
+        return sum(sum(lst) for lst in self.current.values())
+
+    def run(self) -> PlacementResult:
+        start_time = time.perf_counter()
+        self.evaluations = 0
+        self._build()
+        pull_before = self._expected_pull()
+
+        image_size = {type_id: self.ss.function_types[type_id]['instance'].image_size for type_id in self.demand}
+        remaining = dict(self.budgets)
+        placement = {sec.id: set() for sec in self.ss.get_sec_list()}
+
+        # 候选 (SEC, 类型)：只考虑至少有一个函数能从中受益的组合
+        candidates = {(type_id, sec_id) for type_id, lst in self.demand.items() for c in lst for sec_id in c}
+
+        if self.lazy:
+            heap = [(-self._gain(t, k) / image_size[t], t, k) for t, k in candidates]
+            heapq.heapify(heap)
+            while heap:
+                _, t, k = heapq.heappop(heap)
+                if image_size[t] > remaining[k]:
+                    continue
+                ratio = self._gain(t, k) / image_size[t]
+                if ratio <= 0:
+                    continue
+                if heap and ratio < -heap[0][0]:
+                    heapq.heappush(heap, (-ratio, t, k))  # 收益已过期，放回堆中
+                    continue
+                self._commit(t, k)
+                placement[k].add(t)
+                remaining[k] -= image_size[t]
+        else:
+            while candidates:
+                best, best_ratio = None, 0.0
+                for t, k in list(candidates):
+                    if image_size[t] > remaining[k]:
+                        candidates.discard((t, k))
+                        continue
+                    ratio = self._gain(t, k) / image_size[t]
+                    if ratio > best_ratio:
+                        best, best_ratio = (t, k), ratio
+                if best is None:
+                    break
+                t, k = best
+                candidates.discard(best)
+                self._commit(t, k)
+                placement[k].add(t)
+                remaining[k] -= image_size[t]
+
+        used = {sec_id: self.budgets[sec_id] - remaining[sec_id] for sec_id in placement}
+        return PlacementResult(placement=placement, pull_before=pull_before, pull_after=self._expected_pull(),
+                               evaluations=self.evaluations, wall_time=time.perf_counter() - start_time, used=used)
+
+
+# 把预放置结果写回每个SEC的 cached_functions；启用了容器缓存的SEC按新的集合重新预热
+def apply_placement(ss: SystemState, placement: Dict[int | str, Set[int | str]]):
+    for sec in ss.get_sec_list():
+        sec.cached_functions = set(placement.get(sec.id, ()))
+        if sec.container_cache is not None:
+            cache = ContainerCache(sec.container_cache.capacity, sec.container_cache.policy)
+            for type_id in sorted(sec.cached_functions):
+                cache.put(ss.function_types[type_id]['instance'])
+            sec.container_cache = cache
+
+
+# 按当前 cached_functions 计算期望拉取延迟（与 CachePlacement 的目标函数相同），用于比较不同的放置
+def expected_pull_latency(ss: SystemState, func_ids: Iterable[int | str] | None = None) -> float:
+    model = CachePlacement(ss, budgets={}, func_ids=func_ids)
+    model._build()
+    for sec in ss.get_sec_list():
+        for type_id in sec.cached_functions:
+            if type_id in model.demand:
+                model._commit(type_id, sec.id)
+    return model._expected_pull()
@@ -0,0 +1,212 @@
+import time
+from typing import Dict, List
+
+from core.allocation_policies import EqualShare, FixedAllocation, WeightedShare, get_policy
+from core.strategic_profile import StrategicProfile
+from core.streaming import ResourcePool, StreamingEvaluator, offload_gain, pool_entry
+from core.system_models.cost_model import pull_latency
+from core.system_models.network_model import FunctionTask
+from core.system_state import SystemState
+
+
+class TaskClass:
+    """任务等价类：函数类型、关联IoT设备、d_i、c_i、n_i 都相同的函数任务，对 cost 模型而言可以互换"""
+    __slots__ = ('func', 'iot_id', 'func_ids')
+
+    def __init__(self, func: FunctionTask, iot_id: int | str):
+        self.func = func  # 代表函数
+        self.iot_id = iot_id
+        self.func_ids: List[int | str] = []  # 类中所有函数的id
+
+    def __repr__(self):
+        return f'TaskClass x{self.multiplicity}: {self.func}, IoT {self.iot_id}'
+
+    @property
+    def multiplicity(self) -> int:
+        return len(self.func_ids)
+
+
+# 把系统状态中的函数任务按 (函数类型, IoT设备, d_i, c_i, n_i) 分组
+def compress_tasks(ss: SystemState) -> List[TaskClass]:
+    classes: Dict[tuple, TaskClass] = {}
+    for func_id, _val in ss.functions.items():
+        func = _val['instance']
+        iot_id = _val['associated_iot_id']
+        key = (func.func_type.id, iot_id, func.data_size, func.workload, func.invocations)
+        task_class = classes.get(key)
+        if task_class is None:
+            task_class = classes[key] = TaskClass(func, iot_id)
+        task_class.func_ids.append(func_id)
+    return list(classes.values())
+
+
+class CompressedProfile:
+    """等价类上的策略剖面：每个类在各执行位置上的函数个数（None 表示本地IoT执行）"""
+
+    def __init__(self, ss: SystemState, classes: List[TaskClass]):
+        self.ss = ss
+        self.classes = classes
+        self.placement: List[Dict[int | str | None, int]] = [{None: c.multiplicity} for c in classes]
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}: {len(self.classes)} classes, {self.ss.get_function_count()} tasks'
+
+    def move(self, class_idx: int, src: int | str | None, dst: int | str | None, count: int = 1):
+        counts = self.placement[class_idx]
+        counts[src] -= count
+        if counts[src] == 0:
+            del counts[src]
+        counts[dst] = counts.get(dst, 0) + count
+
+    # 按类的个数计算 cost（与展开后的 StrategicProfile.get_cost 相同，浮点误差内）
+    def evaluate(self, alloc_method: str = 'WF') -> StreamingEvaluator:
+        evaluator = StreamingEvaluator(self.ss, alloc_method=alloc_method)
+        for task_class, counts in zip(self.classes, self.placement):
+            for sec_id, count in counts.items():
+                evaluator.add(task_class.func, task_class.iot_id, sec_id, count=count)
+        return evaluator
+
+    # 展开为逐函数的策略剖面：类中的函数按id顺序依次分配到各执行位置
+    def expand(self) -> StrategicProfile:
+        sp = StrategicProfile(self.ss)
+        for task_class, counts in zip(self.classes, self.placement):
+            func_ids = iter(task_class.func_ids)
+            for sec_id, count in counts.items():
+                for _ in range(count):
+                    func_id = next(func_ids)
+                    if sec_id is not None:
+                        sp.schedule_to_target_sec(func_id=func_id, target_sec_id=sec_id)
+        return sp
+
+
+# 等价类上的 LEAO：按负载降序处理每个类，把类中的函数逐个卸载到本地SEC，直到收益不再为正
+# 全局资源池的聚合量 O(1) 更新，所以每个类的代价与类的个数成正比，而与总任务数无关
+class CompressedLEAO:
+    def __init__(self, ss: SystemState, classes: List[TaskClass] | None = None, alloc_method: str = 'WF',
+                 seed: int | None = None):
+        self.ss = ss
+        self.alloc_method = alloc_method
+        self.cp = CompressedProfile(ss, compress_tasks(ss) if classes is None else classes)
+        self.wall_time = 0.0
+
+    def __repr__(self):
+        return f'Algorithm {self.__class__.__name__} with {self.alloc_method} resource alloc method'
+
+    def run(self) -> CompressedProfile:
+        start_time = time.perf_counter()
+        params = self.ss.params
+        pool = ResourcePool(self.ss.get_system_available_cr())
+        order = sorted(range(len(self.cp.classes)),
+                       key=lambda i: self.cp.classes[i].func.invocations * self.cp.classes[i].func.workload,
+                       reverse=True)
+        for i in order:
+            task_class = self.cp.classes[i]
+            func = task_class.func
+            iot = self.ss.iot_devices[task_class.iot_id]['instance']
+            loc_sec = self.ss.u2s_mapping(task_class.iot_id)
+            entry = pool_entry(func, self.alloc_method, params)
+            for _ in range(task_class.multiplicity):
+                delta = offload_gain(pool, func, iot, loc_sec, self.alloc_method, params)
+                if delta is None or delta > 0:
+                    break
+                pool.add(*entry)
+                self.cp.move(i, None, loc_sec.id)
+        self.wall_time = time.perf_counter() - start_time
+        return self.cp
+
+    def get_cost(self):
+        return self.cp.evaluate(self.alloc_method).get_cost()
+
+
+# 等价类上的 PGES：博弈者是“类 c 在SEC k 上的一组函数”，每次把其中一个函数移到效用最大的SEC，
+# 效用与 PGES 相同（T_d2s + T_s2s + T_cold + T_exe），cr_ik 由每个SEC资源池的聚合量 O(1) 算出
+class CompressedPGES:
+    def __init__(self, ss: SystemState, cp: CompressedProfile, alloc_method: str = 'WF', max_iter: int = 100000,
+                 seed: int | None = None):
+        policy = get_policy(alloc_method)
+        if not isinstance(policy, (EqualShare, WeightedShare, FixedAllocation)):
+            raise ValueError(f'等价类博弈只支持 ES/LP/WF/FIXED 资源分配，不支持 {alloc_method}')
+        self.ss = ss
+        self.cp = cp  # 接收一个已有的等价类策略剖面
+        self.alloc_method = alloc_method
+        self.policy = policy  # 分配策略只解析一次
+        self.max_iter = max_iter
+        self.wall_time = 0.0
+
+    def __repr__(self):
+        return f'Algorithm {self.__class__.__name__} with {self.alloc_method} resource alloc method'
+
+    # 函数在资源池中（已包含自身）分到的计算资源
+    def _cr_ik(self, pool: ResourcePool, weight: float) -> float:
+        if isinstance(self.policy, EqualShare):
+            return pool.cr / pool.count
+        if isinstance(self.policy, WeightedShare):
+            return weight / pool.weight * pool.cr
+        cr_ik = self.policy.nominal_cr(self.ss.params)
+        return 1 if cr_ik * pool.count > pool.cr else cr_ik
+
+    def _utility(self, func: FunctionTask, loc_sec_id, sec, cr_ik: float, T_d2s: float) -> float:
+        T_s2s = 0.0
+        if sec.id != loc_sec_id:
+            lat, bw = self.ss.sec_network.get_latency_and_bandwidth(loc_sec_id, sec.id)
+            T_s2s = (func.invocations * func.data_size) / bw + lat
+        T_cold = pull_latency(func=func, sec=sec) + \
+            (self.ss.params.sec_cont_init_effi * func.func_type.image_size) / cr_ik
+        T_exe = (func.invocations * func.workload) / cr_ik
+        return -(T_d2s + T_s2s + T_cold + T_exe)
+
+    def run(self) -> CompressedProfile:
+        start_time = time.perf_counter()
+        params = self.ss.params
+        secs = self.ss.get_sec_list()
+        pools = {sec.id: ResourcePool(self.ss.get_sec_available_cr(sec)) for sec in secs}
+        entries = [pool_entry(c.func, self.alloc_method, params) for c in self.cp.classes]
+        for entry, counts in zip(entries, self.cp.placement):
+            for sec_id, count in counts.items():
+                if sec_id is not None:
+                    pools[sec_id].add(*entry, count)
+
+        order = sorted(range(len(self.cp.classes)),
+                       key=lambda i: self.cp.classes[i].func.invocations * self.cp.classes[i].func.workload,
+                       reverse=True)
+        iter_count = 0
+        converged = False
+        while iter_count < self.max_iter and not converged:
+            iter_count += 1
+            migrated = False
+            for i in order:
+                task_class = self.cp.classes[i]
+                func = task_class.func
+                work, weight = entries[i]
+                iot = self.ss.iot_devices[task_class.iot_id]['instance']
+                loc_sec_id = self.ss.u2s_mapping(task_class.iot_id).id
+                T_d2s = (func.invocations * func.data_size) / (iot.uplink_rate / 8)
+
+                for curr_sec in [s for s in secs if s.id in self.cp.placement[i]]:
+                    # 组内的函数逐个做最优响应，直到没有改进
+                    while self.cp.placement[i].get(curr_sec.id, 0) > 0:
+                        pool = pools[curr_sec.id]
+                        u_best = self._utility(func, loc_sec_id, curr_sec, self._cr_ik(pool, weight), T_d2s)
+                        best_sec = curr_sec
+                        for hyp_sec in secs:
+                            if hyp_sec.id == curr_sec.id:
+                                continue
+                            hyp_pool = pools[hyp_sec.id]
+                            hyp_pool.add(work, weight)
+                            u_hyp = self._utility(func, loc_sec_id, hyp_sec, self._cr_ik(hyp_pool, weight), T_d2s)
+                            hyp_pool.remove(work, weight)
+                            if u_hyp > u_best:
+                                u_best, best_sec = u_hyp, hyp_sec
+                        if best_sec.id == curr_sec.id:
+                            break
+                        pool.remove(work, weight)
+                        pools[best_sec.id].add(work, weight)
+                        self.cp.move(i, curr_sec.id, best_sec.id)
+                        migrated = True
+            if not migrated:
+                converged = True
+        self.wall_time = time.perf_counter() - start_time
+        return self.cp
+
+    def get_cost(self):
+        return self.cp.evaluate(self.alloc_method).get_cost()
@@ -0,0 +1,95 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Tuple
+
+
+class DecisionCache:
+    """
+    决策记忆化：按 (任务签名, 负载桶) 缓存在线决策（执行SEC id，None 表示本地IoT执行），
+    反复出现的任务签名直接查表，不再计算卸载收益和 PGES 效用。
+
+    负载按几何桶划分：桶号为 floor(log(load) / log(1 + bucket_width))（空载为 None），同一个桶内负载相差不超过
+    bucket_width 的比例。每个条目登记它依赖的SEC（本地SEC和执行SEC），某个SEC的负载跨越桶边界时只让这些条目失效。
+    条目按 LRU 淘汰（最多 capacity 个），ttl 不为空时超过 ttl 秒的条目也视为过期。
+    """
+
+    def __init__(self, capacity: int = 65536, ttl: float | None = None, bucket_width: float = 0.1):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.bucket_width = bucket_width
+        self._log_base = math.log1p(bucket_width)
+        self._entries: OrderedDict = OrderedDict()  # key -> (value, 写入时刻, 依赖的SEC id)
+        self._by_sec: Dict[Hashable, set] = {}  # sec_id -> 依赖该SEC的 key
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # LRU 淘汰
+        self.expirations = 0  # TTL 过期
+        self.invalidations = 0  # 负载跨越桶边界而失效的条目
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}: {len(self)} entries, hit ratio {self.hit_ratio:.2%}'
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def bucket(self, load: float) -> int | None:
+        if load <= 0:
+            return None
+        return math.floor(math.log(load) / self._log_base)
+
+    # 查询：返回 (是否命中, 缓存的决策)
+    def get(self, key: Hashable) -> Tuple[bool, Hashable]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        if self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+            self._drop(key)
+            self.expirations += 1
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def put(self, key: Hashable, value: Hashable, secs: Iterable[Hashable] = ()):
+        if key in self._entries:
+            self._drop(key)
+        deps = tuple(sec_id for sec_id in dict.fromkeys(secs) if sec_id is not None)
+        self._entries[key] = (value, time.monotonic(), deps)
+        for sec_id in deps:
+            self._by_sec.setdefault(sec_id, set()).add(key)
+        while len(self._entries) > self.capacity:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    # SEC的负载跨越桶边界：使依赖该SEC的条目失效
+    def invalidate_sec(self, sec_id: Hashable) -> int:
+        keys = self._by_sec.pop(sec_id, set())
+        for key in keys:
+            self._drop(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self):
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._by_sec.clear()
+
+    def _drop(self, key: Hashable):
+        _, _, deps = self._entries.pop(key)
+        for sec_id in deps:
+            keys = self._by_sec.get(sec_id)
+            if keys is not None:
+                keys.discard(key)
+
+    def metrics(self) -> dict:
+        return {'entries': len(self), 'hits': self.hits, 'misses': self.misses, 'hit_ratio': self.hit_ratio,
+                'evictions': self.evictions, 'expirations': self.expirations, 'invalidations': self.invalidations}
@@ -0,0 +1,218 @@
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from config import FUNC
+from core.algorithm_ELCO.algo_01_LEAO import LEAO
+from core.algorithm_ELCO.algo_02_PGES import PGES
+from core.anytime import CONVERGED
+from core.strategic_profile import StrategicProfile
+from core.streaming import ResourcePool, StreamingEvaluator, offload_gain, pool_entry
+from core.system_models.network_model import FunctionTask
+from core.system_state import SystemState
+
+
+@dataclass
+class WorkloadDelta:
+    """一个时间步（epoch）内的负载变化"""
+    arrivals: List[Tuple[FunctionTask, int | str]] = field(default_factory=list)  # 新到达的 (函数, 关联IoT设备id)
+    departures: List[int | str] = field(default_factory=list)  # 离开的函数id
+    rate_changes: Dict[int | str, int] = field(default_factory=dict)  # 函数id -> 新的调用次数 n_i
+    handovers: Dict[int | str, int | str] = field(default_factory=dict)  # IoT设备id -> 切换到的基站id
+
+
+@dataclass
+class EpochReport:
+    """一个时间步的结果"""
+    epoch: int
+    func_count: int
+    arrivals: int
+    departures: int
+    rate_changes: int
+    handovers: int
+    affected: int  # 参与重优化的函数数
+    decision_time: float  # 重优化耗时 (s)
+    migrations: int  # 执行位置（IoT / SEC）发生变化的存量函数数
+    cost: float
+    offload_ratio: float
+    status: str = CONVERGED  # 重优化的运行状态（有决策时间预算时可能为 budget_exhausted）
+
+
+class DynamicSimulator:
+    """
+    按时间步应用负载变化，并在上一时间步的策略剖面上热启动重优化。
+
+    warm_start=True：第一个时间步对全部函数决策；之后只对新到达、调用次数变化和所属IoT设备切换了本地SEC的函数重新做卸载决策
+    （LEAO 的全局资源池收益，资源池聚合量 O(1) 更新），再只让这些函数参与 PGES 博弈；其余函数保持原有决策。
+    warm_start=False：每个时间步从全部本地IoT执行的剖面重新运行 LEAO + PGES，作为对照。
+    deadline 不为空时是每个时间步的决策时间预算 (s)，卸载决策之后剩余的预算交给 PGES（见 core/anytime.py）。
+    """
+
+    def __init__(self, ss: SystemState, alloc_method: str = 'WF', scheduling: bool = True,
+                 warm_start: bool = True, max_iter: int = 100000, deadline: float | None = None):
+        self.ss = ss
+        self.alloc_method = alloc_method
+        self.scheduling = scheduling  # 是否在卸载决策后运行 PGES
+        self.warm_start = warm_start
+        self.max_iter = max_iter
+        self.deadline = deadline
+        self.sp = StrategicProfile(ss)
+        self.epoch = 0
+
+    def __repr__(self):
+        mode = 'warm' if self.warm_start else 'cold'
+        return f'{self.__class__.__name__} ({mode} start) with {self.alloc_method} resource alloc method'
+
+    # 应用负载变化，返回需要重新决策的函数id
+    def _apply(self, delta: WorkloadDelta) -> List[int | str]:
+        for func_id in delta.departures:
+            self.ss.remove_function(func_id)
+            self.sp.remove_function(func_id)
+        # 基站切换：本地SEC（以及策略2/3的划分）由映射派生，只有本地SEC改变的设备的函数需要重新决策
+        moved = []
+        for iot_id, bs_id in delta.handovers.items():
+            moved += self.ss.handover_iot(iot_id, bs_id)
+        for func, iot_id in delta.arrivals:
+            self.ss.add_function(func=func, associated_iot_id=iot_id)
+            self.sp.add_function(func.id)
+        for func_id, invocations in delta.rate_changes.items():
+            if func_id in self.ss.functions:
+                self.ss.get_function_instance(func_id).invocations = invocations
+                self.sp.refresh_function(func_id)
+
+        affected = [func.id for func, _ in delta.arrivals]
+        affected += [func_id for func_id in delta.rate_changes if func_id in self.ss.functions]
+        affected += moved
+        return list(dict.fromkeys(affected))
+
+    # 热启动的卸载决策：资源池由未受影响的已卸载函数构成，受影响函数按负载降序逐个判断收益
+    def _reoffload(self, affected: List[int | str]):
+        params = self.sp.params
+        affected_set = set(affected)
+        pool = ResourcePool(self.ss.get_system_available_cr())
+        for func_id, _val in self.sp.strategy.items():
+            if _val['offloading'] == 1 and func_id not in affected_set:
+                pool.add(*pool_entry(self.ss.get_function_instance(func_id), self.alloc_method, params))
+
+        funcs = sorted((self.ss.get_function_instance(func_id) for func_id in affected),
+                       key=lambda f: (f.invocations * f.workload), reverse=True)
+        for func in funcs:
+            iot = self.ss.f2u_mapping(func.id)
+            loc_sec = self.ss.f2s_mapping(func.id)
+            offloaded = self.sp.strategy[func.id]['offloading'] == 1
+            delta = offload_gain(pool, func, iot, loc_sec, self.alloc_method, params)
+            # 新卸载的函数需要通过本地SEC的内存准入检查（与 OnlineDecider 相同），容纳不下时保持本地IoT执行
+            if delta is not None and delta <= 0 and (offloaded or
+                                                      self.sp.can_admit(func.id, loc_sec, self.alloc_method)):
+                pool.add(*pool_entry(func, self.alloc_method, params))
+                # 已在SEC执行的函数保留当前SEC，避免不必要的迁移
+                if not offloaded:
+                    self.sp.offload_to_loc_sec(func.id)
+            else:
+                self.sp.execution_on_iot(func.id)
+
+    # SEC启用容器缓存时，重新决策后被卸载的函数访问执行SEC的缓存（未命中则拉取并可能淘汰其他镜像），
+    # 下一个时间步的 T_pull 按更新后的缓存计算
+    def _touch_caches(self, func_ids: List[int | str]):
+        for func_id in func_ids:
+            _val = self.sp.strategy[func_id]
+            if _val['offloading'] == 1:
+                sec = self.ss.get_sec_server_instance(_val['scheduling'])
+                if sec.container_cache is not None:
+                    sec.container_cache.access(self.ss.get_function_instance(func_id).func_type)
+
+    # 按当前策略剖面计算 cost（一次遍历，与 StrategicProfile.get_cost 相同）
+    def _evaluate(self) -> StreamingEvaluator:
+        evaluator = StreamingEvaluator(self.ss, alloc_method=self.alloc_method)
+        for func_id, _val in self.sp.strategy.items():
+            evaluator.add(self.ss.get_function_instance(func_id), self.ss.functions[func_id]['associated_iot_id'],
+                          _val['scheduling'] if _val['offloading'] == 1 else None)
+        return evaluator
+
+    # 本时间步剩余的决策时间预算
+    def _remaining(self, start_time: float) -> float | None:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - (time.perf_counter() - start_time))
+
+    def step(self, delta: WorkloadDelta) -> EpochReport:
+        departed = set(delta.departures)
+        prev_placement = {func_id: _val['scheduling'] for func_id, _val in self.sp.strategy.items()
+                          if func_id not in departed}
+
+        start_time = time.perf_counter()
+        affected = self._apply(delta)
+        if self.warm_start and self.epoch == 0:
+            # 第一个时间步没有可复用的剖面，所有函数都参与决策（与 LEAO + PGES 相同）
+            affected = list(self.sp.strategy)
+        status = CONVERGED
+        if self.warm_start:
+            self._reoffload(affected)
+            if self.scheduling and affected:
+                algo = PGES(self.ss, self.sp, alloc_method=self.alloc_method, max_iter=self.max_iter,
+                            track_progress=False)
+                algo.run(func_ids=affected, deadline=self._remaining(start_time))
+                status = algo.anytime.status
+        else:
+            affected = list(self.sp.strategy)
+            algo = LEAO(self.ss, alloc_method=self.alloc_method)
+            self.sp = algo.run(deadline=self._remaining(start_time))
+            status = algo.anytime.status
+            if self.scheduling:
+                algo = PGES(self.ss, self.sp, alloc_method=self.alloc_method, max_iter=self.max_iter,
+                            track_progress=False)
+                self.sp = algo.run(deadline=self._remaining(start_time))
+                status = algo.anytime.status if status == CONVERGED else status
+        # 调用次数变化可能让留在原SEC的函数超出内存，与 run_pipeline 相同在重优化后溢出超用的函数
+        self.sp.enforce_memory(self.alloc_method)
+        decision_time = time.perf_counter() - start_time
+
+        migrations = sum(1 for func_id, sec_id in prev_placement.items()
+                         if self.sp.strategy[func_id]['scheduling'] != sec_id)
+        evaluator = self._evaluate()
+        self._touch_caches(affected)
+        report = EpochReport(epoch=self.epoch, func_count=self.ss.get_function_count(),
+                             arrivals=len(delta.arrivals), departures=len(delta.departures),
+                             rate_changes=len(delta.rate_changes), handovers=len(delta.handovers),
+                             affected=len(affected),
+                             decision_time=decision_time, migrations=migrations,
+                             cost=evaluator.get_cost(), offload_ratio=evaluator.get_offload_ratio(), status=status)
+        self.epoch += 1
+        return report
+
+    def run(self, deltas: Iterable[WorkloadDelta]) -> Iterator[EpochReport]:
+        for delta in deltas:
+            yield self.step(delta)
+
+
+def random_deltas(ss: SystemState, epochs: int, arrival_rate: float = 0.05, departure_rate: float = 0.05,
+                  change_rate: float = 0.05, seed: int | None = None) -> Iterator[WorkloadDelta]:
+    """
+    随机负载变化：每个时间步约有 rate * 当前函数数 个函数到达 / 离开 / 改变调用次数。
+    新函数的属性与 scripts/generate_datasets.py 的分布相同；生成器会随 ss 的变化推进，需与模拟器交替使用。
+    """
+    rng = random.Random(seed)
+    iot_ids = list(ss.iot_devices)
+    type_ids = list(ss.function_types)
+    next_id = max(ss.functions, default=-1) + 1
+
+    for _ in range(epochs):
+        func_ids = list(ss.functions)
+        n = max(1, len(func_ids))
+        departures = rng.sample(func_ids, k=min(len(func_ids), round(departure_rate * n)))
+        remaining = sorted(set(func_ids) - set(departures))
+        changed = rng.sample(remaining, k=min(len(remaining), round(change_rate * n)))
+        rate_changes = {func_id: rng.choice(FUNC.get('INVOCATION')) for func_id in sorted(changed)}
+
+        arrivals = []
+        for _ in range(round(arrival_rate * n)):
+            func_type = ss.function_types[rng.choice(type_ids)]['instance']
+            func = FunctionTask(id=next_id,
+                                data_size=rng.choice(FUNC.get('DATA_SIZE')),
+                                workload=rng.choice(FUNC.get('WORKLOAD')),
+                                invocations=rng.choice(FUNC.get('INVOCATION')),
+                                func_type=func_type)
+            arrivals.append((func, rng.choice(iot_ids)))
+            next_id += 1
+        yield WorkloadDelta(arrivals=arrivals, departures=departures, rate_changes=rate_changes)
@@ -0,0 +1,223 @@
+import heapq
+import random
+import time
+from array import array
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.strategic_profile import StrategicProfile
+from core.system_state import SystemState
+
+# 事件类型
+_ARRIVAL = 0  # 调用在IoT设备上到达
+_SEC_ARRIVAL = 1  # 调用数据到达执行SEC
+
+
+@dataclass
+class EventSimResult:
+    """逐调用离散事件仿真的结果（延迟单位：s）"""
+    invocations: int  # 完成的调用数
+    dropped: int  # 目标SEC不可达而丢弃的调用数
+    events: int  # 处理的事件数
+    cold_starts: int  # 容器冷启动次数（拉取 + 初始化）
+    wall_time: float  # 仿真耗时 (s)
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    offloaded_p99: float  # 在SEC执行的调用的 p99
+    local_p99: float  # 在本地IoT执行的调用的 p99
+    cache_hits: int = 0  # 冷启动时镜像缓存命中次数（SEC启用容器缓存时）
+    cache_misses: int = 0
+    cache_evictions: int = 0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.wall_time if self.wall_time > 0 else float('inf')
+
+
+# 一次遍历计算每个已卸载函数分到的计算资源 cr_ik（与 StrategicProfile.get_cr_ik 的结果相同）
+def allocate_cr(sp: StrategicProfile, alloc_method: str = 'WF') -> dict:
+    cr = {}
+    for sec in sp.ss.get_sec_list():
+        cr.update(sp.get_sec_allocation(sec, alloc_method))
+    return cr
+
+
+class EventEngine:
+    """
+    逐调用的离散事件仿真（heapq 事件队列）。
+
+    每个函数的 n_i 次调用在 [0, period) 内到达（泊松过程或均匀间隔）：
+    - 本地IoT执行：在IoT设备CPU上排队（FIFO），每次执行 c_i / CR_u；
+    - 卸载执行：在IoT上行链路排队发送 d_i，协作执行时再经过SEC间链路，然后在函数的容器上排队：
+      容器空闲超过 keep_alive 后回收，下次调用需重新拉取镜像（未缓存时）并初始化（xi * I / cr_ik），
+      每次执行 c_i / cr_ik。
+      SEC启用容器缓存（container_cache）时，每次冷启动访问缓存副本，未命中才拉取镜像，缓存按淘汰策略更新；
+      否则按 cached_functions 判断是否需要拉取。
+
+    各服务台都是 FIFO 单服务台，排队用 Lindley 递推（开始时间 = max(到达, 服务台空闲)）直接算出，
+    事件只有“到达IoT”和“到达SEC”两类，每个函数同时只有一个待处理的到达事件；
+    事件是普通元组，状态保存在按函数 / 设备下标索引的列表中，循环内不创建对象。
+    """
+
+    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF', period: float = 60.0,
+                 keep_alive: float = 10.0, arrival: str = 'poisson', invocation_scale: int = 1,
+                 seed: int | None = None):
+        self.ss = ss
+        self.sp = sp
+        self.alloc_method = alloc_method
+        self.period = period  # 调用到达的时间窗口 (s)
+        self.keep_alive = keep_alive  # 容器空闲保活时间 (s)
+        self.arrival = arrival  # 'poisson' 或 'uniform'
+        self.invocation_scale = invocation_scale  # 每个函数的调用次数乘以该系数
+        self.rng = random.Random(seed)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__} with {self.alloc_method} resource alloc method'
+
+    def _prepare(self):
+        # 把每个函数的服务参数展开为按下标索引的列表
+        ss, params = self.ss, self.sp.params
+        cr = allocate_cr(self.sp, self.alloc_method)
+        iot_index = {iot_id: k for k, iot_id in enumerate(ss.iot_devices)}
+
+        self.count, self.iot, self.offloaded = [], [], []
+        self.local_exe, self.tx, self.s2s, self.cold, self.exe = [], [], [], [], []
+        self.pull, self.image, self.sec = [], [], []  # 拉取镜像延迟、函数类型、执行SEC id（容器缓存使用）
+        # 启用容器缓存时在副本上仿真，不改变SEC上的缓存状态
+        self.caches = {sec.id: sec.container_cache.copy() for sec in ss.get_sec_list()
+                       if sec.container_cache is not None}
+        for cache in self.caches.values():
+            cache.reset_stats()
+        for func_id, _val in self.sp.strategy.items():
+            func = ss.get_function_instance(func_id)
+            iot = ss.f2u_mapping(func_id)
+            self.count.append(func.invocations * self.invocation_scale)
+            self.iot.append(iot_index[iot.id])
+            self.local_exe.append(func.workload / iot.comp_resource)
+            if _val['offloading'] == 0:
+                self.offloaded.append(False)
+                self.tx.append(0.0)
+                self.s2s.append(0.0)
+                self.cold.append(0.0)
+                self.exe.append(0.0)
+                self.pull.append(0.0)
+                self.image.append(None)
+                self.sec.append(None)
+                continue
+
+            loc_sec = ss.f2s_mapping(func_id)
+            target_sec = ss.get_sec_server_instance(_val['scheduling'])
+            if target_sec.id == loc_sec.id:
+                s2s = 0.0
+            else:
+                lat, bw = ss.sec_network.get_latency_and_bandwidth(loc_sec.id, target_sec.id)
+                s2s = func.data_size / (bw / 8) + lat if lat and bw else float('inf')
+            pull = func.func_type.image_size / (target_sec.backhaul_bw / 8)
+            cr_ik = cr[func_id]
+            self.pull.append(pull)
+            self.image.append(func.func_type)
+            self.sec.append(target_sec.id)
+            if target_sec.id in self.caches:
+                pull = 0.0  # 是否拉取在仿真中由缓存决定
+            elif func.func_type.id in target_sec.cached_functions:
+                pull = 0.0
+            self.offloaded.append(True)
+            self.tx.append(func.data_size / (iot.uplink_rate / 8))
+            self.s2s.append(s2s)
+            self.cold.append(pull + params.sec_cont_init_effi * func.func_type.image_size / cr_ik)
+            self.exe.append(func.workload / cr_ik)
+
+    def run(self) -> EventSimResult:
+        self._prepare()
+        n_func, n_iot = len(self.count), len(self.ss.iot_devices)
+        heappush, heappop = heapq.heappush, heapq.heappop
+        count, iot, offloaded = self.count, self.iot, self.offloaded
+        local_exe, tx, s2s, cold, exe = self.local_exe, self.tx, self.s2s, self.cold, self.exe
+        keep_alive = self.keep_alive
+        caches, pull, image, sec = self.caches, self.pull, self.image, self.sec
+        uniform = self.arrival == 'uniform'
+        expovariate = self.rng.expovariate
+        rate = [count[i] / self.period if count[i] else 0.0 for i in range(n_func)]
+
+        iot_cpu_free = [0.0] * n_iot  # IoT CPU 空闲时刻
+        uplink_free = [0.0] * n_iot  # IoT 上行链路空闲时刻
+        cpu_free = [0.0] * n_func  # 函数容器（分配的CPU份额）空闲时刻
+        warm_until = [-1.0] * n_func  # 容器保活截止时刻，小于到达时刻表示需要冷启动
+        remaining = list(count)  # 尚未到达的调用数
+
+        local_lat = array('d')
+        offload_lat = array('d')
+        events = dropped = cold_starts = 0
+
+        # 每个函数的第一次到达
+        heap = []
+        for i in range(n_func):
+            if remaining[i]:
+                t0 = self.period / count[i] / 2 if uniform else expovariate(rate[i])
+                heap.append((t0, _ARRIVAL, i, t0))
+        heapq.heapify(heap)
+
+        start_time = time.perf_counter()
+        while heap:
+            t, kind, i, t0 = heappop(heap)
+            events += 1
+            if kind == _ARRIVAL:
+                # 安排该函数的下一次到达
+                remaining[i] -= 1
+                if remaining[i]:
+                    t_next = t + (1.0 / rate[i] if uniform else expovariate(rate[i]))
+                    heappush(heap, (t_next, _ARRIVAL, i, t_next))
+
+                u = iot[i]
+                if not offloaded[i]:
+                    # 本地IoT执行：IoT CPU 上 FIFO 排队
+                    start = t if t > iot_cpu_free[u] else iot_cpu_free[u]
+                    finish = start + local_exe[i]
+                    iot_cpu_free[u] = finish
+                    local_lat.append(finish - t)
+                    continue
+
+                # 上行链路 FIFO 排队发送，然后（协作执行时）经过SEC间链路
+                start = t if t > uplink_free[u] else uplink_free[u]
+                sent = start + tx[i]
+                uplink_free[u] = sent
+                if s2s[i] == float('inf'):
+                    dropped += 1
+                    continue
+                heappush(heap, (sent + s2s[i], _SEC_ARRIVAL, i, t0))
+            else:
+                # 到达SEC：容器已回收则冷启动，之后在函数的CPU份额上 FIFO 排队执行
+                ready = t
+                if t > warm_until[i] and cpu_free[i] <= t:
+                    ready = t + cold[i]
+                    cold_starts += 1
+                    if caches and sec[i] in caches and not caches[sec[i]].access(image[i]):
+                        ready += pull[i]
+                start = ready if ready > cpu_free[i] else cpu_free[i]
+                finish = start + exe[i]
+                cpu_free[i] = finish
+                warm_until[i] = finish + keep_alive
+                offload_lat.append(finish - t0)
+        wall_time = time.perf_counter() - start_time
+
+        all_lat = np.concatenate([np.frombuffer(local_lat, dtype=np.float64),
+                                  np.frombuffer(offload_lat, dtype=np.float64)])
+
+        def _p99(values) -> float:
+            return float(np.percentile(np.frombuffer(values, dtype=np.float64), 99)) if len(values) else 0.0
+
+        if all_lat.size:
+            p50, p95, p99 = (float(v) for v in np.percentile(all_lat, [50, 95, 99]))
+            mean, max_lat = float(all_lat.mean()), float(all_lat.max())
+        else:
+            p50 = p95 = p99 = mean = max_lat = 0.0
+        return EventSimResult(invocations=int(all_lat.size), dropped=dropped, events=events,
+                              cold_starts=cold_starts, wall_time=wall_time, mean=mean, p50=p50, p95=p95, p99=p99,
+                              max=max_lat, offloaded_p99=_p99(offload_lat), local_p99=_p99(local_lat),
+                              cache_hits=sum(c.hits for c in caches.values()),
+                              cache_misses=sum(c.misses for c in caches.values()),
+                              cache_evictions=sum(c.evictions for c in caches.values()))
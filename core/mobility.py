@@ -0,0 +1,84 @@
+import csv
+import random
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from core.dynamic_simulation import WorkloadDelta
+from core.system_state import SystemState
+
+# 移动轨迹：(时间步, IoT设备id, 切换到的基站id)，按时间步升序
+MobilityTrace = List[Tuple[int, int | str, int | str]]
+
+
+# 基站邻接关系：关联同一个SEC或直连SEC（SEC网络中有直接边）的基站互为邻居
+def bs_neighbours(ss: SystemState) -> Dict[int | str, List[int | str]]:
+    by_sec = {}
+    for bs_id, _val in ss.base_stations.items():
+        by_sec.setdefault(_val['associated_sec_id'], []).append(bs_id)
+    adjacent = {sec_id: {sec_id} for sec_id in by_sec}
+    if ss.sec_network is not None:
+        for u, v in ss.sec_network.edges:
+            if u in adjacent and v in adjacent:
+                adjacent[u].add(v)
+                adjacent[v].add(u)
+
+    neighbours = {}
+    for bs_id, _val in ss.base_stations.items():
+        secs = sorted(adjacent[_val['associated_sec_id']], key=str)
+        neighbours[bs_id] = [other for sec_id in secs for other in by_sec[sec_id] if other != bs_id]
+    return neighbours
+
+
+def random_walk_trace(ss: SystemState, epochs: int, handover_rate: float = 0.05,
+                      seed: int | None = None) -> MobilityTrace:
+    """
+    随机游走移动轨迹：第 1..epochs 个时间步中，每个IoT设备以 handover_rate 的概率切换到当前基站的一个邻居基站
+    （见 bs_neighbours）。只读取 ss 的初始关联，不修改系统状态。
+    """
+    rng = random.Random(seed)
+    neighbours = bs_neighbours(ss)
+    position = {iot_id: _val['associated_bs_id'] for iot_id, _val in ss.iot_devices.items()}
+
+    trace = []
+    for epoch in range(1, epochs + 1):
+        for iot_id, bs_id in position.items():
+            if neighbours[bs_id] and rng.random() < handover_rate:
+                new_bs_id = rng.choice(neighbours[bs_id])
+                position[iot_id] = new_bs_id
+                trace.append((epoch, iot_id, new_bs_id))
+    return trace
+
+
+def write_trace(path: str, trace: MobilityTrace):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['epoch', 'iot_id', 'bs_id'])
+        writer.writerows(trace)
+
+
+# 读取 CSV 轨迹；IoT设备和基站id按 ss 中实体的键解析（整数或字符串id都可以），未知的id抛出 KeyError
+def read_trace(path: str, ss: SystemState) -> MobilityTrace:
+    iot_ids = {str(iot_id): iot_id for iot_id in ss.iot_devices}
+    bs_ids = {str(bs_id): bs_id for bs_id in ss.base_stations}
+    trace = []
+    with open(path, newline='') as f:
+        for r in csv.DictReader(f):
+            if r['iot_id'] not in iot_ids:
+                raise KeyError(f'轨迹中的IoT设备 {r["iot_id"]} 不存在')
+            if r['bs_id'] not in bs_ids:
+                raise KeyError(f'轨迹中的基站 {r["bs_id"]} 不存在')
+            trace.append((int(r['epoch']), iot_ids[r['iot_id']], bs_ids[r['bs_id']]))
+    return sorted(trace, key=lambda t: t[0])
+
+
+def with_handovers(deltas: Iterable[WorkloadDelta], trace: MobilityTrace,
+                   first_epoch: int = 1) -> Iterator[WorkloadDelta]:
+    """
+    把移动轨迹合并到负载变化中：第 i 个负载变化（从 first_epoch 开始编号）加入轨迹中该时间步的基站切换，
+    同一时间步内同一设备的多次切换只保留最后一次。按需逐个产出，可与 random_deltas 的生成器交替使用。
+    """
+    by_epoch: Dict[int, Dict[int | str, int | str]] = {}
+    for epoch, iot_id, bs_id in trace:
+        by_epoch.setdefault(epoch, {})[iot_id] = bs_id
+    for epoch, delta in enumerate(deltas, start=first_epoch):
+        delta.handovers.update(by_epoch.get(epoch, {}))
+        yield delta
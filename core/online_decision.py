@@ -0,0 +1,238 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from core.algorithm_ELCO.algo_02_PGES import PGES
+from core.algorithm_registry import run_pipeline
+from core.anytime import CONVERGED
+from core.decision_cache import DecisionCache
+from core.strategic_profile import StrategicProfile
+from core.streaming import ResourcePool, alloc_weight, is_proportional, offload_gain, pool_entry, supports_pool
+from core.system_models.cost_model import collab_sec_execution, iot_execution, loc_sec_execution
+from core.system_models.network_model import FunctionTask
+from core.system_state import SystemState
+
+
+@dataclass
+class Decision:
+    """一个函数任务的在线决策"""
+    func_id: int | str
+    sec_id: int | str | None  # 执行SEC，None 表示本地IoT执行
+    strategy: int  # 1-本地IoT，2-本地SEC，3-协作SEC
+    latency: float  # 决策时刻预测的延迟 (s)
+    energy: float  # 决策时刻预测的能耗 (J)
+
+
+@dataclass
+class BatchReport:
+    """一个批次的处理结果"""
+    arrivals: int
+    departures: int  # 实际离开的函数数（未知的函数id不计）
+    offloaded: int  # 本批次新到达并被卸载的函数数
+    decision_time: float  # 决策耗时 (s)
+    status: str  # PGES 局部细化的运行状态
+
+
+class OnlineDecider:
+    """
+    在线决策：持有系统状态和实时策略剖面，按批次处理函数的到达和离开。
+
+    新到达的函数按负载降序做 LEAO 式的卸载收益判断（全局资源池的聚合量常驻内存，到达和离开时 O(1) 更新），
+    被卸载的函数再参与最多 refine_iter 轮的 PGES 最优响应（局部细化），其余函数的决策保持不变。
+    deadline 不为空时是每个批次的决策时间预算 (s)，卸载判断之后剩余的预算交给 PGES（见 core/anytime.py）。
+
+    memo 不为空时启用决策记忆化（core/decision_cache.py）：键为任务签名 (IoT设备, 函数类型, d_i, c_i, n_i)、
+    全局资源池的负载桶和本地SEC的负载桶，命中时直接放到缓存的执行位置，不参与卸载判断和 PGES 细化。
+    负载回到原来的桶时可以复用之前的条目；每放置一个函数就增量更新目标SEC和资源池的负载桶，
+    协作SEC的负载跨越桶边界时立即使以它为执行位置的条目失效，批次结束时再按成员索引精确重算。
+    其他SEC的负载变化不使条目失效，所以命中的决策是近似的最优响应。
+    """
+
+    def __init__(self, ss: SystemState, alloc_method: str = 'WF', refine_iter: int = 2,
+                 deadline: float | None = None, initial_pipeline: tuple | None = ('LEAO', 'PGES'),
+                 memo: DecisionCache | None = None):
+        if not supports_pool(alloc_method):
+            raise ValueError(f'在线决策只支持 ES/LP/WF/FIXED 资源分配，不支持 {alloc_method}')
+        self.ss = ss
+        self.alloc_method = alloc_method
+        self.refine_iter = refine_iter
+        self.deadline = deadline
+
+        # 已加载的函数先用离线流水线决策一次
+        if initial_pipeline and ss.functions:
+            self.sp = run_pipeline(ss, initial_pipeline, alloc_method=alloc_method).sp
+        else:
+            self.sp = StrategicProfile(ss)
+        self.pool = ResourcePool(ss.get_system_available_cr())
+        for func_id, _val in self.sp.strategy.items():
+            if _val['offloading'] == 1:
+                self.pool.add(*pool_entry(ss.get_function_instance(func_id), alloc_method, self.sp.params))
+
+        self.memo = memo
+        self._sec_buckets: Dict[int | str, Tuple[int, float, int | None]] = {}  # sec_id -> (成员版本号, 负载, 负载桶)
+        self._pool_bucket: int | None = None
+        if memo is not None:
+            self._refresh_buckets()
+
+        self.batches = 0
+        self.decisions = 0
+        self.decision_time = 0.0
+
+    def __repr__(self):
+        return f'{self.__class__.__name__} with {self.alloc_method} resource alloc method'
+
+    # 处理一个批次：先处理离开，再对新到达的函数做卸载判断和 PGES 局部细化，返回新函数的决策。
+    # 决策过程中抛出异常时，本批次新加入的函数全部回滚（已处理的离开保持生效）
+    def apply(self, arrivals: List[Tuple[FunctionTask, int | str]],
+              departures: List[int | str]) -> Tuple[List[Decision], BatchReport]:
+        start_time = time.perf_counter()
+
+        departed = 0
+        for func_id in departures:
+            if func_id in self.ss.functions:
+                self._remove(func_id)
+                departed += 1
+
+        fresh = [func.id for func, _ in arrivals if func.id not in self.ss.functions]
+        try:
+            return self._decide(arrivals, departed, start_time)
+        except Exception:
+            for func_id in fresh:
+                if func_id in self.ss.functions:
+                    self._remove(func_id)
+            raise
+
+    # 函数离开系统：从全局资源池、策略剖面和系统状态中移除
+    def _remove(self, func_id: int | str):
+        if self.sp.strategy.get(func_id, {}).get('offloading') == 1:
+            self.pool.remove(*pool_entry(self.ss.get_function_instance(func_id), self.alloc_method, self.sp.params))
+        self.ss.remove_function(func_id)
+        self.sp.remove_function(func_id)
+
+    def _decide(self, arrivals: List[Tuple[FunctionTask, int | str]], departed: int,
+                start_time: float) -> Tuple[List[Decision], BatchReport]:
+        params = self.sp.params
+        for func, iot_id in arrivals:
+            self.ss.add_function(func=func, associated_iot_id=iot_id)
+            self.sp.add_function(func.id)
+
+        # LEAO 式的卸载判断：收益为正（cost 下降）且本地SEC能容纳时卸载到本地SEC
+        offloaded = []
+        missed = []  # 记忆化未命中的 (函数, 键, 本地SEC id)
+        for func, iot_id in sorted(arrivals, key=lambda a: a[0].invocations * a[0].workload, reverse=True):
+            loc_sec = self.ss.u2s_mapping(iot_id)
+            if self.memo is not None:
+                key = self._memo_key(func, iot_id, loc_sec.id)
+                if self._apply_memo(func, key):
+                    continue
+                missed.append((func, key, loc_sec.id))
+            if not self.sp.can_admit(func.id, loc_sec, self.alloc_method):
+                continue
+            delta = offload_gain(self.pool, func, self.ss.iot_devices[iot_id]['instance'], loc_sec,
+                                 self.alloc_method, params)
+            if delta is not None and delta <= 0:
+                self.pool.add(*pool_entry(func, self.alloc_method, params))
+                self.sp.offload_to_loc_sec(func.id)
+                offloaded.append(func.id)
+                if self.memo is not None:
+                    self._note_placement(func, loc_sec.id)
+
+        # PGES 局部细化：只有新卸载的函数参与博弈
+        status = CONVERGED
+        if offloaded and self.refine_iter > 0:
+            algo = PGES(self.ss, self.sp, alloc_method=self.alloc_method, max_iter=self.refine_iter,
+                        track_progress=False)
+            remaining = None if self.deadline is None else \
+                max(0.0, self.deadline - (time.perf_counter() - start_time))
+            algo.run(func_ids=offloaded, deadline=remaining)
+            status = algo.anytime.status
+
+        if self.memo is not None:
+            for func, key, loc_sec_id in missed:
+                sec_id = self.sp.strategy[func.id]['scheduling']
+                # 键中已有本地SEC的负载桶，只需在协作SEC的负载跨越桶边界时失效
+                self.memo.put(key, sec_id, secs=() if sec_id in (None, loc_sec_id) else (sec_id,))
+            self._refresh_buckets()
+
+        decisions = [self.predict(func.id) for func, _ in arrivals]
+        decision_time = time.perf_counter() - start_time
+        self.batches += 1
+        self.decisions += len(arrivals) + departed
+        self.decision_time += decision_time
+        return decisions, BatchReport(arrivals=len(arrivals), departures=departed, offloaded=len(offloaded),
+                                      decision_time=decision_time, status=status)
+
+    # 记忆化的键：任务签名 + 全局资源池负载桶 + 本地SEC负载桶
+    def _memo_key(self, func: FunctionTask, iot_id: int | str, loc_sec_id: int | str) -> tuple:
+        signature = (iot_id, func.func_type.id, func.data_size, func.workload, func.invocations)
+        return signature, self._pool_bucket, self._sec_buckets[loc_sec_id][2]
+
+    # 命中时把函数放到缓存的执行位置；目标SEC放不下时按未命中处理
+    def _apply_memo(self, func: FunctionTask, key: tuple) -> bool:
+        hit, sec_id = self.memo.get(key)
+        if not hit:
+            return False
+        if sec_id is None:
+            return True
+        if not self.sp.can_admit(func.id, self.ss.get_sec_server_instance(sec_id), self.alloc_method):
+            return False
+        self.pool.add(*pool_entry(func, self.alloc_method, self.sp.params))
+        self.sp.schedule_to_target_sec(func_id=func.id, target_sec_id=sec_id)
+        self._note_placement(func, sec_id)
+        return True
+
+    # 函数放到 sec_id 后增量更新该SEC和全局资源池的负载桶，SEC的负载跨越桶边界时立即使依赖它的条目失效。
+    # 保留旧的成员版本号，批次结束时 _refresh_buckets 按成员索引精确重算
+    def _note_placement(self, func: FunctionTask, sec_id: int | str):
+        version, load, bucket = self._sec_buckets[sec_id]
+        load += self._load([func])
+        new_bucket = self.memo.bucket(load)
+        if new_bucket != bucket:
+            self.memo.invalidate_sec(sec_id)
+        self._sec_buckets[sec_id] = (version, load, new_bucket)
+        self._pool_bucket = self.memo.bucket(self._pool_load())
+
+    def _pool_load(self) -> float:
+        return self.pool.weight if is_proportional(self.alloc_method) else self.pool.count
+
+    # 负载：ES/LP/WF 为分配权重之和，FIXED 为函数个数
+    def _load(self, funcs) -> float:
+        if is_proportional(self.alloc_method):
+            return sum(alloc_weight(func, self.alloc_method) for func in funcs)
+        return float(len(funcs))
+
+    # 重新计算成员发生变化的SEC的负载桶，跨越桶边界时使依赖该SEC的记忆化条目失效
+    def _refresh_buckets(self):
+        for sec in self.ss.get_sec_list():
+            version = self.sp.get_sec_version(sec.id)
+            prev = self._sec_buckets.get(sec.id)
+            if prev is not None and prev[0] == version:
+                continue
+            funcs = [self.ss.get_function_instance(func_id) for func_id in self.sp.get_sec_func_ids(sec.id)]
+            load = self._load(funcs)
+            bucket = self.memo.bucket(load)
+            if prev is not None and prev[2] != bucket:
+                self.memo.invalidate_sec(sec.id)
+            self._sec_buckets[sec.id] = (version, load, bucket)
+        self._pool_bucket = self.memo.bucket(self._pool_load())
+
+    # 函数在当前策略剖面下的预测延迟和能耗（与 StrategicProfile.get_real_latency_energy 的单个函数项相同）
+    def predict(self, func_id: int | str) -> Decision:
+        func = self.ss.get_function_instance(func_id)
+        iot = self.ss.f2u_mapping(func_id)
+        loc_sec = self.ss.f2s_mapping(func_id)
+        strategy = self.sp.get_func_strategy(func_id)
+        if strategy == 1:
+            latency, energy = iot_execution(func=func, iot=iot, params=self.sp.params)
+            return Decision(func_id=func_id, sec_id=None, strategy=1, latency=latency, energy=energy)
+
+        sec = self.sp.get_func_current_sec(func_id)
+        cr_ik = self.sp.get_cr_ik(func=func, sec=sec, alloc_method=self.alloc_method)
+        if strategy == 2:
+            latency, energy = loc_sec_execution(func=func, iot=iot, loc_sec=loc_sec, cr_ik=cr_ik,
+                                                params=self.sp.params)
+        else:
+            latency, energy = collab_sec_execution(func=func, iot=iot, loc_sec=loc_sec, target_sec=sec,
+                                                   sec_network=self.ss.sec_network, cr_ik=cr_ik,
+                                                   params=self.sp.params)
+        return Decision(func_id=func_id, sec_id=sec.id, strategy=strategy, latency=latency, energy=energy)
@@ -0,0 +1,166 @@
+import math
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from core.algorithm_ELCO.algo_02_PGES import PGES
+from core.strategic_profile import StrategicProfile
+from core.system_models.network_model import SECNetwork
+from core.system_state import SystemState
+from utils.shared_state import SharedState, SharedStateHandle, attach, can_export
+
+
+# 按SEC间（最短路径）延迟把SEC聚类为 n_regions 个区域：最远点法选中心，每个SEC归入延迟最小的中心
+# 只需要从每个中心出发的单源最短路径（SECNetwork 的路由缓存），O(n_regions * E log K)
+def partition_secs(sec_network: SECNetwork, n_regions: int) -> Dict[int | str, int]:
+    sec_ids = list(sec_network.servers)
+    if not sec_ids:
+        return {}
+    n_regions = max(1, min(n_regions, len(sec_ids)))
+
+    def _latency(u, v) -> float:
+        if u == v:
+            return 0.0
+        lat, _ = sec_network.get_latency_and_bandwidth(u, v)
+        return float('inf') if lat is None else lat
+
+    centers = [sec_ids[0]]
+    nearest = {sec_id: _latency(centers[0], sec_id) for sec_id in sec_ids}
+    while len(centers) < n_regions:
+        center = max(sec_ids, key=lambda sec_id: nearest[sec_id])
+        if nearest[center] == 0.0:
+            break
+        centers.append(center)
+        for sec_id in sec_ids:
+            nearest[sec_id] = min(nearest[sec_id], _latency(center, sec_id))
+
+    return {sec_id: min(range(len(centers)), key=lambda r: _latency(centers[r], sec_id)) for sec_id in sec_ids}
+
+
+# 相邻区域：SECNetwork.edges 中有边跨越的两个区域
+def neighbour_regions(sec_network: SECNetwork, region_of: Dict[int | str, int]) -> Dict[int, set]:
+    neighbours = {r: set() for r in set(region_of.values())}
+    for u, v in sec_network.edges:
+        if region_of[u] != region_of[v]:
+            neighbours[region_of[u]].add(region_of[v])
+            neighbours[region_of[v]].add(region_of[u])
+    return neighbours
+
+
+# 工作进程中的策略剖面：每个进程只接收一次（进程池 initializer），之后只传区域的SEC和函数id
+_worker_sp: StrategicProfile | None = None
+
+
+def _init_worker(sp: StrategicProfile):
+    global _worker_sp
+    _worker_sp = sp
+
+
+# 共享内存版本：进程只接收共享内存句柄和已卸载函数的位置，在只读的系统状态视图上重建策略剖面
+def _init_shared_worker(handle: SharedStateHandle, placement: Dict[int | str, int | str]):
+    global _worker_sp
+    _worker_sp = StrategicProfile(attach(handle))
+    for func_id, sec_id in placement.items():
+        _worker_sp.schedule_to_target_sec(func_id=func_id, target_sec_id=sec_id)
+
+
+def _schedule_region(sp: StrategicProfile, sec_ids: List, func_ids: List, alloc_method: str, max_iter: int) -> dict:
+    # 区域内的函数只在区域内的SEC之间博弈；不同区域的函数和SEC互不相交，分配互不影响，可以独立求解
+    secs = [sp.ss.get_sec_server_instance(sec_id) for sec_id in sec_ids]
+    PGES(sp.ss, sp, alloc_method=alloc_method, max_iter=max_iter, track_progress=False,
+         candidates=lambda func: secs).run(func_ids=func_ids)
+    return {func_id: sp.strategy[func_id]['scheduling'] for func_id in func_ids}
+
+
+def _schedule_region_in_worker(sec_ids: List, func_ids: List, alloc_method: str, max_iter: int) -> dict:
+    return _schedule_region(_worker_sp, sec_ids, func_ids, alloc_method, max_iter)
+
+
+# 区域分解的 PGES：把SEC网络按延迟聚类为区域，各区域在独立进程中并行博弈，
+# 然后对所有已卸载函数做边界细化（候选SEC为所在区域和相邻区域的SEC），使函数可以移到相邻区域中更好的SEC
+class RegionPGES:
+    def __init__(self, ss: SystemState, sp: StrategicProfile, alloc_method: str = 'WF', max_iter: int = 100000,
+                 seed: int | None = None, region_size: int = 16, workers: int | None = None, refine_iter: int = 2,
+                 shared_memory: bool = True):
+        self.ss = ss
+        self.sp = sp  # 接收一个已有的策略剖面
+        self.alloc_method = alloc_method  # 使用的资源分配方法：ES-平均分配，LP-线性负载比例，WF-注水算法
+        self.max_iter = max_iter  # 每个区域的最大博弈迭代次数
+        self.region_size = region_size  # 每个区域的目标SEC数
+        self.workers = workers  # 并行进程数，默认 min(区域数, CPU核数)；为 1 时在当前进程中串行运行
+        self.refine_iter = refine_iter  # 边界细化的博弈迭代次数
+        self.shared_memory = shared_memory  # 通过共享内存（utils/shared_state.py）把系统状态传给工作进程
+
+        self.region_of: Dict[int | str, int] = {}
+        self.region_time = 0.0  # 各区域博弈（含进程通信）耗时
+        self.refine_time = 0.0  # 边界细化耗时
+
+    def __repr__(self):
+        return f'Algorithm {self.__class__.__name__} with {self.alloc_method} resource alloc method'
+
+    def run(self) -> StrategicProfile:
+        sec_list = self.ss.get_sec_list()
+        n_regions = max(1, math.ceil(len(sec_list) / self.region_size))
+        self.region_of = partition_secs(self.ss.sec_network, n_regions)
+
+        # 按当前执行SEC把已卸载函数分到区域
+        region_secs: Dict[int, List] = {}
+        for sec in sec_list:
+            region_secs.setdefault(self.region_of[sec.id], []).append(sec.id)
+        region_funcs: Dict[int, List] = {r: [] for r in region_secs}
+        for func_id, _val in self.sp.strategy.items():
+            if _val['offloading'] == 1:
+                region_funcs[self.region_of[_val['scheduling']]].append(func_id)
+        jobs = [(region_secs[r], region_funcs[r]) for r in region_secs if region_funcs[r]]
+
+        # (1) 各区域独立博弈
+        start_time = time.perf_counter()
+        workers = self.workers or min(len(jobs), os.cpu_count() or 1)
+        if workers <= 1 or len(jobs) <= 1 or mp.current_process().daemon:
+            results = [_schedule_region(self.sp, sec_ids, func_ids, self.alloc_method, self.max_iter)
+                       for sec_ids, func_ids in jobs]
+        else:
+            results = self._run_in_pool(jobs, workers)
+        for result in results:
+            for func_id, sec_id in result.items():
+                self.sp.schedule_to_target_sec(func_id=func_id, target_sec_id=sec_id)
+        self.region_time = time.perf_counter() - start_time
+
+        # (2) 边界细化：候选SEC为函数当前所在区域及其相邻区域
+        start_time = time.perf_counter()
+        if len(region_secs) > 1 and self.refine_iter > 0:
+            neighbours = neighbour_regions(self.ss.sec_network, self.region_of)
+            candidates = {
+                r: [self.ss.get_sec_server_instance(sec_id)
+                    for s in sorted({r} | neighbours[r]) for sec_id in region_secs[s]]
+                for r in region_secs
+            }
+            offloaded = [func_id for func_id, _val in self.sp.strategy.items() if _val['offloading'] == 1]
+            PGES(self.ss, self.sp, alloc_method=self.alloc_method, max_iter=self.refine_iter, track_progress=False,
+                 candidates=lambda func: candidates[self.region_of[self.sp.strategy[func.id]['scheduling']]]
+                 ).run(func_ids=offloaded)
+        self.refine_time = time.perf_counter() - start_time
+        return self.sp
+
+    # 在进程池中并行求解各区域；系统状态可以导出时通过共享内存传给工作进程，否则 pickle 整个策略剖面
+    def _run_in_pool(self, jobs: List[tuple], workers: int) -> List[dict]:
+        shared = SharedState.export(self.sp.ss) if self.shared_memory and can_export(self.sp.ss) else None
+        try:
+            if shared is None:
+                initializer, initargs = _init_worker, (self.sp,)
+            else:
+                placement = {func_id: _val['scheduling'] for func_id, _val in self.sp.strategy.items()
+                             if _val['offloading'] == 1}
+                initializer, initargs = _init_shared_worker, (shared.handle, placement)
+            with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+                futures = [pool.submit(_schedule_region_in_worker, sec_ids, func_ids, self.alloc_method,
+                                       self.max_iter) for sec_ids, func_ids in jobs]
+                return [future.result() for future in futures]
+        finally:
+            if shared is not None:
+                shared.close()
+
+    def get_cost(self):
+        return self.sp.get_cost(alloc_method=self.alloc_method)
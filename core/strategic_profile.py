@@ -1,13 +1,16 @@
+import copy
 import math
-from typing import List
+from typing import Dict, List
 
+from core.allocation_policies import FixedAllocation, get_policy
 from core.system_models.cost_model import *
 from core.system_state import SystemState
 
 
 class StrategicProfile:
-    def __init__(self, ss: SystemState):
-        self.ss = ss
+    def __init__(self, ss: SystemState, params: SystemParams | None = None):
+        # 如果传入 params，则在系统状态的浅拷贝上绑定这组模型参数
+        self.ss = ss if params is None else ss.with_params(params)
 
         # 策略剖面存储：初始化时默认本地IoT执行：offloading = 0, scheduling = None
         self.strategy = {
@@ -18,6 +21,11 @@ class StrategicProfile:
             for func_id in ss.functions.keys()
         }
 
+        # 每个SEC上的函数（成员索引）及其版本号：成员变化时版本号加 1，按 (SEC, 版本号) 缓存整个SEC的分配向量
+        self._members: Dict[int | str, Dict[int | str, None]] = {}
+        self._versions: Dict[int | str, int] = {}
+        self._alloc_cache: Dict[tuple, tuple] = {}  # (sec_id, alloc_method) -> (版本号, {func_id: cr_ik})
+
     # === setter方法 ===
 
     # 初始化策略剖面：offloading = 0, scheduling = None
@@ -29,25 +37,80 @@ class StrategicProfile:
             }
             for func_id in self.ss.functions.keys()
         }
+        for sec_id in self._members:
+            self._members[sec_id] = {}
+            self._bump(sec_id)
+
+    # 复制策略剖面（共享系统状态，只复制决策），用于在同一初始剖面上多次运行算法
+    def copy(self) -> 'StrategicProfile':
+        sp = copy.copy(self)
+        sp.strategy = {func_id: dict(_val) for func_id, _val in self.strategy.items()}
+        sp._members = {sec_id: dict(members) for sec_id, members in self._members.items()}
+        sp._versions = dict(self._versions)
+        sp._alloc_cache = dict(self._alloc_cache)
+        return sp
+
+    # 新到达的函数加入策略剖面，默认本地IoT执行（函数需已加入系统状态）
+    def add_function(self, func_id: int | str):
+        self.strategy[func_id] = {
+            'offloading': 0,
+            'scheduling': None
+        }
+
+    # 离开的函数移出策略剖面
+    def remove_function(self, func_id: int | str):
+        if func_id in self.strategy:
+            self._place(func_id, None)
+        self.strategy.pop(func_id, None)
+
+    # 函数属性（如调用次数）变化后调用，使其所在SEC缓存的分配向量失效
+    def refresh_function(self, func_id: int | str):
+        _val = self.strategy.get(func_id)
+        if _val is not None and _val['offloading'] == 1:
+            self._bump(_val['scheduling'])
 
     # 策略1：在本地IoT执行
     def execution_on_iot(self, func_id: int | str):
+        self._place(func_id, None)
         self.strategy[func_id]['offloading'] = 0
         self.strategy[func_id]['scheduling'] = None
 
     # 策略2：在本地SEC执行
     def offload_to_loc_sec(self, func_id: int | str):
         loc_sec: SECServer = self.ss.f2s_mapping(func_id=func_id)
+        self._place(func_id, loc_sec.id)
         self.strategy[func_id]['offloading'] = 1
         self.strategy[func_id]['scheduling'] = loc_sec.id
 
     # 策略3：在协作SEC执行
     def schedule_to_target_sec(self, func_id: int | str, target_sec_id: int | str):
+        self._place(func_id, target_sec_id)
         self.strategy[func_id]['offloading'] = 1
         self.strategy[func_id]['scheduling'] = target_sec_id
 
+    # 更新成员索引：函数从原来的SEC移到 sec_id（None 表示本地IoT执行）
+    def _place(self, func_id: int | str, sec_id: int | str | None):
+        _val = self.strategy[func_id]
+        prev_sec_id = _val['scheduling'] if _val['offloading'] == 1 else None
+        if prev_sec_id == sec_id:
+            return
+        if prev_sec_id is not None:
+            self._members.get(prev_sec_id, {}).pop(func_id, None)
+            self._bump(prev_sec_id)
+        if sec_id is not None:
+            self._members.setdefault(sec_id, {})[func_id] = None
+            self._bump(sec_id)
+
+    def _bump(self, sec_id: int | str):
+        self._versions[sec_id] = self._versions.get(sec_id, 0) + 1
+
     # === getter方法 ===
 
+    # 当前策略剖面使用的系统模型参数
+    @property
+    def params(self) -> SystemParams:
+        return self.ss.params
+
     # 判断函数任务的策略 -> 返回策略 1/2/3
     def get_func_strategy(self, func_id: int | str) -> int:
         if self.strategy[func_id]['offloading'] == 0:
@@ -66,6 +129,14 @@ class StrategicProfile:
             curr_sec_id = self.strategy[func_id]['scheduling']
             return self.ss.get_sec_server_instance(sec_id=curr_sec_id)
 
+    # SEC的成员版本号：SEC上的函数集合或函数属性变化时递增，用于判断按SEC缓存的派生数据是否过期
+    def get_sec_version(self, sec_id: int | str) -> int:
+        return self._versions.get(sec_id, 0)
+
+    # 获取某个sec上已卸载函数的id（成员索引，不遍历整个策略剖面）
+    def get_sec_func_ids(self, sec_id: int | str) -> List[int | str]:
+        return list(self._members.get(sec_id, {}))
+
     # === 复杂属性计算 ===
 
     # 获取卸载的函数个数
@@ -133,35 +204,86 @@ class StrategicProfile:
         return workload_factor
 
     # 根据当前策略剖面，获取函数在某资源分配策略+某sec下能被分配的计算资源（单位：MHz）
+    # 分配策略见 core/allocation_policies.py，整个SEC的分配向量按 (SEC, 成员版本号) 缓存
     def get_cr_ik(self, func: FunctionTask, sec: SECServer, alloc_method: str = 'WF') -> float:
-        # ES-平均分配资源
-        if alloc_method == 'ES':
-            CR_k = self.ss.get_sec_available_cr(sec)
-            func_count = self.get_sec_func_count(sec=sec)
-            cr_ik = CR_k / func_count
-
-        # LP-线性负载比例
-        elif alloc_method == 'LP':
-            CR_k = self.ss.get_sec_available_cr(sec)
-            sec_workload = self.get_sec_workload(sec=sec)
-            func_workload = func.invocations * func.workload
-            cr_ik = func_workload / sec_workload * CR_k
-
-        # WF-注水算法
-        elif alloc_method == 'WF':
-            CR_k = self.ss.get_sec_available_cr(sec)
-            sec_workload_factor = self.get_sec_workload_factor(sec=sec)
-            func_workload_factor = math.sqrt(func.invocations * func.workload)
-            cr_ik = func_workload_factor / sec_workload_factor * CR_k
-
-        # FIXED-固定分配
+        return self.get_sec_allocation(sec, alloc_method)[func.id]
+
+    # 获取某个sec上所有函数的分配向量 {func_id: cr_ik}，成员不变时直接使用缓存
+    def get_sec_allocation(self, sec: SECServer, alloc_method: str = 'WF') -> Dict[int | str, float]:
+        key = (sec.id, alloc_method)
+        version = self._versions.get(sec.id, 0)
+        cached = self._alloc_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        func_ids = list(self._members.get(sec.id, {}))
+        funcs = [self.ss.get_function_instance(func_id) for func_id in func_ids]
+        cr = get_policy(alloc_method).allocate(funcs, self.ss.get_sec_available_cr(sec), self.params) if funcs else []
+        allocation = dict(zip(func_ids, cr))
+        self._alloc_cache[key] = (version, allocation)
+        return allocation
+
+    # 获取某个sec上各容器占用的内存之和（单位：MB），按 params.memory_mode 计算
+    def get_sec_memory_usage(self, sec: SECServer, alloc_method: str = 'WF') -> float:
+        funcs = self.get_sec_func_list(sec)
+        if self.params.memory_mode == 'image':
+            return sum(func.func_type.image_size for func in funcs)
+
+        # 'cr'：容器内存 = max(cr_ik / RATIO, 镜像大小)
+        policy = get_policy(alloc_method)
+        if isinstance(policy, FixedAllocation):
+            # FIXED 按名义分配量计算（满载时分配向量中的 1 只是防止除 0）
+            return sum(max(policy.mem, func.func_type.image_size) for func in funcs)
+        allocation = self.get_sec_allocation(sec, alloc_method)
+        return sum(max(allocation[func.id] / self.params.ratio, func.func_type.image_size) for func in funcs)
+
+    # 判断某个sec上的容器是否超出可用内存 S_k（memory_mode 为 None 时不检查）
+    def sec_fits_memory(self, sec: SECServer, alloc_method: str = 'WF') -> bool:
+        if self.params.memory_mode is None:
+            return True
+        return self.get_sec_memory_usage(sec, alloc_method) <= self.ss.get_sec_available_mem(sec) + 1e-9
+
+    # 准入检查：把函数放到 sec 上后，sec 的内存是否仍然足够（不改变策略剖面）
+    def can_admit(self, func_id: int | str, sec: SECServer, alloc_method: str = 'WF') -> bool:
+        if self.params.memory_mode is None:
+            return True
+        prev = dict(self.strategy[func_id])
+        self.schedule_to_target_sec(func_id=func_id, target_sec_id=sec.id)
+        fits = self.sec_fits_memory(sec, alloc_method)
+        if prev['offloading'] == 0:
+            self.execution_on_iot(func_id)
         else:
-            func_count = self.get_sec_func_count(sec=sec)
-            CR_k = self.ss.get_sec_available_cr(sec)
-            cr_ik = int(alloc_method.split('-')[1]) * RATIO
-            if (cr_ik * func_count) > CR_k:  # 如果SEC满载，则不分资源
-                return 1  # 防止除 0
-        return cr_ik
+            self.schedule_to_target_sec(func_id=func_id, target_sec_id=prev['scheduling'])
+        return fits
+
+    # 消除内存超用：超出内存的SEC按负载从小到大移出函数，依次尝试距离本地SEC最近的可容纳SEC，
+    # 都不能容纳时回到本地IoT执行。返回被移动的函数数
+    def enforce_memory(self, alloc_method: str = 'WF') -> int:
+        if self.params.memory_mode is None:
+            return 0
+        spilled = 0
+        for sec in self.ss.get_sec_list():
+            funcs = sorted(self.get_sec_func_list(sec), key=lambda f: (f.invocations * f.workload))
+            while funcs and not self.sec_fits_memory(sec, alloc_method):
+                func = funcs.pop(0)
+                self.execution_on_iot(func.id)
+                spilled += 1
+                loc_sec = self.ss.f2s_mapping(func.id)
+                for target_sec in self._secs_by_distance(loc_sec):
+                    if target_sec.id != sec.id and self.can_admit(func.id, target_sec, alloc_method):
+                        self.schedule_to_target_sec(func_id=func.id, target_sec_id=target_sec.id)
+                        break
+        return spilled
+
+    # 按SEC间延迟从近到远排列SEC（本地SEC在最前，不可达的SEC不包含在内）
+    def _secs_by_distance(self, loc_sec: SECServer) -> List[SECServer]:
+        distance = {loc_sec.id: 0.0}
+        for sec in self.ss.get_sec_list():
+            if sec.id != loc_sec.id:
+                lat, bw = self.ss.sec_network.get_latency_and_bandwidth(loc_sec.id, sec.id)
+                if lat and bw:
+                    distance[sec.id] = lat
+        return [self.ss.get_sec_server_instance(sec_id) for sec_id in sorted(distance, key=distance.get)]
 
     # 根据当前策略剖面计算系统 cost
     def get_cost(self, alloc_method: str = 'WF') -> float:
@@ -174,13 +296,14 @@ class StrategicProfile:
 
             # 策略1
             if strategy == 1:
-                latency, energy = iot_execution(func=func, iot=iot)
+                latency, energy = iot_execution(func=func, iot=iot, params=self.params)
                 # print(f'*决策: 函数{func.id}在本地IoT运行，延迟 {latency:.2f}s，能耗 {energy:.2f}J')
 
             # 策略2
             elif strategy == 2:
                 cr_ik = self.get_cr_ik(func=func, sec=loc_sec, alloc_method=alloc_method)
-                latency, energy = loc_sec_execution(func=func, iot=iot, loc_sec=loc_sec, cr_ik=cr_ik)
+                latency, energy = loc_sec_execution(func=func, iot=iot, loc_sec=loc_sec, cr_ik=cr_ik,
+                                                    params=self.params)
                 # print(f'*决策: 函数{func.id}在本地SEC运行，延迟 {latency:.2f}s，能耗 {energy:.2f}J')
 
             # 策略3
@@ -189,11 +312,12 @@ class StrategicProfile:
                 target_sec = self.ss.get_sec_server_instance(target_sec_id)
                 cr_ik = self.get_cr_ik(func=func, sec=target_sec, alloc_method=alloc_method)
                 latency, energy = collab_sec_execution(func=func, iot=iot, loc_sec=loc_sec, target_sec=target_sec,
-                                                       sec_network=self.ss.sec_network, cr_ik=cr_ik)
+                                                       sec_network=self.ss.sec_network, cr_ik=cr_ik,
+                                                       params=self.params)
                 # print(f'*决策: 函数{func.id}在协作SEC运行，延迟 {latency:.2f}s，能耗 {energy:.2f}J')
 
             # 计算归一化cost并累加
-            cost += norm_to_cost(latency=latency, energy=energy)
+            cost += norm_to_cost(latency=latency, energy=energy, params=self.params)
         return cost
 
     # 获取当前策略剖面的计算总延迟和总能耗（真实值，单位：latency in s，Energy in J）
@@ -209,12 +333,13 @@ class StrategicProfile:
 
             # 策略1
             if strategy == 1:
-                latency, energy = iot_execution(func=func, iot=iot)
+                latency, energy = iot_execution(func=func, iot=iot, params=self.params)
 
             # 策略2
             elif strategy == 2:
                 cr_ik = self.get_cr_ik(func=func, sec=loc_sec, alloc_method=alloc_method)
-                latency, energy = loc_sec_execution(func=func, iot=iot, loc_sec=loc_sec, cr_ik=cr_ik)
+                latency, energy = loc_sec_execution(func=func, iot=iot, loc_sec=loc_sec, cr_ik=cr_ik,
+                                                    params=self.params)
 
             # 策略3
             else:
@@ -222,7 +347,8 @@ class StrategicProfile:
                 target_sec = self.ss.get_sec_server_instance(target_sec_id)
                 cr_ik = self.get_cr_ik(func=func, sec=target_sec, alloc_method=alloc_method)
                 latency, energy = collab_sec_execution(func=func, iot=iot, loc_sec=loc_sec, target_sec=target_sec,
-                                                       sec_network=self.ss.sec_network, cr_ik=cr_ik)
+                                                       sec_network=self.ss.sec_network, cr_ik=cr_ik,
+                                                       params=self.params)
 
             # 计算累加
             total_latency += latency
@@ -232,4 +358,5 @@ class StrategicProfile:
 
     def get_ref_latency_energy(self, alloc_method: str = 'WF'):
         latency, energy = self.get_real_latency_energy(alloc_method=alloc_method)
-        return latency / T_ref * OMEGA, energy / E_ref * OMEGA
+        return latency / self.params.t_ref * self.params.omega, energy / self.params.e_ref * self.params.omega
+
@@ -0,0 +1,232 @@
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from core.allocation_policies import EqualShare, FixedAllocation, WeightedShare, get_policy
+from core.system_models.cost_model import *
+from core.system_state import SystemState
+
+# 流式输入：每个分块是 (函数任务, 关联IoT设备id) 列表，见 utils.dataset_loader.iter_task_chunks
+TaskChunk = List[Tuple[FunctionTask, int]]
+
+
+# 按比例分配的策略：ES 及 WeightedShare 的子类（LP/WF 等），cr_i = w_i / W * CR
+def is_proportional(alloc_method: str) -> bool:
+    return isinstance(get_policy(alloc_method), (EqualShare, WeightedShare))
+
+
+# 资源池聚合量能表示的策略：按比例分配和 FIXED 固定分配（BWF 等有上下界的分配不能由聚合量算出）
+def supports_pool(alloc_method: str) -> bool:
+    return is_proportional(alloc_method) or isinstance(get_policy(alloc_method), FixedAllocation)
+
+
+# 资源分配方法对应的分配权重 w_i：ES 按个数，其他按比例分配的策略取 WeightedShare.weight
+def alloc_weight(func: FunctionTask, alloc_method: str) -> float:
+    policy = get_policy(alloc_method)
+    if isinstance(policy, EqualShare):
+        return 1.0
+    if isinstance(policy, WeightedShare):
+        return policy.weight(func)
+    return 0.0  # FIXED 不需要权重
+
+
+# 一组共享计算资源 CR 的卸载任务的聚合量
+# 对 ES/LP/WF，cr_i = w_i / W * CR，所以 sum(a_i / cr_i) = W * H / CR，其中 a_i = 冷启动初始化 + 执行工作量，H = sum(a_i / w_i)
+# 对 FIXED，cr_i 为定值，sum(a_i / cr_i) = A / cr
+class ResourcePool:
+    __slots__ = ('cr', 'count', 'weight', 'h', 'work')
+
+    def __init__(self, cr: float):
+        self.cr = cr  # 可用计算资源 (MHz)
+        self.count = 0  # 任务数 m
+        self.weight = 0.0  # W = sum(w_i)
+        self.h = 0.0  # H = sum(a_i / w_i)
+        self.work = 0.0  # A = sum(a_i)
+
+    # 加入 count 个相同的任务
+    def add(self, work: float, weight: float, count: int = 1):
+        self.count += count
+        self.weight += count * weight
+        self.h += count * work / weight if weight else 0.0
+        self.work += count * work
+
+    # 移出 count 个相同的任务
+    def remove(self, work: float, weight: float, count: int = 1):
+        self.add(work, weight, -count)
+
+    # 池中所有任务的 sum(a_i / cr_ik)，即依赖资源分配的那部分延迟
+    def alloc_latency(self, alloc_method: str, params: SystemParams, extra: Tuple[float, float] | None = None) -> float:
+        count, weight, h, work = self.count, self.weight, self.h, self.work
+        if extra is not None:
+            count += 1
+            weight += extra[1]
+            h += extra[0] / extra[1] if extra[1] else 0.0
+            work += extra[0]
+        if count == 0:
+            return 0.0
+        if is_proportional(alloc_method):
+            return weight * h / self.cr
+        cr_ik = get_policy(alloc_method).nominal_cr(params)
+        if cr_ik * count > self.cr:  # 满载，与 StrategicProfile.get_cr_ik 一致按 cr_ik = 1 计
+            return work
+        return work / cr_ik
+
+
+# 函数在资源池中的 (a_i, w_i)
+def pool_entry(func: FunctionTask, alloc_method: str, params: SystemParams) -> Tuple[float, float]:
+    work = params.sec_cont_init_effi * func.func_type.image_size + func.invocations * func.workload
+    return work, alloc_weight(func, alloc_method)
+
+
+# 把函数从IoT卸载到本地SEC（加入资源池）带来的 cost 变化，资源池满载（FIXED）时返回 None
+# = 本函数不依赖分配部分的 cost 差 + 资源池中所有函数分配延迟的增量
+def offload_gain(pool: ResourcePool, func: FunctionTask, iot: IoTDevice, loc_sec: SECServer, alloc_method: str,
+                 params: SystemParams) -> float | None:
+    iot_cost = norm_to_cost(*iot_execution(func=func, iot=iot, params=params), params=params)
+    base_cost = norm_to_cost(*loc_sec_execution(func=func, iot=iot, loc_sec=loc_sec, cr_ik=float('inf'),
+                                                params=params), params=params)
+    work, weight = pool_entry(func, alloc_method, params)
+    prev = pool.alloc_latency(alloc_method, params)
+    if is_proportional(alloc_method):
+        after = pool.alloc_latency(alloc_method, params, extra=(work, weight))
+    else:
+        cr_ik = get_policy(alloc_method).nominal_cr(params)
+        if cr_ik * (pool.count + 1) > pool.cr:
+            return None
+        after = (pool.work + work) / cr_ik
+    return base_cost - iot_cost + params.omega * (after - prev) / params.t_ref
+
+
+# 流式评估：逐个接收 (函数, 决策)，只保存每个SEC的聚合量，内存与任务数无关
+# 结果与 StrategicProfile.get_cost / get_real_latency_energy 相同（浮点误差内）
+class StreamingEvaluator:
+    def __init__(self, ss: SystemState, alloc_method: str = 'WF'):
+        if not supports_pool(alloc_method):
+            raise ValueError(f'流式评估只支持 ES/LP/WF/FIXED 资源分配，不支持 {alloc_method}')
+        self.ss = ss
+        self.params = ss.params
+        self.alloc_method = alloc_method
+
+        self.pools: Dict[int | str, ResourcePool] = {
+            sec.id: ResourcePool(ss.get_sec_available_cr(sec)) for sec in ss.get_sec_list()
+        }
+        self.func_count = 0
+        self.offload_count = 0
+        self.base_latency = 0.0  # 与分配资源无关的延迟之和（IoT执行延迟 + 传输 + 拉取镜像）
+        self.energy = 0.0
+
+    def __repr__(self):
+        return f'{self.__class__.__name__} with {self.alloc_method} resource alloc method'
+
+    # 计入一个函数的决策：sec_id 为 None 表示本地IoT执行，否则为执行SEC的id（本地SEC或协作SEC）
+    # count > 1 时计入 count 个相同的函数（任务等价类，见 core/compression.py）
+    def add(self, func: FunctionTask, iot_id: int | str, sec_id: int | str | None = None, count: int = 1):
+        iot = self.ss.iot_devices[iot_id]['instance']
+        self.func_count += count
+
+        # 策略1
+        if sec_id is None:
+            latency, energy = iot_execution(func=func, iot=iot, params=self.params)
+        else:
+            loc_sec = self.ss.u2s_mapping(iot_id)
+            # 策略2/3：cr_ik = inf 时得到不依赖资源分配的延迟部分
+            if sec_id == loc_sec.id:
+                latency, energy = loc_sec_execution(func=func, iot=iot, loc_sec=loc_sec, cr_ik=float('inf'),
+                                                    params=self.params)
+            else:
+                target_sec = self.ss.get_sec_server_instance(sec_id)
+                latency, energy = collab_sec_execution(func=func, iot=iot, loc_sec=loc_sec, target_sec=target_sec,
+                                                       sec_network=self.ss.sec_network, cr_ik=float('inf'),
+                                                       params=self.params)
+            self.pools[sec_id].add(*pool_entry(func, self.alloc_method, self.params), count)
+            self.offload_count += count
+
+        self.base_latency += count * latency
+        self.energy += count * energy
+
+    # 计入一个分块，decisions 与 chunk 一一对应（None 或 SEC id）
+    def add_chunk(self, chunk: TaskChunk, decisions: Iterable[int | str | None]):
+        for (func, iot_id), sec_id in zip(chunk, decisions):
+            self.add(func, iot_id, sec_id)
+
+    # 获取总延迟和总能耗（真实值，单位：latency in s，Energy in J）
+    def get_real_latency_energy(self) -> tuple[float, float]:
+        latency = self.base_latency
+        for pool in self.pools.values():
+            latency += pool.alloc_latency(self.alloc_method, self.params)
+        return latency, self.energy
+
+    # 获取系统 cost
+    def get_cost(self) -> float:
+        latency, energy = self.get_real_latency_energy()
+        return norm_to_cost(latency=latency, energy=energy, params=self.params)
+
+    def get_offload_ratio(self) -> float:
+        if self.func_count == 0:
+            return 0.0
+        return self.offload_count / self.func_count
+
+
+# 以分块方式评估任意逐函数决策规则：decide(chunk) 返回与 chunk 对应的决策列表（None 或 SEC id）
+def evaluate_stream(ss: SystemState, chunks: Iterable[TaskChunk],
+                    decide: Callable[[TaskChunk], Iterable[int | str | None]],
+                    alloc_method: str = 'WF') -> StreamingEvaluator:
+    evaluator = StreamingEvaluator(ss, alloc_method=alloc_method)
+    for chunk in chunks:
+        evaluator.add_chunk(chunk, decide(chunk))
+    return evaluator
+
+
+# 所有任务本地IoT执行（流式版本的 IoTOnly）
+def stream_iot_only(ss: SystemState, chunks: Iterable[TaskChunk]) -> StreamingEvaluator:
+    return evaluate_stream(ss, chunks, decide=lambda chunk: [None] * len(chunk))
+
+
+# 流式版本的 Algorithm 1 (LEAO)：把SEC侧看作一个全局资源池，按分块依次决策
+# 每个分块内按负载 n_i*c_i 降序处理；卸载收益由资源池聚合量 O(1) 算出，不再每步重算全部函数的 cost
+# 当只有一个分块时，决策与 LEAO 相同；分块时为按到达顺序的近似
+# 内存只与资源池聚合量和SEC数有关；需要逐个卸载决策时传入 on_offload(func_id, sec_id) 回调，由调用方决定如何保存
+class StreamingLEAO:
+    def __init__(self, ss: SystemState, alloc_method: str = 'WF', seed: int | None = None,
+                 on_offload: Callable[[int | str, int | str], None] | None = None):
+        # 资源池只保存聚合量，不知道每个SEC上的成员，无法做内存准入检查
+        if ss.params.memory_mode is not None:
+            raise ValueError('流式 LEAO 不支持内存约束（memory_mode），请使用 LEAO 或 OnlineDecider')
+        self.ss = ss
+        self.params = ss.params
+        self.alloc_method = alloc_method
+
+        self.pool = ResourcePool(ss.get_system_available_cr())  # 全局资源池
+        self.on_offload = on_offload
+        self.evaluator = StreamingEvaluator(ss, alloc_method=alloc_method)
+
+    def __repr__(self):
+        return f'Algorithm {self.__class__.__name__} with {self.alloc_method} resource alloc method'
+
+    # 对一个分块做卸载决策，返回与输入顺序对应的决策（None 或本地SEC id）
+    def decide(self, chunk: TaskChunk) -> List[int | str | None]:
+        params = self.params
+        decisions: List[int | str | None] = [None] * len(chunk)
+        order = sorted(range(len(chunk)), key=lambda i: chunk[i][0].invocations * chunk[i][0].workload,
+                       reverse=True)
+
+        for i in order:
+            func, iot_id = chunk[i]
+            iot = self.ss.iot_devices[iot_id]['instance']
+            loc_sec = self.ss.u2s_mapping(iot_id)
+
+            # 判断是否获得正收益，如果是负收益（或资源池满载），则保持本地IoT执行
+            delta = offload_gain(self.pool, func, iot, loc_sec, self.alloc_method, params)
+            if delta is not None and delta <= 0:
+                self.pool.add(*pool_entry(func, self.alloc_method, params))
+                if self.on_offload is not None:
+                    self.on_offload(func.id, loc_sec.id)
+                decisions[i] = loc_sec.id
+        return decisions
+
+    # 依次处理所有分块，返回评估器（按每个SEC的资源分配计算最终 cost）
+    def run(self, chunks: Iterable[TaskChunk]) -> StreamingEvaluator:
+        for chunk in chunks:
+            self.evaluator.add_chunk(chunk, self.decide(chunk))
+        return self.evaluator
+
+    def get_cost(self):
+        return self.evaluator.get_cost()
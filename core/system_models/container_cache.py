@@ -0,0 +1,118 @@
+from typing import Dict, Iterable
+
+from core.system_models.network_model import FunctionType, SECServer
+
+
+# 淘汰策略：返回缓存项的优先级，优先级最小的镜像先被淘汰
+# 缓存项 entry = [镜像大小(MB), 访问次数, 最近访问时刻, GDSF优先级]
+def _lru_key(entry: list):
+    return entry[2]
+
+
+def _lfu_key(entry: list):
+    return entry[1], entry[2]  # 访问次数相同时淘汰较久未访问的
+
+
+def _gdsf_key(entry: list):
+    return entry[3], entry[2]
+
+
+EVICTION_POLICIES = {
+    'LRU': _lru_key,
+    'LFU': _lfu_key,
+    'GDSF': _gdsf_key,  # Greedy-Dual-Size-Frequency：L + 访问次数 / 镜像大小，偏向保留小而热的镜像
+}
+
+
+class ContainerCache:
+    """SEC上按容量（MB）限制的容器镜像缓存"""
+
+    def __init__(self, capacity: float, policy: str = 'LRU'):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"未知的淘汰策略: {policy}，可选: {', '.join(EVICTION_POLICIES)}")
+        self.capacity = capacity  # 缓存容量 (MB)
+        self.policy = policy
+        self._key = EVICTION_POLICIES[policy]
+        self.entries: Dict[int | str, list] = {}  # 函数类型id -> 缓存项
+        self.used = 0.0  # 已用容量 (MB)
+        self._clock = 0  # 逻辑时钟，每次访问加 1
+        self._inflation = 0.0  # GDSF 的 L 值：最近一次被淘汰项的优先级
+
+        # 计数器
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return (f'ContainerCache {self.policy}: {self.used:.0f}/{self.capacity:.0f}MB, {len(self.entries)} images, '
+                f'hits {self.hits}, misses {self.misses}, evictions {self.evictions}')
+
+    def __contains__(self, type_id: int | str) -> bool:
+        return type_id in self.entries
+
+    # 只读查询，不改变缓存状态和计数器（用于 cost 计算和博弈中的假想策略）
+    def contains(self, type_id: int | str) -> bool:
+        return type_id in self.entries
+
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    # 访问一个镜像：命中返回 True；未命中时拉取镜像并放入缓存（必要时淘汰），返回 False
+    def access(self, func_type: FunctionType) -> bool:
+        self._clock += 1
+        entry = self.entries.get(func_type.id)
+        if entry is not None:
+            self.hits += 1
+            entry[1] += 1
+            entry[2] = self._clock
+            entry[3] = self._inflation + entry[1] / entry[0]
+            return True
+
+        self.misses += 1
+        self._insert(func_type.id, func_type.image_size)
+        return False
+
+    # 放入镜像（不计入命中/未命中），用于预热缓存
+    def put(self, func_type: FunctionType):
+        if func_type.id not in self.entries:
+            self._clock += 1
+            self._insert(func_type.id, func_type.image_size)
+
+    def _insert(self, type_id: int | str, size: float):
+        # 比整个缓存还大的镜像不缓存
+        if size > self.capacity:
+            return
+        while self.used + size > self.capacity:
+            victim = min(self.entries, key=lambda k: self._key(self.entries[k]))
+            self._inflation = self.entries[victim][3]
+            self.used -= self.entries.pop(victim)[0]
+            self.evictions += 1
+        self.entries[type_id] = [size, 1, self._clock, self._inflation + 1 / size]
+        self.used += size
+
+    def copy(self) -> 'ContainerCache':
+        cache = ContainerCache(self.capacity, self.policy)
+        cache.entries = {type_id: list(entry) for type_id, entry in self.entries.items()}
+        cache.used, cache._clock, cache._inflation = self.used, self._clock, self._inflation
+        cache.hits, cache.misses, cache.evictions = self.hits, self.misses, self.evictions
+        return cache
+
+
+# 为每个SEC启用容器缓存：容量默认为内存的 capacity_ratio，并用 cached_functions 预热
+def enable_container_caches(secs: Iterable[SECServer], function_types: Dict, policy: str = 'LRU',
+                            capacity: float | None = None, capacity_ratio: float = 0.05):
+    for sec in secs:
+        cache = ContainerCache(capacity if capacity is not None else sec.memory * capacity_ratio, policy)
+        for type_id in sorted(sec.cached_functions):
+            cache.put(function_types[type_id]['instance'])
+        sec.container_cache = cache
+
+
+# 关闭容器缓存，恢复使用静态的 cached_functions
+def disable_container_caches(secs: Iterable[SECServer]):
+    for sec in secs:
+        sec.container_cache = None
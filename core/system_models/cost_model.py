@@ -1,30 +1,45 @@
 from core.system_models.network_model import FunctionTask, IoTDevice, SECServer, SECNetwork
-from config import *
+from core.system_models.system_params import SystemParams, DEFAULT_PARAMS
 
 
-def iot_execution(func: FunctionTask, iot: IoTDevice):
+def iot_execution(func: FunctionTask, iot: IoTDevice, params: SystemParams = DEFAULT_PARAMS):
     """
     策略1：本地设备执行
     :param func: 函数任务对象
     :param iot: IoT设备对象
+    :param params: 系统模型参数
     :return: (延迟, 能耗)
     """
     # 计算执行延迟 (公式15)
     latency = (func.invocations * func.workload) / iot.comp_resource
 
     # 计算能耗 (公式16)
-    energy = IOT_EXE_EFFICIENT * func.invocations * func.workload * (iot.comp_resource ** 2)
+    energy = params.iot_exe_efficient * func.invocations * func.workload * (iot.comp_resource ** 2)
 
     return latency, energy
 
 
-def loc_sec_execution(func: FunctionTask, iot: IoTDevice, loc_sec: SECServer, cr_ik: float) -> tuple:
+def pull_latency(func: FunctionTask, sec: SECServer) -> float:
+    """
+    拉取镜像延迟 T^pull (公式19)：SEC已缓存该函数类型的镜像时为0
+    :param func: 函数任务对象
+    :param sec: 执行函数的SEC服务器对象
+    :return: 延迟
+    """
+    if sec.is_cached(func.func_type.id):
+        return 0
+    return func.func_type.image_size / (sec.backhaul_bw / 8)
+
+
+def loc_sec_execution(func: FunctionTask, iot: IoTDevice, loc_sec: SECServer, cr_ik: float,
+                      params: SystemParams = DEFAULT_PARAMS) -> tuple:
     """
     策略2：本地SEC执行
     :param func: 函数任务对象
     :param iot: IoT设备对象
     :param loc_sec: SEC服务器对象
     :param cr_ik: CPU分配(MHz)
+    :param params: 系统模型参数
     :return: (总延迟, 能耗)
     """
     # 1. 计算上行传输延迟 (公式17)
@@ -32,13 +47,10 @@ def loc_sec_execution(func: FunctionTask, iot: IoTDevice, loc_sec: SECServer, cr
 
     # 2. 计算冷启动延迟 (公式18-20)
     # 检查容器是否已缓存
-    if func.func_type.id in loc_sec.cached_functions:
-        T_pull = 0
-    else:
-        T_pull = func.func_type.image_size / (loc_sec.backhaul_bw / 8)
+    T_pull = pull_latency(func=func, sec=loc_sec)
 
     # 容器初始化时间 (公式20)
-    T_init = (SEC_CONT_INIT_EFFI * func.func_type.image_size) / cr_ik
+    T_init = (params.sec_cont_init_effi * func.func_type.image_size) / cr_ik
     T_cold = T_pull + T_init
 
     # 3. 计算执行时间 (公式21)
@@ -48,13 +60,13 @@ def loc_sec_execution(func: FunctionTask, iot: IoTDevice, loc_sec: SECServer, cr
     total_latency = T_d2s + T_cold + T_exe
 
     # 能耗 (公式23)
-    energy = iot.tx_power * T_d2s / IOT_TX_EFFICIENT
+    energy = iot.tx_power * T_d2s / params.iot_tx_efficient
 
     return total_latency, energy
 
 
 def collab_sec_execution(func: FunctionTask, iot: IoTDevice, loc_sec: SECServer, target_sec: SECServer,
-                         sec_network: SECNetwork, cr_ik: float) -> tuple:
+                         sec_network: SECNetwork, cr_ik: float, params: SystemParams = DEFAULT_PARAMS) -> tuple:
     """
     策略3：协作SEC执行
     :param sec_network: SECNetwork
@@ -63,6 +75,7 @@ def collab_sec_execution(func: FunctionTask, iot: IoTDevice, loc_sec: SECServer,
     :param loc_sec: 本地SEC服务器
     :param target_sec: 目标SEC服务器
     :param cr_ik: CPU分配(MHz)
+    :param params: 系统模型参数
     :return: (总延迟, 能耗)
     """
     # 1. 计算上行传输延迟 (同策略2)
@@ -76,12 +89,9 @@ def collab_sec_execution(func: FunctionTask, iot: IoTDevice, loc_sec: SECServer,
         T_s2s = float('inf')
 
     # 3. 计算目标服务器的冷启动延迟 T^cold (同策略2)
-    if func.func_type.id in target_sec.cached_functions:
-        T_pull = 0
-    else:
-        T_pull = func.func_type.image_size / (target_sec.backhaul_bw / 8)
+    T_pull = pull_latency(func=func, sec=target_sec)
 
-    T_init = (SEC_CONT_INIT_EFFI * func.func_type.image_size) / cr_ik
+    T_init = (params.sec_cont_init_effi * func.func_type.image_size) / cr_ik
     T_cold = T_pull + T_init
 
     # 4. 计算执行时间 T^exe (公式26)
@@ -91,12 +101,12 @@ def collab_sec_execution(func: FunctionTask, iot: IoTDevice, loc_sec: SECServer,
     total_latency = T_d2s + T_s2s + T_cold + T_exe
 
     # 能耗 (与策略2相同)
-    energy = iot.tx_power * T_d2s / IOT_TX_EFFICIENT
+    energy = iot.tx_power * T_d2s / params.iot_tx_efficient
 
     return total_latency, energy
 
 
-def norm_to_cost(latency: float, energy: float) -> float:
+def norm_to_cost(latency: float, energy: float, params: SystemParams = DEFAULT_PARAMS) -> float:
     # 计算归一化成本 (公式33)
-    cost = OMEGA * (latency / T_ref) + (1 - OMEGA) * (energy / E_ref)
+    cost = params.omega * (latency / params.t_ref) + (1 - params.omega) * (energy / params.e_ref)
     return cost
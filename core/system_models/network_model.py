@@ -23,6 +23,13 @@ class SECServer:
         self.memory = memory
         self.backhaul_bw = backhaul_bw
         self.cached_functions = set()  # C_k 缓存函数类型集合
+        self.container_cache = None  # 容器镜像缓存（ContainerCache），为 None 时使用静态的 cached_functions
+
+    # 判断是否已缓存该函数类型的镜像：启用容器缓存时查询缓存（只读），否则使用 cached_functions
+    def is_cached(self, type_id: int | str) -> bool:
+        if self.container_cache is None:
+            return type_id in self.cached_functions
+        return self.container_cache.contains(type_id)
 
     def __repr__(self):
         return f'SECServer {self.id}: CPU {self.comp_resource}, MEM {self.memory}, BackhaulBW {self.backhaul_bw}, CachedFunc {self.cached_functions}'
@@ -37,8 +44,12 @@ class IoTDevice:
         self.comp_resource = comp_resource  # CR_uj 计算资源
         self.tx_power = tx_power  # P_d2s 发射功率，单位W
         self.bandwidth = bandwidth  # B_d2s 分配带宽，单位Hz
-        self.channel_gain = channel_gain  # h 信道增益
         self.noise_power = noise_power  # σ 噪声功率，单位W
+        self.update_channel(channel_gain)
+
+    # 更新信道增益（如切换基站后），重新计算上行速率
+    def update_channel(self, channel_gain: float):
+        self.channel_gain = channel_gain  # h 信道增益
         # 香农公式
         snr = (self.tx_power * self.channel_gain) / self.noise_power
         self.uplink_rate = self.bandwidth * math.log2(1 + snr) / 1e6  # 发送速率，单位：Mbps（从bps转换为Mbps）
@@ -61,12 +72,15 @@ class FunctionType:
 class FunctionTask:
     """函数任务实体"""
 
-    def __init__(self, id: int | str, data_size: float, workload: float, invocations: int, func_type: FunctionType):
+    def __init__(self, id: int | str, data_size: float, workload: float, invocations: int, func_type: FunctionType,
+                 min_cr: float | None = None, max_cr: float | None = None):
         self.id = id
         self.data_size = data_size  # d_i 输入数据大小 (KB)
         self.workload = workload  # c_i 计算负载 (CPU cycles)
         self.invocations = invocations  # n_i 调用次数
         self.func_type = func_type  # 函数任务类型
+        self.min_cr = min_cr  # BWF 分配的最小计算资源 (MHz)，None 表示使用 SystemParams.bwf_min_cr
+        self.max_cr = max_cr  # BWF 分配的最大计算资源 (MHz)，None 表示使用 SystemParams.bwf_max_cr
 
     def __repr__(self):
         return f'FunctionTask {self.id}: DataSize {self.data_size}, WorkLoad {self.workload}, Invocations {self.invocations}, FuncType {self.func_type.id}, ImageSize {self.func_type.image_size}'
@@ -78,9 +92,11 @@ class SECNetwork:
     def __init__(self):
         self.servers = {}  # 服务器集合: server_id -> SECServer
         self.edges = {}  # 网络边: (server_id1, server_id2) -> (latency, bandwidth)
+        self._routes = {}  # 路由缓存: source_id -> {target_id: (latency, bandwidth)}，拓扑变化时清空
 
     def add_server(self, server: SECServer):
         self.servers[server.id] = server
+        self._routes.clear()
 
     def add_connection(self, server_id1: int, server_id2: int, latency: float, bandwidth: float):
         if server_id1 not in self.servers or server_id2 not in self.servers:
@@ -89,15 +105,15 @@ class SECNetwork:
         # 无向图处理 (保证元组有序)
         key = tuple(sorted((server_id1, server_id2)))
         self.edges[key] = (latency, bandwidth)
+        self._routes.clear()
 
     def get_latency_and_bandwidth(self, sec_id_1: int | str, sec_id_2: int | str) -> tuple:
         """
         返回server1与server2之间的延迟和带宽。
         - 如果有直接边，直接返回（latency, bandwidth）
         - 否则通过最短路径(Dijkstra)计算：延迟为路径中延迟之和，带宽为路径瓶颈带宽
+          同一源点的所有最短路径一次算出并缓存，多跳拓扑下重复查询为 O(1)
         """
-        import heapq
-
         # 验证服务器存在
         if sec_id_1 not in self.servers or sec_id_2 not in self.servers:
             raise ValueError("指定的服务器不存在")
@@ -107,55 +123,57 @@ class SECNetwork:
         if key in self.edges:
             return self.edges[key]
 
-        # 构建邻接表: node -> list of (neighbor, latency)
+        routes = self._routes.get(sec_id_1)
+        if routes is None:
+            routes = self._routes[sec_id_1] = self._shortest_routes(sec_id_1)
+
+        # 目标不可达
+        return routes.get(sec_id_2, (None, None))
+
+    def _shortest_routes(self, source_id: int | str) -> dict:
+        """单源 Dijkstra：返回 target_id -> (路径总延迟, 路径瓶颈带宽)，不含不可达的服务器"""
+        import heapq
+
+        # 构建邻接表: node -> list of (neighbor, latency, bandwidth)
         adj = {sid: [] for sid in self.servers}
         for (u, v), (lat, bw) in self.edges.items():
-            adj[u].append((v, lat))
-            adj[v].append((u, lat))
+            adj[u].append((v, lat, bw))
+            adj[v].append((u, lat, bw))
 
         # Dijkstra 初始化
         dist = {sid: float('inf') for sid in self.servers}
+        prev_bw = {}  # 最短路径上进入该节点的边的带宽
         prev = {sid: None for sid in self.servers}
-        dist[sec_id_1] = 0
-        pq = [(0, sec_id_1)]
+        dist[source_id] = 0
+        pq = [(0, source_id)]
+        settled = []
 
         # 执行最短路径
         while pq:
             current_dist, u = heapq.heappop(pq)
             if current_dist > dist[u]:
                 continue
-            if u == sec_id_2:
-                break
-            for v, weight in adj[u]:
+            settled.append(u)
+            for v, weight, bw in adj[u]:
                 new_dist = current_dist + weight
                 if new_dist < dist[v]:
                     dist[v] = new_dist
                     prev[v] = u
+                    prev_bw[v] = bw
                     heapq.heappush(pq, (new_dist, v))
 
-        # 目标不可达
-        if dist[sec_id_2] == float('inf'):
-            return None, None
-
-        # 重建路径以计算瓶颈带宽
-        path = []
-        node = sec_id_2
-        while node is not None:
-            path.append(node)
-            node = prev[node]
-        path.reverse()
-
-        # 计算路径总延迟
-        total_latency = dist[sec_id_2]
-        # 计算瓶颈带宽
-        bandwidths = []
-        for i in range(len(path) - 1):
-            edge_key = tuple(sorted((path[i], path[i + 1])))
-            _, bw = self.edges[edge_key]
-            bandwidths.append(bw)
-        bottleneck_bw = min(bandwidths) if bandwidths else None
-
-        return total_latency, bottleneck_bw
+        # 按出队顺序计算瓶颈带宽（前驱节点总是先出队）
+        bottleneck = {source_id: None}
+        routes = {}
+        for node in settled:
+            if node in routes:
+                continue
+            if node != source_id:
+                prev_bottleneck = bottleneck[prev[node]]
+                bw = prev_bw[node]
+                bottleneck[node] = bw if prev_bottleneck is None else min(prev_bottleneck, bw)
+            routes[node] = (dist[node], bottleneck[node])
+        return routes
 
     def is_connected(self, server_id1: int, server_id2: int) -> bool:
         # 利用get_connection判断是否可达
@@ -0,0 +1,30 @@
+from dataclasses import dataclass, replace
+
+import config
+
+
+@dataclass(frozen=True)
+class SystemParams:
+    """系统模型参数（不可变），默认值取自 config.py，绑定到 SystemState 上使用"""
+
+    omega: float = config.OMEGA  # 延迟的权重
+    ratio: float = config.RATIO  # cr与m的比例，计算资源MHz=内存MB*r
+    t_ref: float = config.T_ref  # 延迟归一化参考值(s)
+    e_ref: float = config.E_ref  # 能耗归一化参考值(J=W*s)
+    iot_exe_efficient: float = config.IOT_EXE_EFFICIENT  # IoT设备计算能耗系数 \eta
+    iot_tx_efficient: float = config.IOT_TX_EFFICIENT  # IoT 发射时的能量效率
+    sec_cont_init_effi: float = config.SEC_CONT_INIT_EFFI  # SEC初始化容器效率 \xi，单位：MHz/MB
+    # 内存约束模式：None-不检查（论文模型），'image'-每个容器占用镜像大小的内存，
+    # 'cr'-每个容器占用 cr_ik / RATIO 的内存，且不少于镜像大小
+    memory_mode: str | None = None
+    bwf_min_cr: float = config.BWF_MIN_CR  # BWF 每个函数的最小计算资源 (MHz)
+    bwf_max_cr: float = config.BWF_MAX_CR  # BWF 每个函数的最大计算资源 (MHz)
+    cr_granularity: float = config.CR_GRANULARITY  # BWF 分配粒度 (MHz)，0 表示连续分配
+
+    def replace(self, **changes) -> 'SystemParams':
+        # 返回修改了部分参数的新对象，例如 params.replace(omega=0.3)
+        return replace(self, **changes)
+
+
+# config.py 中的默认参数
+DEFAULT_PARAMS = SystemParams()
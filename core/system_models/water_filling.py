@@ -0,0 +1,93 @@
+import heapq
+import math
+from typing import List, Sequence
+
+
+def bounded_water_filling(weights: Sequence[float], lows: Sequence[float], highs: Sequence[float], capacity: float,
+                          granularity: float = 0.0) -> List[float]:
+    """
+    有上下界的注水算法：在 sum(cr_i) <= capacity、lows_i <= cr_i <= highs_i 下最小化 sum(w_i^2 / cr_i)
+    （w_i = sqrt(n_i * c_i) 时即为 sum(T_exe)，无界时结果与 WF 相同）。
+    KKT 条件给出 cr_i = clip(lambda * w_i, lows_i, highs_i)，把 2n 个断点排序后一次扫描求出水位 lambda，O(n log n)。
+    :param weights: 各函数的权重 w_i
+    :param lows: 各函数的最小计算资源 (MHz)
+    :param highs: 各函数的最大计算资源 (MHz)
+    :param capacity: SEC可分配的计算资源 (MHz)
+    :param granularity: 分配粒度 (MHz)，例如一个核；为 0 时连续分配
+    :return: 与输入顺序对应的分配向量 (MHz)
+
+    权重为 0 的函数取下界；正权重的函数全部到达上界后水位为无穷大，剩余资源不分配：
+    >>> bounded_water_filling([1.0, 0.0], [10, 10], [100, 100], 150)
+    [100, 10]
+    >>> bounded_water_filling([1.0, 0.0], [10, 10], [100, 100], 150, granularity=1)
+    [100, 10]
+    """
+    n = len(weights)
+    if n == 0:
+        return []
+    highs = [max(lo, hi) for lo, hi in zip(lows, highs)]
+
+    # 下界之和已超过容量：按下界比例缩放（无法满足全部下界）
+    low_total = sum(lows)
+    if low_total >= capacity:
+        return [lo * capacity / low_total for lo in lows]
+    # 上界之和不超过容量：全部取上界，剩余资源不分配
+    if sum(highs) <= capacity:
+        return list(highs)
+
+    # 断点：lambda 经过 lows_i / w_i 时函数 i 离开下界，经过 highs_i / w_i 时到达上界
+    events = []
+    for i, w in enumerate(weights):
+        if w > 0:
+            events.append((lows[i] / w, 0, i))
+            events.append((highs[i] / w, 1, i))
+    events.sort()
+
+    fixed = low_total  # 处于下界或上界的函数的分配之和
+    active = 0.0  # 处于界内的函数的权重之和
+    level = 0.0
+    for lam, kind, i in events:
+        if fixed + lam * active >= capacity:
+            if active > 0:
+                level = (capacity - fixed) / active
+            break
+        if kind == 0:
+            fixed -= lows[i]
+            active += weights[i]
+        else:
+            active -= weights[i]
+            fixed += highs[i]
+    else:
+        # 扫描完所有断点仍有剩余容量：正权重的函数都已到达上界（权重为 0 的函数不产生断点）
+        level = math.inf
+    cr = [min(max(level * w if w > 0 else 0.0, lo), hi) for w, lo, hi in zip(weights, lows, highs)]
+
+    if granularity > 0:
+        cr = _round_to_granularity(cr, weights, lows, highs, capacity, granularity)
+    return cr
+
+
+# 按粒度取整：先向下取整到粒度的整数倍（不低于下界、不高于上界），剩余的单位按边际收益 w^2 (1/c - 1/(c+g)) 贪心分配
+def _round_to_granularity(cr: List[float], weights: Sequence[float], lows: Sequence[float], highs: Sequence[float],
+                          capacity: float, granularity: float) -> List[float]:
+    g = granularity
+    low_units = [max(1, math.ceil(lo / g - 1e-9)) for lo in lows]
+    high_units = [max(lu, math.floor(hi / g + 1e-9)) for lu, hi in zip(low_units, highs)]
+    units = [min(max(math.floor(c / g + 1e-9), lu), hu) for c, lu, hu in zip(cr, low_units, high_units)]
+    remaining = math.floor(capacity / g + 1e-9) - sum(units)
+    if remaining < 0:
+        return cr  # 容量不足以按粒度满足下界，保持连续分配
+
+    def _gain(i: int) -> float:
+        c = units[i] * g
+        return weights[i] ** 2 * (1 / c - 1 / (c + g))
+
+    heap = [(-_gain(i), i) for i in range(len(units)) if units[i] < high_units[i] and weights[i] > 0]
+    heapq.heapify(heap)
+    while remaining > 0 and heap:
+        _, i = heapq.heappop(heap)
+        units[i] += 1
+        remaining -= 1
+        if units[i] < high_units[i]:
+            heapq.heappush(heap, (-_gain(i), i))
+    return [u * g for u in units]
@@ -1,17 +1,20 @@
+import copy
 from typing import List
 
 from core.system_models.network_model import BaseStation, SECServer, IoTDevice, FunctionType, FunctionTask, SECNetwork
-from config import *
+from core.system_models.system_params import SystemParams, DEFAULT_PARAMS
 
 
 class SystemState:
-    def __init__(self):
+    def __init__(self, params: SystemParams = DEFAULT_PARAMS):
+        self.params = params  # 系统模型参数（OMEGA、RATIO 等）
         self.base_stations = {}
         self.sec_servers = {}
         self.iot_devices = {}
         self.function_types = {}
         self.functions = {}
         self.sec_network = None
+        self._iot_funcs = None  # IoT设备id -> 函数id（首次查询时构建，之后随 add_function / remove_function 更新）
 
     # === setter方法 ===
 
@@ -42,10 +45,40 @@ class SystemState:
             'instance': func,
             'associated_iot_id': associated_iot_id
         }
+        if self._iot_funcs is not None:
+            self._iot_funcs.setdefault(associated_iot_id, {})[func.id] = None
+
+    def remove_function(self, func_id: int | str) -> FunctionTask:
+        _val = self.functions.pop(func_id)
+        if self._iot_funcs is not None:
+            self._iot_funcs.get(_val['associated_iot_id'], {}).pop(func_id, None)
+        return _val['instance']
+
+    # IoT设备切换基站（移动性）：更新 U->BS 关联，channel_gain 不为空时同时更新信道增益和上行速率。
+    # 函数的本地SEC由 F->U->BS->S 映射派生，随关联自动更新；返回派生数据发生变化的函数id
+    # （本地SEC改变或信道更新时为该设备的全部函数，否则为空），调用方只需让这些函数的缓存失效并重新决策
+    def handover_iot(self, iot_id: int | str, new_bs_id: int | str,
+                     channel_gain: float | None = None) -> List[int | str]:
+        if new_bs_id not in self.base_stations:
+            raise KeyError(f'基站 {new_bs_id} 不存在')
+        _val = self.iot_devices[iot_id]
+        prev_sec_id = self.base_stations[_val['associated_bs_id']]['associated_sec_id']
+        _val['associated_bs_id'] = new_bs_id
+        if channel_gain is not None:
+            _val['instance'].update_channel(channel_gain)
+        elif self.base_stations[new_bs_id]['associated_sec_id'] == prev_sec_id:
+            return []
+        return self.get_iot_func_ids(iot_id)
 
     def set_sec_network(self, sec_network: SECNetwork):
         self.sec_network = sec_network
 
+    # 返回绑定了另一组模型参数的系统状态（浅拷贝，共享实体与映射关系）
+    def with_params(self, params: SystemParams) -> 'SystemState':
+        ss = copy.copy(self)
+        ss.params = params
+        return ss
+
     # === getter方法 ===
 
     # === 数量 ===
@@ -84,17 +117,23 @@ class SystemState:
     def get_function_list(self) -> List[FunctionTask]:
         return [_val['instance'] for _val in self.functions.values()]
 
+    # 获取某个IoT设备关联的函数id（IoT -> F 反向索引）
+    def get_iot_func_ids(self, iot_id: int | str) -> List[int | str]:
+        if self._iot_funcs is None:
+            self._iot_funcs = {}
+            for func_id, _val in self.functions.items():
+                self._iot_funcs.setdefault(_val['associated_iot_id'], {})[func_id] = None
+        return list(self._iot_funcs.get(iot_id, {}))
+
     # === 复杂属性计算 ===
 
     # 获取某个sec的总可用内存（S_k = min(M_K, CR_k / RATIO)，单位：MB）
-    @staticmethod
-    def get_sec_available_mem(sec: SECServer) -> float:
-        return min(sec.memory, sec.comp_resource / RATIO)
+    def get_sec_available_mem(self, sec: SECServer) -> float:
+        return min(sec.memory, sec.comp_resource / self.params.ratio)
 
     # 获取某个sec的总可用计算资源（CR_K = min(M_k * RATIO, CR_k)，单位：MHz）
-    @staticmethod
-    def get_sec_available_cr(sec: SECServer) -> float:
-        return min(sec.memory * RATIO, sec.comp_resource)
+    def get_sec_available_cr(self, sec: SECServer) -> float:
+        return min(sec.memory * self.params.ratio, sec.comp_resource)
 
     # 计算系统总内存 (单位: MB)
     def get_system_available_mem(self) -> float:
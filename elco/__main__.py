@@ -0,0 +1,5 @@
+import sys
+
+from elco.cli import main
+
+sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+cli.py
+
+Command-line entry point of ELCO_simulation.
+
+    python -m elco run --scales small,large --experiment 05 --workers 8
+    python -m elco run --scales tiny --algorithms LEAO+PGES,CGO+CGS --alloc-methods WF,ES
+    python -m elco run --scales tiny,small --algorithms LEAO+PGES --dry-run
+    python -m elco list
+    python -m elco serve --scale small --socket /tmp/elco.sock
+    python -m elco loadgen --socket /tmp/elco.sock --requests 20000 --concurrency 64
+
+Algorithms are resolved through core.algorithm_registry, so a run that selects only LEAO+PGES imports
+only those two modules. Jobs (scale x experiment, or scale x pipeline x allocation method) are spread
+over a process pool; the parent process is the only writer of the result CSV. With --sink sqlite (or both)
+the workers send their rows to one writer process that batches them into results/results.db
+(see utils.results_store and scripts/query_results.py). `serve` starts the online decision service
+(elco/service.py) and `loadgen` drives it (elco/loadgen.py).
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from functools import partial
+
+from config import DATASET_SIZES, SYNTHETIC_SIZES
+from core.algorithm_registry import list_algorithms, parse_pipeline
+from elco.jobs import EXPERIMENTS, expand_jobs, run_job
+from utils import results_recorder
+from utils.results_recorder import BufferedCsvWriter
+from utils.results_store import DEFAULT_DB_PATH, ResultsWriterProcess, send
+
+# 工作进程中的结果队列（由进程池 initializer 设置），为 None 时不写入 SQLite
+_sink_queue = None
+
+
+def _init_sink(queue):
+    global _sink_queue
+    _sink_queue = queue
+
+
+def _run_and_send(job, datasets_root: str) -> list:
+    rows = run_job(job, datasets_root=datasets_root)
+    if _sink_queue is not None:
+        send(_sink_queue, job.header_name, rows, job.scale)
+    return rows
+
+
+def _split(value: str | None) -> list:
+    return [v.strip() for v in value.split(',') if v.strip()] if value else []
+
+
+def cmd_list(args) -> int:
+    print('数据集规模:', ', '.join(list(DATASET_SIZES) + list(SYNTHETIC_SIZES)))
+    print('实验:', ', '.join(EXPERIMENTS))
+    print('卸载算法:', ', '.join(list_algorithms('offloading')))
+    print('调度算法:', ', '.join(list_algorithms('scheduling')))
+    return 0
+
+
+def cmd_run(args) -> int:
+    scales = _split(args.scales) or list(DATASET_SIZES)
+    for scale in scales:
+        if scale not in DATASET_SIZES and scale not in SYNTHETIC_SIZES:
+            raise SystemExit(f'未知的数据集规模: {scale}')
+
+    experiments = [e.zfill(2) for e in _split(args.experiment)]
+    for experiment in experiments:
+        if experiment not in EXPERIMENTS:
+            raise SystemExit(f'未知的实验: {experiment}，可选: {", ".join(EXPERIMENTS)}')
+    try:
+        pipelines = [parse_pipeline(spec) for spec in _split(args.algorithms)]
+    except (KeyError, ValueError) as e:
+        raise SystemExit(str(e))
+    if not experiments and not pipelines:
+        experiments = ['05']
+
+    overrides = [('omega', args.omega), ('ratio', args.ratio), ('memory_mode', args.memory_mode)]
+    params = tuple((k, v) for k, v in overrides if v is not None)
+    jobs = expand_jobs(scales, experiments, pipelines, _split(args.alloc_methods), args.seed, params)
+
+    if args.dry_run:
+        for i, job in enumerate(jobs):
+            print(f'{i:>4}  {job.describe()}')
+        print(f'共 {len(jobs)} 个作业')
+        return 0
+
+    # 每种表头写入一个结果文件
+    curr_time = datetime.now().strftime('%Y%m%d_%H%M%S')
+    csv_writers = {}
+    db_writer = None
+    if args.sink in ('sqlite', 'both'):
+        db_writer = ResultsWriterProcess(args.db, run_name=args.output or f'run_{curr_time}',
+                                         description=' '.join(sys.argv[1:]))
+    queue = db_writer.queue if db_writer else None
+
+    def _write(job, rows):
+        if args.sink == 'sqlite':
+            return
+        if job.header_name not in csv_writers:
+            suffix = '' if job.header_name == 'header' else '_replicates'
+            file_name = f'{args.output or "result"}{suffix}_{curr_time}.csv'
+            csv_writers[job.header_name] = BufferedCsvWriter(file_name, getattr(results_recorder, job.header_name))
+        csv_writers[job.header_name].write(rows)
+
+    workers = min(args.workers or os.cpu_count() or 1, len(jobs))
+    runner = partial(_run_and_send, datasets_root=args.datasets_root)
+    try:
+        if workers <= 1:
+            _init_sink(queue)
+            for job in jobs:
+                print(f'============ {job.describe()} ============')
+                _write(job, runner(job))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_sink, initargs=(queue,)) as executor:
+                futures = {executor.submit(runner, job): job for job in jobs}
+                for future in as_completed(futures):
+                    job = futures[future]
+                    print(f'============ 完成 {job.describe()} ============')
+                    _write(job, future.result())
+    finally:
+        for writer in csv_writers.values():
+            writer.close()
+        if db_writer:
+            db_writer.close()
+
+    for writer in csv_writers.values():
+        print(f'结果已写入: results/{writer.file_name}')
+    if db_writer:
+        print(f'结果已写入: {args.db} (run {db_writer.run_id})')
+    return 0
+
+
+def cmd_serve(args) -> int:
+    from core.decision_cache import DecisionCache
+    from core.online_decision import OnlineDecider
+    from elco.service import run_service
+    from utils.dataset_loader import load_scale
+
+    ss = load_scale(args.scale, datasets_root=args.datasets_root)
+    if args.memory_mode:
+        ss = ss.with_params(ss.params.replace(memory_mode=args.memory_mode))
+    if args.empty:
+        for func_id in list(ss.functions):
+            ss.remove_function(func_id)
+    memo = DecisionCache(capacity=args.memo_size, ttl=args.memo_ttl, bucket_width=args.memo_bucket) \
+        if args.memo else None
+    try:
+        decider = OnlineDecider(ss, alloc_method=args.alloc_method, refine_iter=args.refine_iter,
+                                deadline=args.deadline, memo=memo)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    service = run_service(decider, socket_path=args.socket, host=args.host, port=args.port,
+                          batch_window=args.batch_window, max_batch=args.max_batch)
+    stats = service.stats()
+    print(f'*结果：{stats["decisions"]} decisions in {stats["batches"]} batches '
+          f'(mean batch {stats["mean_batch"]:.1f}), decision time {stats["decision_time"]:.2f}s')
+    if memo is not None:
+        print(f'*记忆化：{memo}, {memo.evictions} evictions, {memo.expirations} expirations, '
+              f'{memo.invalidations} invalidations')
+    return 0
+
+
+def cmd_loadgen(args) -> int:
+    import asyncio
+
+    from elco.loadgen import run_load
+
+    report = asyncio.run(run_load(socket_path=args.socket, host=args.host, port=args.port, requests=args.requests,
+                                  duration=args.duration, concurrency=args.concurrency,
+                                  depart_ratio=args.depart_ratio, signatures=args.signatures, seed=args.seed))
+    print(f'*结果：{report.requests} requests ({report.errors} errors) in {report.elapsed:.2f}s, '
+          f'{report.throughput:.0f} decisions/s, latency p50 {report.p50:.2f}ms, p95 {report.p95:.2f}ms, '
+          f'p99 {report.p99:.2f}ms, max {report.max:.2f}ms, offloaded {report.offload_ratio:.2f}, '
+          f'mean batch {report.mean_batch:.1f}'
+          + (f', memo hit ratio {report.memo_hit_ratio:.2f}' if report.memo_hit_ratio is not None else ''))
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m elco', description='ELCO simulation')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='run experiments or algorithm pipelines')
+    run_parser.add_argument('--scales', default=None, help='comma separated scales (default: all DATASET_SIZES)')
+    run_parser.add_argument('--experiment', default=None, help='comma separated experiment ids, e.g. 05')
+    run_parser.add_argument('--algorithms', default=None, help='comma separated pipelines, e.g. LEAO+PGES,CGO+CGS')
+    run_parser.add_argument('--alloc-methods', default='WF', help='comma separated allocation methods for pipelines')
+    run_parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    run_parser.add_argument('--seed', type=int, default=None, help='seed passed to every algorithm')
+    run_parser.add_argument('--omega', type=float, default=None, help='override the latency weight OMEGA')
+    run_parser.add_argument('--ratio', type=float, default=None, help='override the CPU/MEM RATIO')
+    run_parser.add_argument('--memory-mode', choices=['image', 'cr'], default=None,
+                            help='enforce SEC memory: containers need their image size, or cr_ik / RATIO (>= image)')
+    run_parser.add_argument('--datasets-root', default='datasets')
+    run_parser.add_argument('--output', default=None, help='result file name prefix under results/')
+    run_parser.add_argument('--sink', choices=['csv', 'sqlite', 'both'], default='csv',
+                            help='write results to CSV files, the SQLite store, or both')
+    run_parser.add_argument('--db', default=str(DEFAULT_DB_PATH), help='SQLite results database')
+    run_parser.add_argument('--dry-run', action='store_true', help='only list the expanded jobs')
+    run_parser.set_defaults(func=cmd_run)
+
+    list_parser = subparsers.add_parser('list', help='list scales, experiments and algorithms')
+    list_parser.set_defaults(func=cmd_list)
+
+    serve_parser = subparsers.add_parser('serve', help='run the online offloading decision service')
+    serve_parser.add_argument('--scale', default='small', help='dataset loaded into the service')
+    serve_parser.add_argument('--socket', default=None, help='Unix socket path (default: localhost TCP)')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--alloc-method', default='WF', help='ES, LP, WF or FIXED-<MB>')
+    serve_parser.add_argument('--batch-window', type=float, default=0.002, help='micro-batching window (s)')
+    serve_parser.add_argument('--max-batch', type=int, default=256, help='maximum messages per batch')
+    serve_parser.add_argument('--refine-iter', type=int, default=2, help='PGES refinement rounds per batch')
+    serve_parser.add_argument('--deadline', type=float, default=None, help='decision time budget per batch (s)')
+    serve_parser.add_argument('--memory-mode', choices=['image', 'cr'], default=None)
+    serve_parser.add_argument('--memo', action='store_true', help='memoize decisions of recurring task signatures')
+    serve_parser.add_argument('--memo-size', type=int, default=65536, help='decision cache capacity (LRU)')
+    serve_parser.add_argument('--memo-ttl', type=float, default=None, help='decision cache entry lifetime (s)')
+    serve_parser.add_argument('--memo-bucket', type=float, default=0.1,
+                              help='relative width of the SEC load buckets in the cache key')
+    serve_parser.add_argument('--empty', action='store_true', help='start without the dataset\'s function tasks')
+    serve_parser.add_argument('--datasets-root', default='datasets')
+    serve_parser.set_defaults(func=cmd_serve)
+
+    load_parser = subparsers.add_parser('loadgen', help='drive the decision service and measure latency')
+    load_parser.add_argument('--socket', default=None, help='Unix socket path (default: localhost TCP)')
+    load_parser.add_argument('--host', default='127.0.0.1')
+    load_parser.add_argument('--port', type=int, default=8765)
+    load_parser.add_argument('--requests', type=int, default=10000)
+    load_parser.add_argument('--duration', type=float, default=None, help='run for this many seconds instead')
+    load_parser.add_argument('--concurrency', type=int, default=64, help='concurrent client connections')
+    load_parser.add_argument('--depart-ratio', type=float, default=0.5, help='probability of a departure request')
+    load_parser.add_argument('--signatures', type=int, default=None,
+                             help='draw arrivals from a pool of this many recurring task signatures')
+    load_parser.add_argument('--seed', type=int, default=0)
+    load_parser.set_defaults(func=cmd_loadgen)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
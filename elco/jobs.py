@@ -0,0 +1,106 @@
+import importlib
+import time
+from dataclasses import dataclass
+from typing import List
+
+from core.algorithm_registry import run_pipeline
+from core.system_state import SystemState
+from utils.dataset_loader import load_scale
+
+# 实验编号 -> 结果表头名称（utils.results_recorder 中的变量名）
+EXPERIMENTS = {
+    '01': 'header',
+    '02': 'header',
+    '03': 'header',
+    '04': 'header',
+    '05': 'header',
+    '06': 'replicate_header',
+}
+
+
+@dataclass(frozen=True)
+class Job:
+    """一次运行：在某个数据集规模上运行一个实验，或一条算法流水线"""
+    scale: str
+    experiment: str | None = None  # 实验编号，如 '05'
+    pipeline: tuple | None = None  # 算法流水线，如 ('LEAO', 'PGES')
+    alloc_method: str = 'WF'  # 资源分配方法
+    seed: int | None = None  # 随机种子
+    params: tuple = ()  # 覆盖的模型参数，如 (('omega', 0.3),)
+
+    @property
+    def header_name(self) -> str:
+        return EXPERIMENTS[self.experiment] if self.experiment else 'header'
+
+    def describe(self) -> str:
+        if self.experiment:
+            what = f'experiment {self.experiment}'
+        elif self.pipeline == ('IoTOnly',):
+            what = 'IoTOnly'
+        else:
+            what = f'{"+".join(self.pipeline)} + {self.alloc_method}'
+        extra = ''.join(f', {k}={v}' for k, v in self.params)
+        seed = f', seed={self.seed}' if self.seed is not None else ''
+        return f'[{self.scale}] {what}{seed}{extra}'
+
+
+def expand_jobs(scales: List[str], experiments: List[str] | None = None, pipelines: List[tuple] | None = None,
+                alloc_methods: List[str] | None = None, seed: int | None = None, params: tuple = ()) -> List[Job]:
+    jobs = []
+    for scale in scales:
+        for experiment in experiments or []:
+            jobs.append(Job(scale=scale, experiment=experiment, seed=seed, params=params))
+        for pipeline in pipelines or []:
+            # IoTOnly 不使用SEC资源，只需运行一次
+            for alloc_method in (alloc_methods or ['WF'])[:1 if pipeline == ('IoTOnly',) else None]:
+                jobs.append(Job(scale=scale, pipeline=pipeline, alloc_method=alloc_method, seed=seed, params=params))
+    return jobs
+
+
+# 工作进程内按规模缓存系统状态，同一进程中的多个作业只加载一次数据集
+_state_cache = {}
+
+
+def _load_state(scale: str, datasets_root: str, params: tuple) -> SystemState:
+    if scale not in _state_cache:
+        _state_cache[scale] = load_scale(scale, datasets_root=datasets_root)
+    ss = _state_cache[scale]
+    if params:
+        ss = ss.with_params(ss.params.replace(**dict(params)))
+    return ss
+
+
+def run_job(job: Job, datasets_root: str = 'datasets') -> List[List]:
+    ss = _load_state(job.scale, datasets_root, job.params)
+
+    if job.experiment:
+        experimental_procedure = importlib.import_module('experimental_procedure')
+        experimental = getattr(experimental_procedure, f'experimental_{job.experiment}')
+        if job.experiment == '06':
+            # 作业本身已经在进程池中并行，副本在作业内串行运行
+            return experimental(ss, base_seed=job.seed or 0, workers=1)
+        return experimental(ss)
+
+    # 运行算法流水线
+    start_time = time.time()
+    algo = run_pipeline(ss, job.pipeline, alloc_method=job.alloc_method, seed=job.seed)
+    end_time = time.time()
+
+    # 收集数据
+    algo_1_name = job.pipeline[0]
+    algo_2_name = ' + '.join(job.pipeline[1:])
+    alloc_method = '' if algo_1_name == 'IoTOnly' else job.alloc_method
+    full_name = ' + '.join(name for name in [algo_1_name, algo_2_name, alloc_method] if name)
+    cost = algo.get_cost()
+    ratio = algo.sp.get_offload_ratio()
+    latency, energy = algo.sp.get_real_latency_energy(alloc_method=job.alloc_method)
+    duration_time = end_time - start_time
+
+    print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio:.2f}, time {duration_time:.2f}s')
+    return [[
+        ss.get_base_station_count(), ss.get_sec_server_count(), ss.get_iot_device_count(),
+        ss.get_function_type_count(), ss.get_function_count(),
+        ss.params.omega, ss.params.ratio, ss.params.t_ref, ss.params.e_ref,
+        f'{full_name}', f'{algo_1_name}', f'{algo_2_name}', f'{alloc_method}',
+        cost, latency, energy, ratio, duration_time
+    ]]
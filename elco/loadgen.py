@@ -0,0 +1,123 @@
+"""
+loadgen.py
+
+Closed-loop load generator for the decision service (elco/service.py).
+
+Each of --concurrency clients opens its own connection and sends one request at a time: a task arrival with
+attributes drawn from the dataset generator's distributions (config.FUNC), or, with probability --depart-ratio,
+the departure of one of its earlier tasks. With --signatures N the arrivals are drawn from a fixed pool of N task
+signatures (IoT device, function type, data_size, workload, invocations), so that signatures recur as in
+production traffic. It reports decisions/s and the request latency percentiles.
+
+Usage (from the project root):
+    python -m elco loadgen --socket /tmp/elco.sock --requests 20000 --concurrency 64
+    python -m elco loadgen --port 8765 --duration 10
+    python -m elco loadgen --socket /tmp/elco.sock --signatures 200
+"""
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from config import FUNC
+
+
+@dataclass
+class LoadReport:
+    """Result of one load generator run."""
+    requests: int
+    errors: int
+    elapsed: float
+    throughput: float  # decisions/s
+    p50: float  # request latency (ms)
+    p95: float
+    p99: float
+    max: float
+    offload_ratio: float  # fraction of arrivals placed on a SEC
+    mean_batch: float  # server-side mean batch size
+    memo_hit_ratio: float | None  # server-side decision cache hit ratio (None without --memo)
+
+
+async def _open(socket_path: str | None, host: str, port: int):
+    if socket_path:
+        return await asyncio.open_unix_connection(socket_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def _call(reader, writer, msg: dict) -> dict:
+    writer.write(json.dumps(msg).encode() + b'\n')
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def run_load(socket_path: str | None = None, host: str = '127.0.0.1', port: int = 8765,
+                   requests: int = 10000, duration: float | None = None, concurrency: int = 64,
+                   depart_ratio: float = 0.5, signatures: int | None = None, seed: int = 0) -> LoadReport:
+    """
+    Drive the service until `requests` requests have been answered (or for `duration` seconds).
+
+    Args:
+        depart_ratio (float): Probability that a client departs one of its live tasks instead of sending a new one.
+        signatures (int): Size of the recurring task signature pool; None draws every arrival independently.
+    """
+    reader, writer = await _open(socket_path, host, port)
+    info = await _call(reader, writer, {'op': 'info'})
+    iot_ids, type_ids = info['iot_ids'], info['type_ids']
+
+    def _random_task(rng: random.Random) -> dict:
+        return {'iot_id': rng.choice(iot_ids), 'type_id': rng.choice(type_ids),
+                'data_size': rng.choice(FUNC.get('DATA_SIZE')), 'workload': rng.choice(FUNC.get('WORKLOAD')),
+                'invocations': rng.choice(FUNC.get('INVOCATION'))}
+
+    pool_rng = random.Random(seed)
+    signature_pool = [_random_task(pool_rng) for _ in range(signatures)] if signatures else None
+
+    latencies, counts = [], {'sent': 0, 'errors': 0, 'arrivals': 0, 'offloaded': 0}
+    start_time = time.perf_counter()
+
+    def _more() -> bool:
+        if duration is not None:
+            return time.perf_counter() - start_time < duration
+        return counts['sent'] < requests
+
+    async def client(i: int):
+        rng = random.Random(seed * 100003 + i)
+        r, w = await _open(socket_path, host, port)
+        live = []
+        try:
+            while _more():
+                counts['sent'] += 1
+                if live and rng.random() < depart_ratio:
+                    msg = {'op': 'depart', 'task_id': live.pop(rng.randrange(len(live)))}
+                else:
+                    task = dict(rng.choice(signature_pool)) if signature_pool else _random_task(rng)
+                    msg = {'op': 'arrive', 'task': task}
+                sent = time.perf_counter()
+                reply = await _call(r, w, msg)
+                latencies.append(time.perf_counter() - sent)
+                if not reply.get('ok'):
+                    counts['errors'] += 1
+                elif msg['op'] == 'arrive':
+                    live.append(reply['task_id'])
+                    counts['arrivals'] += 1
+                    counts['offloaded'] += reply['sec_id'] is not None
+        finally:
+            w.close()
+
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start_time
+    stats = await _call(reader, writer, {'op': 'stats'})
+    writer.close()
+
+    ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return LoadReport(requests=len(latencies), errors=counts['errors'], elapsed=elapsed,
+                      throughput=len(latencies) / elapsed if elapsed > 0 else 0.0,
+                      p50=float(np.percentile(ms, 50)), p95=float(np.percentile(ms, 95)),
+                      p99=float(np.percentile(ms, 99)), max=float(ms.max()),
+                      offload_ratio=counts['offloaded'] / counts['arrivals'] if counts['arrivals'] else 0.0,
+                      mean_batch=stats.get('mean_batch', 0.0),
+                      memo_hit_ratio=stats['memo']['hit_ratio'] if stats.get('memo') else None)
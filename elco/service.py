@@ -0,0 +1,238 @@
+"""
+service.py
+
+Online offloading decision service (asyncio).
+
+The service holds a loaded SystemState and a live StrategicProfile (core.online_decision.OnlineDecider) and
+speaks newline-delimited JSON over a Unix socket or a localhost TCP port, one object per line:
+
+    {"op": "arrive", "id": 1, "task": {"iot_id": 3, "type_id": 0, "data_size": 0.4, "workload": 200,
+                                       "invocations": 5}}
+    -> {"id": 1, "ok": true, "task_id": 1501, "sec_id": 2, "strategy": 2, "latency": 0.41, "energy": 0.02,
+        "batch": 12}
+    {"op": "depart", "id": 2, "task_id": 1501}   -> {"id": 2, "ok": true, "task_id": 1501}
+    {"op": "info"}                                -> IoT device and function type ids, task and SEC counts
+    {"op": "stats"}                               -> decisions, batches, mean batch size, decision time and,
+                                                     with --memo, the decision cache hit/miss/eviction counters
+
+Arrivals and departures from all connections are micro-batched: the first message of a batch opens a window of
+--batch-window seconds (or --max-batch messages), then the batch is decided at once (LEAO-style offload test and
+a short PGES refinement of the new tasks) and every message gets its reply. Messages keep their order within a
+batch: a departure of a task that arrived earlier in the same batch is applied after that arrival. "sec_id" is null for tasks executed
+on the IoT device; "task_id" may be given in the task, otherwise the service assigns one. A client may pipeline
+several requests on one connection; replies carry the request "id".
+
+Usage (from the project root):
+    python -m elco serve --scale small --socket /tmp/elco.sock
+    python -m elco serve --scale small --port 8765 --batch-window 0.002
+    python -m elco serve --scale small --socket /tmp/elco.sock --memo --memo-size 65536 --memo-ttl 60
+    python -m elco loadgen --socket /tmp/elco.sock --requests 20000 --concurrency 64
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import List
+
+from core.online_decision import OnlineDecider
+from core.system_models.network_model import FunctionTask
+
+
+class DecisionService:
+    """Micro-batching front end of an OnlineDecider."""
+
+    def __init__(self, decider: OnlineDecider, batch_window: float = 0.002, max_batch: int = 256):
+        self.decider = decider
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.next_task_id = max((i for i in decider.ss.functions if isinstance(i, int)), default=-1) + 1
+        self.pending_ids = set()  # 已排队、尚未加入系统状态的新函数id
+        self.batches = 0
+        self.batch_sizes = 0
+        self.started = time.perf_counter()
+        self._queue: asyncio.Queue | None = None
+
+    # 解析到达消息为 (函数, IoT设备id)，参数不合法时抛出 ValueError
+    def _parse_task(self, task: dict) -> tuple:
+        ss = self.decider.ss
+        iot_id, type_id = task.get('iot_id'), task.get('type_id')
+        if iot_id not in ss.iot_devices:
+            raise ValueError(f'unknown iot_id {iot_id}')
+        if type_id not in ss.function_types:
+            raise ValueError(f'unknown type_id {type_id}')
+        task_id = task.get('task_id')
+        if task_id is None:
+            task_id = self.next_task_id
+        elif task_id in ss.functions or task_id in self.pending_ids:
+            raise ValueError(f'task_id {task_id} already exists')
+        data_size, workload = float(task['data_size']), float(task['workload'])
+        invocations = int(task['invocations'])
+        for name, value in (('data_size', data_size), ('workload', workload), ('invocations', invocations)):
+            if not value > 0:  # also rejects NaN
+                raise ValueError(f'{name} must be positive, got {value}')
+        if isinstance(task_id, int):
+            self.next_task_id = max(self.next_task_id, task_id + 1)
+        func = FunctionTask(id=task_id, data_size=data_size, workload=workload, invocations=invocations,
+                            func_type=ss.function_types[type_id]['instance'])
+        self.pending_ids.add(task_id)
+        return func, iot_id
+
+    def stats(self) -> dict:
+        decider = self.decider
+        return {'ok': True, 'tasks': decider.ss.get_function_count(), 'offloaded': decider.sp.get_offload_count(),
+                'decisions': decider.decisions, 'batches': self.batches,
+                'mean_batch': self.batch_sizes / self.batches if self.batches else 0.0,
+                'decision_time': decider.decision_time, 'uptime': time.perf_counter() - self.started,
+                'memo': decider.memo.metrics() if decider.memo is not None else None}
+
+    def info(self) -> dict:
+        ss = self.decider.ss
+        return {'ok': True, 'iot_ids': list(ss.iot_devices), 'type_ids': list(ss.function_types),
+                'tasks': ss.get_function_count(), 'secs': ss.get_sec_server_count(),
+                'alloc_method': self.decider.alloc_method}
+
+    # 处理一条消息，返回回复
+    async def handle_message(self, msg: dict) -> dict:
+        op = msg.get('op')
+        try:
+            if op == 'arrive':
+                item = ('arrive', self._parse_task(msg.get('task') or {}))
+            elif op == 'depart':
+                item = ('depart', msg.get('task_id'))
+            elif op == 'stats':
+                return self.stats()
+            elif op == 'info':
+                return self.info()
+            else:
+                raise ValueError(f'unknown op {op}')
+        except (KeyError, TypeError, ValueError) as e:
+            return {'ok': False, 'error': str(e)}
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    # 批处理循环：第一条消息到达后等待一个窗口，把窗口内的消息（最多 max_batch 条）一次决策
+    async def batch_loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            if self.batch_window > 0:
+                await asyncio.sleep(self.batch_window)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._decide(batch)
+
+    # 按消息顺序把批次切成若干段：离开的函数在本段中刚到达时另起一段，保证同一函数先到达再离开
+    @staticmethod
+    def _segments(batch: List[tuple]) -> List[List[tuple]]:
+        segments, arriving = [[]], set()
+        for entry in batch:
+            kind, payload = entry[0]
+            if kind == 'depart' and payload in arriving:
+                segments.append([])
+                arriving = set()
+            elif kind == 'arrive':
+                arriving.add(payload[0].id)
+            segments[-1].append(entry)
+        return segments
+
+    def _decide(self, batch: List[tuple]):
+        self.batches += 1
+        self.batch_sizes += len(batch)
+        for segment in self._segments(batch):
+            self._decide_segment(segment, len(batch))
+
+    def _decide_segment(self, segment: List[tuple], batch_size: int):
+        ss = self.decider.ss
+        arrivals = [payload for (kind, payload), _ in segment if kind == 'arrive']
+        departures = [payload for (kind, payload), _ in segment if kind == 'depart']
+        known = {func_id for func_id in departures if func_id in ss.functions}
+        try:
+            decisions, _ = self.decider.apply(arrivals, departures)
+        except Exception as e:  # 决策失败时新到达的函数已回滚并返回错误，已生效的离开仍返回成功，服务继续运行
+            error = f'{type(e).__name__}: {e}'
+            for (kind, payload), future in segment:
+                if future.done():
+                    continue
+                if kind == 'depart' and payload in known and payload not in ss.functions:
+                    future.set_result({'ok': True, 'task_id': payload})
+                else:
+                    future.set_result({'ok': False, 'error': error})
+            return
+        finally:
+            self.pending_ids.difference_update(func.id for func, _ in arrivals)
+
+        decisions = iter(decisions)
+        for (kind, payload), future in segment:
+            if future.done():
+                continue
+            if kind == 'arrive':
+                d = next(decisions)
+                future.set_result({'ok': True, 'task_id': d.func_id, 'sec_id': d.sec_id, 'strategy': d.strategy,
+                                   'latency': d.latency, 'energy': d.energy, 'batch': batch_size})
+            elif payload in known:
+                future.set_result({'ok': True, 'task_id': payload})
+            else:
+                future.set_result({'ok': False, 'task_id': payload, 'error': f'unknown task_id {payload}'})
+
+    async def _reply(self, line: bytes, writer: asyncio.StreamWriter):
+        try:
+            msg = json.loads(line)
+            if not isinstance(msg, dict):
+                raise ValueError('message must be a JSON object')
+        except ValueError as e:
+            reply = {'ok': False, 'error': f'bad request: {e}'}
+        else:
+            reply = await self.handle_message(msg)
+            if 'id' in msg:
+                reply = {'id': msg['id'], **reply}
+        writer.write(json.dumps(reply).encode() + b'\n')
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._reply(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path: str | None = None, host: str = '127.0.0.1', port: int = 8765,
+                    ready: asyncio.Event | None = None):
+        self._queue = asyncio.Queue()
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            server = await asyncio.start_unix_server(self.handle_client, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host=host, port=port)
+        where = socket_path or f'{host}:{port}'
+        print(f'*服务：{self.decider}, {self.decider.ss.get_function_count()} tasks, listening on {where}')
+        batcher = asyncio.create_task(self.batch_loop())
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            if socket_path and os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+
+def run_service(decider: OnlineDecider, socket_path: str | None = None, host: str = '127.0.0.1',
+                port: int = 8765, batch_window: float = 0.002, max_batch: int = 256):
+    service = DecisionService(decider, batch_window=batch_window, max_batch=max_batch)
+    try:
+        asyncio.run(service.serve(socket_path=socket_path, host=host, port=port))
+    except KeyboardInterrupt:
+        pass
+    return service
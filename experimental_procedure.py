@@ -1,8 +1,11 @@
 import time
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List
 
 from core.algorithm_ELCO.algo_01_LEAO import LEAO
 from core.algorithm_ELCO.algo_02_PGES import PGES
+from core.algorithm_registry import stage_seeds
 from core.baseline_algorithms.offloading.baseline_algo_01_IoTOnly import IoTOnly
 from core.baseline_algorithms.offloading.baseline_algo_02_LocalSECOnly import LocalSECOnly
 from core.baseline_algorithms.offloading.baseline_algo_03_RandomOffloading import RandomOffloading
@@ -15,15 +18,9 @@ from core.baseline_algorithms.scheduling.baseline_algo_09_LeastLoadedFirstSchedu
 from core.baseline_algorithms.scheduling.baseline_algo_10_MinExecutionTimeScheduling import MinExecutionTimeScheduling
 from core.baseline_algorithms.scheduling.baseline_algo_11_CostGreedyScheduling import CostGreedyScheduling
 from core.system_state import SystemState
-from config import *
-
-# 实验结果表头
-header = [
-    'Base Station Count', 'SEC Server Count', 'IoT Device Count', 'Function Type Count', 'Function Task Count',
-    'Latency Weight (OMEGA)', 'CPU MEM RATIO', 'Latency REF (s)', 'Energy REF (J)',
-    'Algorithm Full Name', 'Offloading Algorithm', 'Scheduling Algorithm', 'Resource Allocation Algorithm',
-    'System Cost', 'Real Latency (s)', 'Real Energy (J)', 'Offloading Ratio', 'Execution Time (s)'
-]
+from utils.shared_state import SharedState, SharedStateHandle, attach, can_export
+from utils.results_recorder import header
+from utils.statistics import summarize
 
 
 # 实验1：证明WF注水算法的有效性
@@ -33,6 +30,7 @@ def experimental_01(ss: SystemState) -> List[List]:
     iot_count = ss.get_iot_device_count()
     func_type_count = ss.get_function_type_count()
     func_count = ss.get_function_count()
+    omega, cpu_mem_ratio, t_ref, e_ref = ss.params.omega, ss.params.ratio, ss.params.t_ref, ss.params.e_ref
 
     results = []
 
@@ -56,7 +54,7 @@ def experimental_01(ss: SystemState) -> List[List]:
     # 记录结果
     print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio * 100:.2f}%, time {duration_time:.2f}s')
     results.append([
-        bs_count, sec_count, iot_count, func_type_count, func_count, OMEGA, RATIO, T_ref, E_ref,
+        bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
         f'{full_name}', f'{algo_name}', f'', f'',
         cost, latency, energy, ratio, duration_time
     ])
@@ -82,7 +80,7 @@ def experimental_01(ss: SystemState) -> List[List]:
         # 记录结果
         print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio:.2f}, time {duration_time:.2f}s')
         results.append([
-            bs_count, sec_count, iot_count, func_type_count, func_count, OMEGA, RATIO, T_ref, E_ref,
+            bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
             f'{full_name}', f'{algo_name}', f'', f'{alloc_method}',
             cost, latency, energy, ratio, duration_time
         ])
@@ -108,7 +106,7 @@ def experimental_01(ss: SystemState) -> List[List]:
         # 记录结果
         print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio:.2f}, time {duration_time:.2f}s')
         results.append([
-            bs_count, sec_count, iot_count, func_type_count, func_count, OMEGA, RATIO, T_ref, E_ref,
+            bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
             f'{full_name}', f'{algo_name}', f'', f'{alloc_method}',
             cost, latency, energy, ratio, duration_time
         ])
@@ -134,7 +132,7 @@ def experimental_01(ss: SystemState) -> List[List]:
         # 记录结果
         print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio:.2f}, time {duration_time:.2f}s')
         results.append([
-            bs_count, sec_count, iot_count, func_type_count, func_count, OMEGA, RATIO, T_ref, E_ref,
+            bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
             f'{full_name}', f'{algo_name}', f'', f'{alloc_method}',
             cost, latency, energy, ratio, duration_time
         ])
@@ -160,7 +158,7 @@ def experimental_01(ss: SystemState) -> List[List]:
         # 记录结果
         print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio:.2f}, time {duration_time:.2f}s')
         results.append([
-            bs_count, sec_count, iot_count, func_type_count, func_count, OMEGA, RATIO, T_ref, E_ref,
+            bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
             f'{full_name}', f'{algo_name}', f'', f'{alloc_method}',
             cost, latency, energy, ratio, duration_time
         ])
@@ -175,6 +173,7 @@ def experimental_02(ss: SystemState) -> List[List]:
     iot_count = ss.get_iot_device_count()
     func_type_count = ss.get_function_type_count()
     func_count = ss.get_function_count()
+    omega, cpu_mem_ratio, t_ref, e_ref = ss.params.omega, ss.params.ratio, ss.params.t_ref, ss.params.e_ref
 
     results = []
 
@@ -202,7 +201,7 @@ def experimental_02(ss: SystemState) -> List[List]:
         # 记录结果
         print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio:.2f}, time {duration_time:.2f}s')
         results.append([
-            bs_count, sec_count, iot_count, func_type_count, func_count, OMEGA, RATIO, T_ref, E_ref,
+            bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
             f'{full_name}', f'{algo_1_name}', f'{algo_2_name}', f'{alloc_method}',
             cost, latency, energy, ratio, duration_time
         ])
@@ -228,7 +227,7 @@ def experimental_02(ss: SystemState) -> List[List]:
     # 记录结果
     print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio:.2f}, time {duration_time:.2f}s')
     results.append([
-        bs_count, sec_count, iot_count, func_type_count, func_count, OMEGA, RATIO, T_ref, E_ref,
+        bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
         f'{full_name}', f'{algo_1_name}', f'{algo_2_name}', f'{alloc_method}',
         cost, latency, energy, ratio, duration_time
     ])
@@ -243,6 +242,7 @@ def experimental_03(ss: SystemState) -> List[List]:
     iot_count = ss.get_iot_device_count()
     func_type_count = ss.get_function_type_count()
     func_count = ss.get_function_count()
+    omega, cpu_mem_ratio, t_ref, e_ref = ss.params.omega, ss.params.ratio, ss.params.t_ref, ss.params.e_ref
 
     results = []
     alloc_method = 'WF'
@@ -268,7 +268,7 @@ def experimental_03(ss: SystemState) -> List[List]:
     # 记录结果
     print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio:.2f}, time {duration_time:.2f}s')
     results.append([
-        bs_count, sec_count, iot_count, func_type_count, func_count, OMEGA, RATIO, T_ref, E_ref,
+        bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
         f'{full_name}', f'{algo_1_name}', f'{algo_2_name}', f'{alloc_method}',
         cost, latency, energy, ratio, duration_time
     ])
@@ -295,6 +295,7 @@ def experimental_04(ss: SystemState) -> List[List]:
     iot_count = ss.get_iot_device_count()
     func_type_count = ss.get_function_type_count()
     func_count = ss.get_function_count()
+    omega, cpu_mem_ratio, t_ref, e_ref = ss.params.omega, ss.params.ratio, ss.params.t_ref, ss.params.e_ref
 
     results = []
 
@@ -326,7 +327,7 @@ def experimental_04(ss: SystemState) -> List[List]:
         # 记录结果
         print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio:.2f}, time {duration_time:.2f}s')
         results.append([
-            bs_count, sec_count, iot_count, func_type_count, func_count, OMEGA, RATIO, T_ref, E_ref,
+            bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
             f'{full_name}', f'{algo_1_name}', f'{algo_2_name}', f'{alloc_method}',
             cost, latency, energy, ratio, duration_time
         ])
@@ -351,7 +352,7 @@ def experimental_04(ss: SystemState) -> List[List]:
     # 记录结果
     print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio * 100:.2f}%, time {duration_time:.2f}s')
     results.append([
-        bs_count, sec_count, iot_count, func_type_count, func_count, OMEGA, RATIO, T_ref, E_ref,
+        bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
         f'{full_name}', f'{algo_name}', f'', f'',
         cost, latency, energy, ratio, duration_time
     ])
@@ -366,6 +367,7 @@ def experimental_05(ss: SystemState) -> List[List]:
     iot_count = ss.get_iot_device_count()
     func_type_count = ss.get_function_type_count()
     func_count = ss.get_function_count()
+    omega, cpu_mem_ratio, t_ref, e_ref = ss.params.omega, ss.params.ratio, ss.params.t_ref, ss.params.e_ref
 
     results = []
 
@@ -389,7 +391,7 @@ def experimental_05(ss: SystemState) -> List[List]:
     # 记录结果
     print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio * 100:.2f}%, time {duration_time:.2f}s')
     results.append([
-        bs_count, sec_count, iot_count, func_type_count, func_count, OMEGA, RATIO, T_ref, E_ref,
+        bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
         f'{full_name}', f'{algo_name}', f'', f'',
         cost, latency, energy, ratio, duration_time
     ])
@@ -419,9 +421,104 @@ def experimental_05(ss: SystemState) -> List[List]:
             # 记录结果
             print(f'*结果：{full_name}, cost {cost:.2f}, offloading ratio {ratio:.2f}, time {duration_time:.2f}s')
             results.append([
-                bs_count, sec_count, iot_count, func_type_count, func_count, OMEGA, RATIO, T_ref, E_ref,
+                bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
                 f'{full_name}', f'{algo_1_name}', f'{algo_2_name}', f'{alloc_method}',
                 cost, latency, energy, ratio, duration_time
             ])
 
     return results
+
+
+# 多副本实验的工作进程：每个进程只接收一次系统状态
+_replicate_ss: SystemState | None = None
+
+
+def _init_replicate_worker(ss: SystemState):
+    global _replicate_ss
+    _replicate_ss = ss
+
+
+# 共享内存版本：进程只接收共享内存句柄，附加为只读的系统状态视图，启动时间与实例规模无关
+def _init_shared_replicate_worker(handle: SharedStateHandle):
+    global _replicate_ss
+    _replicate_ss = attach(handle)
+
+
+# 用指定随机种子运行一次 卸载算法 + 调度算法，返回 [cost, latency, energy, ratio, duration]
+def _run_replicate(ALGO_1, ALGO_2, alloc_method: str, seed: int, ss: SystemState | None = None) -> List[float]:
+    ss = ss if ss is not None else _replicate_ss
+    seed_1, seed_2 = stage_seeds(seed, 2)  # 两个阶段使用互不相关的随机数流
+    start_time = time.time()
+    algo_1 = ALGO_1(ss, alloc_method, seed=seed_1)
+    sp = algo_1.run()
+    algo_2 = ALGO_2(ss, sp, alloc_method, seed=seed_2)
+    algo_2.run()
+    end_time = time.time()
+
+    latency, energy = algo_2.sp.get_real_latency_energy(alloc_method=alloc_method)
+    return [algo_2.get_cost(), latency, energy, algo_2.sp.get_offload_ratio(), end_time - start_time]
+
+
+# 并行运行 R 个随机种子的副本，返回每个副本的结果
+def run_replicates(ss: SystemState, ALGO_1, ALGO_2, alloc_method: str, seeds: List[int],
+                   workers: int | None = None, shared_memory: bool = True) -> List[List[float]]:
+    if workers == 1:
+        return [_run_replicate(ALGO_1, ALGO_2, alloc_method, seed, ss=ss) for seed in seeds]
+
+    # 系统状态可以导出时通过共享内存传给工作进程，否则 pickle 整个系统状态
+    shared = SharedState.export(ss) if shared_memory and can_export(ss) else None
+    try:
+        if shared is None:
+            initializer, initargs = _init_replicate_worker, (ss,)
+        else:
+            initializer, initargs = _init_shared_replicate_worker, (shared.handle,)
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+            return list(executor.map(partial(_run_replicate, ALGO_1, ALGO_2, alloc_method), seeds))
+    finally:
+        if shared is not None:
+            shared.close()
+
+
+# 实验6：随机基线的多副本实验，每个配置运行 replicates 个种子，输出均值/标准差/95%置信区间
+def experimental_06(ss: SystemState, replicates: int = 10, base_seed: int = 0,
+                    workers: int | None = None) -> List[List]:
+    bs_count = ss.get_base_station_count()
+    sec_count = ss.get_sec_server_count()
+    iot_count = ss.get_iot_device_count()
+    func_type_count = ss.get_function_type_count()
+    func_count = ss.get_function_count()
+    omega, cpu_mem_ratio, t_ref, e_ref = ss.params.omega, ss.params.ratio, ss.params.t_ref, ss.params.e_ref
+
+    results = []
+    seeds = list(range(base_seed, base_seed + replicates))
+
+    alloc_method = 'WF'
+    for ALGO_1, ALGO_2 in [(RandomOffloading, NoScheduling), (RandomOffloading, RandomScheduling),
+                           (RandomOffloading, RoundRobinScheduling), (RandomOffloading, PGES),
+                           (LEAO, RandomScheduling), (LEAO, RoundRobinScheduling)]:
+        replicate_results = run_replicates(ss, ALGO_1, ALGO_2, alloc_method, seeds, workers=workers)
+        costs, latencies, energies, ratios, durations = zip(*replicate_results)
+
+        # 统计数据
+        algo_1_name = ALGO_1.__name__
+        algo_2_name = ALGO_2.__name__
+        full_name = f'{algo_1_name} + {algo_2_name} + {alloc_method}'
+        cost_mean, cost_std, cost_low, cost_high = summarize(costs)
+        latency_mean, latency_std, _, _ = summarize(latencies)
+        energy_mean, energy_std, _, _ = summarize(energies)
+        ratio_mean, ratio_std, _, _ = summarize(ratios)
+        duration_mean, _, _, _ = summarize(durations)
+
+        # 记录结果
+        print(f'*结果：{full_name}, {replicates} replicates, cost {cost_mean:.2f} ± {cost_std:.2f} '
+              f'(95% CI [{cost_low:.2f}, {cost_high:.2f}]), time {duration_mean:.2f}s')
+        results.append([
+            bs_count, sec_count, iot_count, func_type_count, func_count, omega, cpu_mem_ratio, t_ref, e_ref,
+            f'{full_name}', f'{algo_1_name}', f'{algo_2_name}', f'{alloc_method}',
+            replicates, f'{seeds[0]}-{seeds[-1]}',
+            cost_mean, cost_std, cost_low, cost_high,
+            latency_mean, latency_std, energy_mean, energy_std,
+            ratio_mean, ratio_std, duration_mean
+        ])
+
+    return results
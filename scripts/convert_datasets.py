@@ -0,0 +1,39 @@
+"""
+convert_datasets.py
+
+Write the columnar .npy cache (datasets/<scale>/columnar/) for CSV datasets, so that
+utils.dataset_loader.load_dataset can memory-map them instead of parsing the CSV files.
+The CSV files remain the source of truth; the cache is ignored once they change.
+
+Usage (from the project root):
+    python -m scripts.convert_datasets --scales small,large
+"""
+
+import argparse
+import time
+
+from config import DATASET_SIZES
+from utils.dataset_columnar import convert_dataset
+from utils.dataset_loader import load_dataset
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert CSV datasets to the columnar .npy cache')
+    parser.add_argument('--scales', default=','.join(DATASET_SIZES), help='comma separated dataset scales')
+    parser.add_argument('--datasets-root', default='datasets')
+    args = parser.parse_args(argv)
+
+    for scale in args.scales.split(','):
+        out_dir = convert_dataset(scale, args.datasets_root)
+
+        start_time = time.perf_counter()
+        load_dataset(scale, args.datasets_root, use_columnar=False, use_cache=False)
+        csv_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        load_dataset(scale, args.datasets_root, use_columnar=True, use_cache=False)
+        columnar_time = time.perf_counter() - start_time
+        print(f'{scale}: {out_dir} (CSV load {csv_time * 1e3:.1f} ms, columnar load {columnar_time * 1e3:.1f} ms)')
+
+
+if __name__ == '__main__':
+    main()
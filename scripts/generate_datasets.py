@@ -16,14 +16,36 @@ Each dataset is stored under datasets/<scale_name>/ and contains the following f
 - metadata.txt              : Dataset configuration details and generation parameters
 
 All datasets are generated using a fixed random seed per scale to ensure reproducibility.
-The script does not require any third-party dependencies and uses Python's built-in csv module.
+
+Two engines are available:
+
+- legacy : draws every attribute with Python's random module (no third-party dependencies).
+           Reproduces the existing datasets exactly and is the default.
+- numpy  : draws each column in bulk from numpy Generators (see utils/synthetic.py). The scale seed is
+           split with SeedSequence into one independent stream per table, and function_task.csv and
+           sec_network.csv are further split into chunks with their own streams, so chunks can be
+           generated in parallel worker processes and streamed to disk. The output depends on the
+           seed and the chunk size, but not on the number of workers.
+           It can also emit sparse SEC topologies (ring, grid, geometric, tree; see utils/synthetic.py)
+           instead of the full mesh.
+
+Usage (from the project root):
+    python -m scripts.generate_datasets
+    python -m scripts.generate_datasets --engine numpy --scales larger --workers 8
+    python -m scripts.generate_datasets --engine numpy --topology geometric --avg-degree 4
 """
 
+import argparse
 import csv
+import os
 import random
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from config import *
 
+DATASETS_ROOT = Path(__file__).resolve().parent.parent / "datasets"
+
 
 def write_csv(path, header, rows):
     """Write a CSV file with a given header and row list."""
@@ -34,10 +56,10 @@ def write_csv(path, header, rows):
         writer.writerows(rows)
 
 
-def generate_for_scale(scale_name, cfg):
+def generate_for_scale(scale_name, cfg, out_root=DATASETS_ROOT):
     """Generate dataset files for a given scale configuration."""
     random.seed(cfg["seed"])
-    out_dir = Path(__file__).resolve().parent.parent / "datasets" / scale_name
+    out_dir = Path(out_root) / scale_name
     out_dir.mkdir(parents=True, exist_ok=True)
 
     # Base stations and SEC servers: each base station is associated with one SEC server
@@ -131,9 +153,160 @@ def generate_for_scale(scale_name, cfg):
     print(f"Generated dataset '{scale_name}' in {out_dir}")
 
 
-def main():
-    for scale, cfg in DATASET_SIZES.items():
-        generate_for_scale(scale, cfg)
+def write_columns(path, columns, header=None, mode="w"):
+    """Write equally long numpy columns as CSV rows (optionally preceded by a header)."""
+    with open(path, mode, newline="") as f:
+        writer = csv.writer(f)
+        if header is not None:
+            writer.writerow(header)
+        writer.writerows(zip(*(col.tolist() for col in columns)))
+
+
+def _chunk_bounds(total, chunk_size):
+    """Split range(total) into [start, stop) chunks of at most chunk_size items."""
+    return [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+
+
+def _write_task_chunk(path, seed_seq, start, stop, function_type, iot_device):
+    """Draw function tasks [start, stop) from their own stream and write them without header."""
+    import numpy as np
+    from utils.synthetic import draw_function_tasks
+
+    t = draw_function_tasks(np.random.default_rng(seed_seq), stop - start, function_type, iot_device, start=start)
+    write_columns(path, [t["task_id"], t["task_data_size"], t["task_workload"], t["task_invocations"],
+                         t["task_type"], t["task_iot"]])
+
+
+def _write_network_chunk(path, seed_seq, start, stop, bs_and_sec):
+    """Draw the full-mesh edges (i, j), i in [start, stop), j > i, and write them without header."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed_seq)
+    rows = np.arange(start, stop)
+    counts = bs_and_sec - 1 - rows
+    src = np.repeat(rows, counts)
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    dst = src + 1 + (np.arange(src.size) - offsets)
+    latency = np.round(rng.uniform(0.02, 0.5, size=src.size), 6)
+    bandwidth = rng.integers(100, 1001, size=src.size)
+    write_columns(path, [src, dst, latency, bandwidth])
+
+
+def _run_chunks(jobs, workers):
+    """Run (fn, args) jobs inline or in a process pool; all of them write their own part file."""
+    if workers == 1:
+        for fn, args in jobs:
+            fn(*args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(fn, *args) for fn, args in jobs]:
+            future.result()
+
+
+def _concat_parts(path, header, parts):
+    """Write header followed by the part files in order, removing the parts."""
+    with open(path, "w", newline="") as out:
+        csv.writer(out).writerow(header)
+        for part in parts:
+            with open(part, newline="") as f:
+                shutil.copyfileobj(f, out)
+            os.remove(part)
+
+
+def generate_for_scale_numpy(scale_name, cfg, out_root=DATASETS_ROOT, chunk_size=100_000, workers=1,
+                             topology='full', avg_degree=None):
+    """Generate dataset files for a given scale configuration with the vectorized numpy engine."""
+    import numpy as np
+    from utils.synthetic import draw_sec_servers, draw_iot_devices, draw_function_types, draw_sec_network
+
+    out_dir = Path(out_root) / scale_name
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n_sec, n_iot, n_type, n_task = cfg["bs_and_sec"], cfg["iot_device"], cfg["function_type"], cfg["function_task"]
+
+    # One independent stream per table
+    sec_seq, iot_seq, type_seq, task_seq, net_seq = np.random.SeedSequence(cfg["seed"]).spawn(5)
+
+    # Base stations and SEC servers
+    t = draw_sec_servers(np.random.default_rng(sec_seq), n_sec)
+    write_columns(out_dir / "base_station.csv", [t["bs_id"], t["bs_sec"]], header=["id", "associated_sec_id"])
+    write_columns(out_dir / "sec_server.csv", [t["sec_id"], t["sec_cpu"], t["sec_mem"], t["sec_bh_bw"]],
+                  header=["id", "comp_resource", "memory", "backhaul_bw"])
+
+    # IoT devices
+    t = draw_iot_devices(np.random.default_rng(iot_seq), n_iot, n_sec)
+    write_columns(out_dir / "iot_device.csv",
+                  [t["iot_id"], t["iot_cpu"], t["iot_tx_power"], t["iot_bandwidth"], t["iot_channel_gain"],
+                   t["iot_noise_power"], t["iot_bs"]],
+                  header=["id", "comp_resource", "tx_power", "bandwidth", "channel_gain", "noise_power",
+                          "associated_bs_id"])
+
+    # Function types and cached functions
+    t = draw_function_types(np.random.default_rng(type_seq), n_type, n_sec)
+    write_columns(out_dir / "function_type.csv", [t["type_id"], t["type_image_size"]], header=["id", "image_size"])
+    sec_ids, ft_ids = np.nonzero(t["cached"])
+    write_columns(out_dir / "cached_function.csv", [sec_ids, ft_ids], header=["sec_id", "function_type_id"])
+
+    # Sparse SEC topologies have O(K) edges and are drawn in one piece
+    if topology != 'full':
+        t = draw_sec_network(np.random.default_rng(net_seq), n_sec, topology, avg_degree)
+        write_columns(out_dir / "sec_network.csv", [t["edge_src"], t["edge_dst"], t["edge_latency"],
+                                                    t["edge_bandwidth"]],
+                      header=["server_id1", "server_id2", "latency", "bandwidth"])
+
+    # Function tasks and SEC network (full mesh): chunked, one stream and one part file per chunk
+    task_bounds = _chunk_bounds(n_task, chunk_size)
+    net_bounds = _chunk_bounds(n_sec, max(1, chunk_size // max(1, n_sec))) if topology == 'full' else []
+    task_parts = [out_dir / f"function_task.csv.part{i}" for i in range(len(task_bounds))]
+    net_parts = [out_dir / f"sec_network.csv.part{i}" for i in range(len(net_bounds))]
+    jobs = [(_write_task_chunk, (part, seq, start, stop, n_type, n_iot))
+            for part, seq, (start, stop) in zip(task_parts, task_seq.spawn(len(task_bounds)), task_bounds)]
+    jobs += [(_write_network_chunk, (part, seq, start, stop, n_sec))
+             for part, seq, (start, stop) in zip(net_parts, net_seq.spawn(len(net_bounds)), net_bounds)]
+    _run_chunks(jobs, workers)
+    _concat_parts(out_dir / "function_task.csv",
+                  ["id", "data_size", "workload", "invocations", "func_type_id", "associated_iot_id"], task_parts)
+    if topology == 'full':
+        _concat_parts(out_dir / "sec_network.csv", ["server_id1", "server_id2", "latency", "bandwidth"], net_parts)
+
+    # Metadata file
+    metadata = [["seed", cfg["seed"]],
+                ["bs_and_sec", n_sec],
+                ["iot_device", n_iot],
+                ["function_type", n_type],
+                ["function_task", n_task],
+                ["engine", "numpy"],
+                ["chunk_size", chunk_size],
+                ["topology", topology],
+                ["avg_degree", avg_degree]]
+
+    with open(out_dir / "metadata.txt", 'w', encoding='utf-8') as f:
+        for key, value in metadata:
+            f.write(f"{key}: {value}\n")
+
+    print(f"Generated dataset '{scale_name}' in {out_dir}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate CSV datasets for ELCO_simulation')
+    parser.add_argument('--scales', default=','.join(DATASET_SIZES), help='comma separated dataset scales')
+    parser.add_argument('--engine', choices=['legacy', 'numpy'], default='legacy')
+    parser.add_argument('--chunk-size', type=int, default=100_000, help='rows per chunk (numpy engine)')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes (numpy engine)')
+    parser.add_argument('--topology', choices=['full', 'ring', 'grid', 'geometric', 'tree'], default='full',
+                        help='SEC network topology (numpy engine)')
+    parser.add_argument('--avg-degree', type=float, default=None, help='target average SEC degree (numpy engine)')
+    parser.add_argument('--output-root', default=str(DATASETS_ROOT))
+    args = parser.parse_args(argv)
+    if args.engine == 'legacy' and (args.topology != 'full' or args.avg_degree is not None):
+        parser.error('--topology/--avg-degree require --engine numpy')
+
+    for scale in args.scales.split(','):
+        cfg = DATASET_SIZES[scale]
+        if args.engine == 'legacy':
+            generate_for_scale(scale, cfg, out_root=args.output_root)
+        else:
+            generate_for_scale_numpy(scale, cfg, out_root=args.output_root, chunk_size=args.chunk_size,
+                                     workers=args.workers, topology=args.topology, avg_degree=args.avg_degree)
 
 
 if __name__ == "__main__":
@@ -2,29 +2,41 @@ import csv
 from pathlib import Path
 
 
-def merge_csv_files(output_file_name: str = "merge_results.csv"):
+# 合并 results/ 下与 pattern 匹配的实验结果（默认为 elco run / main.py 写出的 result_*.csv），
+# 其他工具导出的 CSV 和以前的合并结果不在匹配范围内，重复运行不会重复合并
+def merge_csv_files(output_file_name: str = "merge_results.csv", pattern: str = "result_*.csv"):
     results_dir = Path(__file__).resolve().parent.parent / 'results'
     out_file = results_dir / output_file_name
 
-    csv_files = sorted(results_dir.glob("*.csv"))
+    # 跳过合并结果本身，避免重复合并上一次的输出
+    csv_files = sorted(f for f in results_dir.glob(pattern) if f.name != output_file_name)
     if not csv_files:
         print("⚠️ 没有找到任何 CSV 文件")
         return
 
+    merged = 0
     with open(out_file, "w", newline='', encoding="utf-8") as outfile:
-        writer = None
-        for i, file in enumerate(csv_files):
+        writer = csv.writer(outfile)
+        first_header = None
+        for file in csv_files:
             with open(file, "r", encoding="utf-8") as infile:
                 reader = csv.reader(infile)
-                header = next(reader)  # 读取表头
-                if i == 0:  # 只写一次表头
-                    writer = csv.writer(outfile)
+                header = next(reader, None)  # 读取表头
+                if header is None:  # 空文件（如运行中断）
+                    print(f"⚠️ 跳过空文件: {file.name}")
+                    continue
+                if first_header is None:  # 只写一次表头
+                    first_header = header
                     writer.writerow(header)
+                elif header != first_header:  # 表头不同的文件（如多副本结果）不合并
+                    print(f"⚠️ 跳过表头不同的文件: {file.name}")
+                    continue
                 # 写入数据行
                 for row in reader:
                     writer.writerow(row)
+                merged += 1
 
-    print(f"✅ 已合并 {len(csv_files)} 个 CSV 文件，输出到: {out_file}")
+    print(f"✅ 已合并 {merged} 个 CSV 文件，输出到: {out_file}")
 
 
 if __name__ == "__main__":
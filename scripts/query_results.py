@@ -0,0 +1,57 @@
+"""
+query_results.py
+
+Query the SQLite results store (results/results.db) and export merged CSV files.
+
+Usage (from the project root):
+    python -m scripts.query_results --list-runs
+    python -m scripts.query_results --scales small,large --algorithms LEAO+PGES --output merged.csv
+    python -m scripts.query_results --runs 3 --header replicate_header
+"""
+
+import argparse
+import csv
+import sys
+
+from utils import results_recorder
+from utils.results_store import DEFAULT_DB_PATH, ResultsStore
+
+
+def _split(value: str | None) -> list:
+    return [v.strip() for v in value.split(',') if v.strip()] if value else []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query / export the ELCO results store')
+    parser.add_argument('--db', default=str(DEFAULT_DB_PATH), help='SQLite results database')
+    parser.add_argument('--list-runs', action='store_true', help='list runs and their result counts')
+    parser.add_argument('--header', choices=['header', 'replicate_header'], default='header',
+                        help='result table to export')
+    parser.add_argument('--scales', default=None, help='comma separated dataset scales')
+    parser.add_argument('--algorithms', default=None, help='comma separated algorithm full names')
+    parser.add_argument('--runs', default=None, help='comma separated run ids')
+    parser.add_argument('--output', default=None, help='CSV file to write (default: stdout)')
+    args = parser.parse_args(argv)
+
+    with ResultsStore(args.db) as store:
+        if args.list_runs:
+            for run_id, name, created_at, description, count in store.list_runs():
+                print(f'{run_id:>4}  {created_at}  {name or "-"}  {count} rows  {description or ""}')
+            return
+
+        rows = store.query(args.header, scales=_split(args.scales), algorithms=_split(args.algorithms),
+                           runs=[int(r) for r in _split(args.runs)])
+
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        writer = csv.writer(out)
+        writer.writerow(getattr(results_recorder, args.header))
+        writer.writerows(rows)
+    finally:
+        if args.output:
+            out.close()
+            print(f'已导出 {len(rows)} 行到: {args.output}')
+
+
+if __name__ == '__main__':
+    main()
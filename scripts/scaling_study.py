@@ -0,0 +1,205 @@
+"""
+scaling_study.py
+
+Scalability sweep over synthetic problem sizes far beyond the CSV datasets.
+
+A geometric grid of instances (number of function tasks N x number of SEC servers K) is generated
+in memory with utils.synthetic (no CSV files are written). Every algorithm pipeline runs in its own
+child process under a wall-clock budget; runs that exceed it are terminated and recorded as
+"timeout", and larger N for the same pipeline and K are then skipped. Runtime, peak RSS and cost are
+written to results/scaling_<time>.csv, and the empirical complexity exponents of
+runtime ~ N^a * K^b are fitted by log-log least squares and written to results/scaling_fit_<time>.csv.
+
+Usage (from the project root):
+    python -m scripts.scaling_study --algorithms LEAO+PGES,LocalSECOnly+LeastLoadedFirstScheduling \
+        --tasks 1000,2,5 --secs 10,2,3 --budget 120
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import time
+from datetime import datetime
+from typing import List
+
+import numpy as np
+
+from core.algorithm_registry import parse_pipeline, run_pipeline
+from utils.results_recorder import new_csv_file, write_csv
+from utils.synthetic import TOPOLOGIES, generate_system_state
+
+header = [
+    'Algorithm Full Name', 'Function Task Count (N)', 'SEC Server Count (K)', 'IoT Device Count',
+    'Function Type Count', 'Status', 'Execution Time (s)', 'Peak RSS (MB)', 'RSS Increase (MB)',
+    'System Cost', 'Offloading Ratio'
+]
+
+fit_header = ['Algorithm Full Name', 'Runs', 'N Exponent', 'K Exponent', 'R^2']
+
+
+def geometric_series(start: int, factor: float, steps: int) -> List[int]:
+    return [int(round(start * factor ** i)) for i in range(steps)]
+
+
+def instance_config(n_tasks: int, n_secs: int, seed: int, topology: str = 'full',
+                    avg_degree: float | None = None) -> dict:
+    # IoT 设备数与函数类型数随任务数增长，与 DATASET_SIZES 中的比例大致一致
+    return {
+        'seed': seed,
+        'bs_and_sec': n_secs,
+        'iot_device': max(10, n_tasks // 10),
+        'function_type': min(50, max(6, n_tasks // 20)),
+        'function_task': n_tasks,
+        'topology': topology,
+        'avg_degree': avg_degree,
+    }
+
+
+def _max_rss_mb() -> float:
+    # Linux 下 ru_maxrss 的单位为 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# 子进程：生成实例并运行算法流水线，通过管道返回结果
+def _run_pipeline(conn, pipeline: tuple, cfg: dict, alloc_method: str, seed: int):
+    try:
+        ss = generate_system_state(**cfg)
+        rss_before = _max_rss_mb()
+
+        start_time = time.perf_counter()
+        algo = run_pipeline(ss, pipeline, alloc_method=alloc_method, seed=seed)
+        duration = time.perf_counter() - start_time
+
+        rss_after = _max_rss_mb()
+        conn.send(('ok', duration, rss_after, rss_after - rss_before, algo.get_cost(), algo.sp.get_offload_ratio()))
+    except Exception as e:
+        conn.send(('error', repr(e)))
+    finally:
+        conn.close()
+
+
+def run_with_budget(pipeline: tuple, cfg: dict, alloc_method: str, seed: int, budget: float) -> tuple:
+    """
+    Run one pipeline in a child process, terminating it once the wall-clock budget is exceeded.
+
+    Returns:
+        tuple: (status, duration, peak RSS MB, RSS increase MB, cost, offloading ratio); status is 'ok',
+            'timeout', 'error', or 'error (exit code N)' when the child died without reporting.
+    """
+    parent_conn, child_conn = mp.Pipe(duplex=False)
+    proc = mp.Process(target=_run_pipeline, args=(child_conn, pipeline, cfg, alloc_method, seed), daemon=True)
+    start_time = time.perf_counter()
+    proc.start()
+    child_conn.close()
+
+    ready = parent_conn.poll(budget)
+    if not ready:
+        proc.terminate()
+        proc.join()
+        return 'timeout', time.perf_counter() - start_time, None, None, None, None
+
+    try:
+        msg = parent_conn.recv()
+    except EOFError:
+        # 子进程未返回结果就退出（OOM kill、段错误、信号等）
+        proc.join()
+        print(f'  ! 子进程异常退出，exit code {proc.exitcode}')
+        return f'error (exit code {proc.exitcode})', None, None, None, None, None
+    proc.join()
+    if msg[0] != 'ok':
+        print(f'  ! 运行失败: {msg[1]}')
+        return 'error', None, None, None, None, None
+    return msg
+
+
+def fit_exponents(runs: List[tuple]) -> tuple:
+    """
+    Fit log(runtime) = c + a*log(N) + b*log(K) by least squares.
+
+    Args:
+        runs (list): (N, K, runtime) of completed runs.
+
+    Returns:
+        tuple: (a, b, r2); b is None when only one K was measured.
+    """
+    n = np.log([r[0] for r in runs])
+    k = np.log([r[1] for r in runs])
+    y = np.log([max(r[2], 1e-9) for r in runs])
+
+    vary_k = len(set(r[1] for r in runs)) > 1
+    columns = [np.ones_like(n), n] + ([k] if vary_k else [])
+    X = np.column_stack(columns)
+    coef, *_ = np.linalg.lstsq(X, y, rcond=None)
+
+    ss_res = float(np.sum((y - X @ coef) ** 2))
+    ss_tot = float(np.sum((y - y.mean()) ** 2))
+    r2 = 1 - ss_res / ss_tot if ss_tot > 0 else 1.0
+    return float(coef[1]), (float(coef[2]) if vary_k else None), r2
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='ELCO scalability sweep on synthetic instances')
+    parser.add_argument('--algorithms', default='LEAO+PGES,LocalSECOnly+LeastLoadedFirstScheduling,IoTOnly',
+                        help='comma separated pipelines, offloading algorithm optionally followed by +scheduling')
+    parser.add_argument('--tasks', default='1000,2,5', help='N series as start,factor,steps')
+    parser.add_argument('--secs', default='10,2,3', help='K series as start,factor,steps')
+    parser.add_argument('--budget', type=float, default=120.0, help='wall-clock budget per run (s)')
+    parser.add_argument('--alloc-method', default='WF')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--topology', choices=TOPOLOGIES, default='full', help='SEC network topology')
+    parser.add_argument('--avg-degree', type=float, default=None, help='target average SEC degree')
+    args = parser.parse_args(argv)
+
+    try:
+        pipelines = [parse_pipeline(spec) for spec in args.algorithms.split(',')]
+    except (KeyError, ValueError) as e:
+        parser.error(str(e))
+
+    t_start, t_factor, t_steps = args.tasks.split(',')
+    s_start, s_factor, s_steps = args.secs.split(',')
+    task_series = geometric_series(int(t_start), float(t_factor), int(t_steps))
+    sec_series = geometric_series(int(s_start), float(s_factor), int(s_steps))
+
+    curr_time = datetime.now().strftime('%Y%m%d_%H%M%S')
+    file_name = f'scaling_{curr_time}.csv'
+    new_csv_file(file_name, header)
+
+    completed = {'+'.join(p): [] for p in pipelines}
+    for pipeline in pipelines:
+        full_name = '+'.join(pipeline)
+        for n_secs in sec_series:
+            timed_out = False
+            for n_tasks in task_series:
+                cfg = instance_config(n_tasks, n_secs, args.seed, args.topology, args.avg_degree)
+                if timed_out:
+                    # 更小规模已经超时，更大的规模直接跳过
+                    status, duration, peak_rss, rss_inc, cost, ratio = 'skipped', None, None, None, None, None
+                else:
+                    status, duration, peak_rss, rss_inc, cost, ratio = run_with_budget(
+                        pipeline, cfg, args.alloc_method, args.seed, args.budget)
+                timed_out = timed_out or status == 'timeout'
+
+                if status == 'ok':
+                    completed[full_name].append((n_tasks, n_secs, duration))
+                    print(f'*结果：{full_name}, N {n_tasks}, K {n_secs}, cost {cost:.2f}, '
+                          f'time {duration:.2f}s, peak RSS {peak_rss:.1f}MB')
+                else:
+                    print(f'*结果：{full_name}, N {n_tasks}, K {n_secs}, {status}')
+                write_csv(file_name, [[full_name, n_tasks, n_secs, cfg['iot_device'], cfg['function_type'], status,
+                                       duration, peak_rss, rss_inc, cost, ratio]])
+
+    fit_file_name = f'scaling_fit_{curr_time}.csv'
+    new_csv_file(fit_file_name, fit_header)
+    print('============ 经验复杂度 runtime ~ N^a * K^b ============')
+    for full_name, runs in completed.items():
+        if len(set(r[0] for r in runs)) < 2:
+            print(f'{full_name}: 完成的规模不足，无法拟合')
+            continue
+        a, b, r2 = fit_exponents(runs)
+        b_str = f'{b:.2f}' if b is not None else '-'
+        print(f'{full_name}: a = {a:.2f}, b = {b_str}, R^2 = {r2:.3f} ({len(runs)} runs)')
+        write_csv(fit_file_name, [[full_name, len(runs), a, b, r2]])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+dataset_cache.py
+
+Load-through cache of fully built SystemState objects.
+
+The cache key fingerprints every CSV file of a dataset (size, mtime and SHA-256 of the content)
+together with the package sources (config.py and every module under core/ and utils/), so a cached
+state is never reused after the data, the code that builds it or the default parameters change.
+States are stored with pickle under .cache/datasets/, one file per (datasets root, scale), and
+include everything attached to them (entities, mappings, the SECNetwork and any precomputed indexes).
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+from core.system_state import SystemState
+from utils.dataset_columnar import paused_gc
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / ".cache" / "datasets"
+
+# 构建和序列化系统状态所依赖的源码：任一文件变化都会使缓存失效
+_CODE_DIRS = ["core", "utils"]
+
+_CHUNK = 1 << 20
+
+
+def _file_fingerprint(path: Path) -> dict:
+    stat = path.stat()
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            digest.update(chunk)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+
+
+# 源码在进程内不会变化，只计算一次（只用内容摘要，检出或复制后 mtime 变化不使缓存失效）
+@lru_cache(maxsize=None)
+def _code_fingerprint() -> tuple:
+    files = [PROJECT_ROOT / "config.py"]
+    for name in _CODE_DIRS:
+        files += sorted((PROJECT_ROOT / name).rglob("*.py"))
+    return tuple((path.relative_to(PROJECT_ROOT).as_posix(), _file_fingerprint(path)["sha256"])
+                 for path in files if path.exists())
+
+
+def fingerprint_dataset(scale: str, datasets_root: str = "datasets") -> dict:
+    """Fingerprints of the dataset's CSV files and of the package sources the cached objects depend on."""
+    root = Path(datasets_root) / scale
+    return {
+        "csv": {path.name: _file_fingerprint(path) for path in sorted(root.glob("*.csv"))},
+        "code": dict(_code_fingerprint()),
+    }
+
+
+def cache_key(fingerprint: dict) -> str:
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_cached_state(scale: str, datasets_root: str, build: Callable[[], SystemState],
+                      cache_dir: str | Path = DEFAULT_CACHE_DIR) -> SystemState:
+    """
+    Return the cached SystemState of a dataset when its fingerprint matches, otherwise build it with
+    `build()` and store it. Failing to write the cache (e.g. read-only file system) is not an error.
+    """
+    fingerprint = fingerprint_dataset(scale, datasets_root)
+    if not fingerprint["csv"]:
+        return build()
+
+    # 文件名带上数据集根目录的摘要：不同根目录下同名规模的缓存互不覆盖
+    cache_dir = Path(cache_dir)
+    root_tag = hashlib.sha256(str(Path(datasets_root).resolve()).encode("utf-8")).hexdigest()[:8]
+    prefix = f"{scale}-{root_tag}-"
+    path = cache_dir / f"{prefix}{cache_key(fingerprint)[:24]}.pkl"
+    if path.exists():
+        try:
+            with open(path, "rb") as f, paused_gc():
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError):
+            pass  # 缓存损坏或不兼容（如类或模块已改名），重新构建
+
+    ss = build()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再原子替换，避免并行的工作进程读到不完整的缓存
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(ss, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        for stale in cache_dir.glob(f"{prefix}*.pkl"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+    return ss
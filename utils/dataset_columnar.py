@@ -0,0 +1,285 @@
+"""
+dataset_columnar.py
+
+Columnar binary form of the CSV datasets.
+
+Each dataset directory can hold a derived cache under datasets/<scale>/columnar/: one .npy file per
+column (SEC, base station, IoT device, function type, function task and SEC edge tables, plus a
+boolean SEC x function-type bitmap of cached functions) and a manifest.json recording the size and
+mtime of the source CSVs. The CSVs stay the interchange format; the cache is only used while the
+manifest still matches them.
+
+Loading memory-maps the .npy files. With lazy=True the IoT device and function task entities are
+only instantiated when first accessed, so a SystemState over millions of tasks can be opened without
+building one Python object per row up front.
+"""
+
+import csv
+import gc
+import json
+import math
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+
+from core.system_models.network_model import BaseStation, SECServer, IoTDevice, FunctionType, FunctionTask, SECNetwork
+from core.system_state import SystemState
+
+COLUMNAR_DIR = "columnar"
+MANIFEST = "manifest.json"
+
+# CSV 文件 -> [(CSV列名, 数组列名, dtype)]
+CSV_COLUMNS = {
+    "sec_server.csv": [("id", "sec_id", np.int64), ("comp_resource", "sec_cpu", np.float64),
+                       ("memory", "sec_mem", np.float64), ("backhaul_bw", "sec_bh_bw", np.float64)],
+    "base_station.csv": [("id", "bs_id", np.int64), ("associated_sec_id", "bs_sec", np.int64)],
+    "iot_device.csv": [("id", "iot_id", np.int64), ("comp_resource", "iot_cpu", np.float64),
+                       ("tx_power", "iot_tx_power", np.float64), ("bandwidth", "iot_bandwidth", np.float64),
+                       ("channel_gain", "iot_channel_gain", np.float64),
+                       ("noise_power", "iot_noise_power", np.float64), ("associated_bs_id", "iot_bs", np.int64)],
+    "function_type.csv": [("id", "type_id", np.int64), ("image_size", "type_image_size", np.float64)],
+    "function_task.csv": [("id", "task_id", np.int64), ("data_size", "task_data_size", np.float64),
+                          ("workload", "task_workload", np.float64), ("invocations", "task_invocations", np.int64),
+                          ("func_type_id", "task_type", np.int64), ("associated_iot_id", "task_iot", np.int64)],
+    "sec_network.csv": [("server_id1", "edge_src", np.int64), ("server_id2", "edge_dst", np.int64),
+                        ("latency", "edge_latency", np.float64), ("bandwidth", "edge_bandwidth", np.float64)],
+}
+OPTIONAL_CSV = ("cached_function.csv", "sec_network.csv")
+
+
+@contextmanager
+def paused_gc():
+    # 批量创建大量实体对象时暂停循环垃圾回收，避免反复触发全堆扫描
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _csv_fingerprints(root: Path) -> dict:
+    fingerprints = {}
+    for name in list(CSV_COLUMNS) + ["cached_function.csv"]:
+        path = root / name
+        if path.exists():
+            stat = path.stat()
+            fingerprints[name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return fingerprints
+
+
+def read_csv_columns(root: Path) -> Dict[str, np.ndarray]:
+    """Parse the CSV files of one dataset directory into columnar arrays."""
+    cols = {}
+    for name, spec in CSV_COLUMNS.items():
+        path = root / name
+        rows = []
+        if path.exists():
+            with open(path, newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader)
+                idx = [header.index(csv_name) for csv_name, _, _ in spec]
+                rows = [[r[i] for i in idx] for r in reader if r]
+        elif name not in OPTIONAL_CSV:
+            raise FileNotFoundError(path)
+        for j, (_, col, dtype) in enumerate(spec):
+            cols[col] = np.array([r[j] for r in rows], dtype=np.float64).astype(dtype)
+
+    # 缓存函数位图：行对应 sec_id 的顺序，列对应 type_id 的顺序
+    cached = np.zeros((cols["sec_id"].size, cols["type_id"].size), dtype=bool)
+    cf_path = root / "cached_function.csv"
+    if cf_path.exists():
+        sec_row = {sec_id: i for i, sec_id in enumerate(cols["sec_id"].tolist())}
+        type_col = {type_id: j for j, type_id in enumerate(cols["type_id"].tolist())}
+        with open(cf_path, newline='') as f:
+            for r in csv.DictReader(f):
+                cached[sec_row[int(r["sec_id"])], type_col[int(r["function_type_id"])]] = True
+    cols["cached"] = cached
+    return cols
+
+
+def convert_dataset(scale: str, datasets_root: str = "datasets") -> Path:
+    """
+    Write the columnar .npy cache of one dataset scale.
+
+    Returns:
+        Path: The columnar directory.
+    """
+    root = Path(datasets_root) / scale
+    out_dir = root / COLUMNAR_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    fingerprints = _csv_fingerprints(root)
+    cols = read_csv_columns(root)
+    for name, arr in cols.items():
+        np.save(out_dir / f"{name}.npy", arr)
+    manifest = {"columns": sorted(cols), "sources": fingerprints}
+    (out_dir / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return out_dir
+
+
+def has_fresh_columnar(scale: str, datasets_root: str = "datasets") -> bool:
+    """True when the columnar cache exists and its manifest still matches the CSV files."""
+    root = Path(datasets_root) / scale
+    manifest_path = root / COLUMNAR_DIR / MANIFEST
+    if not manifest_path.exists():
+        return False
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    return manifest.get("sources") == _csv_fingerprints(root)
+
+
+def open_columns(scale: str, datasets_root: str = "datasets") -> Dict[str, np.ndarray]:
+    """Memory-map every column of the columnar cache (read-only)."""
+    col_dir = Path(datasets_root) / scale / COLUMNAR_DIR
+    manifest = json.loads((col_dir / MANIFEST).read_text(encoding="utf-8"))
+    return {name: np.load(col_dir / f"{name}.npy", mmap_mode="r") for name in manifest["columns"]}
+
+
+class LazyEntityTable(MutableMapping):
+    """
+    Entity table of SystemState (id -> record dict) backed by a column of ids.
+    Records are built by `factory(row)` on first access; added and deleted entries are kept in
+    overlays so the table behaves like the plain dicts used by SystemState.
+    """
+
+    def __init__(self, ids: np.ndarray, factory: Callable[[int], dict]):
+        self._ids = ids
+        self._factory = factory
+        self._row_of = None  # id -> 行号，首次按 id 访问时构建
+        self._records = {}  # 已实例化或新增的记录
+        self._added = {}  # 新增的 id（保持插入顺序）
+        self._deleted = set()
+
+    def _rows(self) -> dict:
+        if self._row_of is None:
+            self._row_of = {entity_id: row for row, entity_id in enumerate(self._ids.tolist())}
+        return self._row_of
+
+    def __getitem__(self, key):
+        record = self._records.get(key)
+        if record is not None:
+            return record
+        row = self._rows().get(key)
+        if row is None or key in self._deleted:
+            raise KeyError(key)
+        record = self._factory(row)
+        self._records[key] = record
+        return record
+
+    def __setitem__(self, key, value):
+        if key not in self._rows():
+            self._added[key] = None
+        self._deleted.discard(key)
+        self._records[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._records.pop(key, None)
+        if key in self._added:
+            del self._added[key]
+        else:
+            self._deleted.add(key)
+
+    def __contains__(self, key):
+        return key in self._added or (key in self._rows() and key not in self._deleted)
+
+    def __iter__(self):
+        for entity_id in self._ids.tolist():
+            if entity_id not in self._deleted:
+                yield entity_id
+        yield from list(self._added)
+
+    def __len__(self):
+        return len(self._ids) - len(self._deleted) + len(self._added)
+
+
+def build_state_from_columns(cols: Dict[str, np.ndarray], lazy: bool = False,
+                             ss: SystemState | None = None) -> SystemState:
+    """
+    Assemble a SystemState from columnar arrays (see CSV_COLUMNS for the column names).
+
+    Args:
+        cols (dict): Column name -> array.
+        lazy (bool): Instantiate IoT devices and function tasks on first access only.
+        ss (SystemState): Optional empty state to populate (e.g. one with non-default params).
+    """
+    ss = ss if ss is not None else SystemState()
+
+    # SEC 服务器、基站、函数类型规模较小，直接实例化
+    sec_ids = cols["sec_id"].tolist()
+    for sec_id, cpu, mem, bh_bw in zip(sec_ids, cols["sec_cpu"].tolist(), cols["sec_mem"].tolist(),
+                                       cols["sec_bh_bw"].tolist()):
+        ss.add_sec_server(SECServer(id=sec_id, comp_resource=cpu, memory=mem, backhaul_bw=bh_bw))
+    for bs_id, sec_id in zip(cols["bs_id"].tolist(), cols["bs_sec"].tolist()):
+        ss.add_base_station(bs=BaseStation(id=bs_id), associated_sec_id=sec_id)
+
+    type_ids = cols["type_id"].tolist()
+    for type_id, image_size in zip(type_ids, cols["type_image_size"].tolist()):
+        ss.add_function_type(FunctionType(id=type_id, image_size=image_size))
+
+    cached = np.asarray(cols["cached"])
+    for row, sec_id in enumerate(sec_ids):
+        ss.get_sec_server_instance(sec_id).cached_functions.update(type_ids[j] for j in np.flatnonzero(cached[row]))
+
+    # IoT 设备与函数任务
+    iot_cols = [cols[name] for name in ("iot_id", "iot_cpu", "iot_tx_power", "iot_bandwidth", "iot_channel_gain",
+                                        "iot_noise_power", "iot_bs")]
+    task_cols = [cols[name] for name in ("task_id", "task_data_size", "task_workload", "task_invocations",
+                                         "task_type", "task_iot")]
+    # 可选列：函数的 BWF 分配上下界 min_cr / max_cr（NaN 表示使用 SystemParams 的默认值）
+    bound_cols = [cols[name] for name in ("task_min_cr", "task_max_cr")] if "task_min_cr" in cols else None
+
+    def task_bounds(row: int) -> dict:
+        if bound_cols is None:
+            return {}
+        min_cr, max_cr = (c[row].item() for c in bound_cols)
+        return {'min_cr': None if math.isnan(min_cr) else min_cr, 'max_cr': None if math.isnan(max_cr) else max_cr}
+
+    def make_iot(row: int) -> dict:
+        iot_id, cpu, tx_power, bandwidth, gain, noise, bs_id = (c[row].item() for c in iot_cols)
+        iot = IoTDevice(id=iot_id, comp_resource=cpu, tx_power=tx_power, bandwidth=bandwidth, channel_gain=gain,
+                        noise_power=noise)
+        return {'instance': iot, 'associated_bs_id': bs_id}
+
+    def make_task(row: int) -> dict:
+        task_id, data_size, workload, invocations, type_id, iot_id = (c[row].item() for c in task_cols)
+        func = FunctionTask(id=task_id, data_size=data_size, workload=workload, invocations=invocations,
+                            func_type=ss.function_types[type_id]['instance'], **task_bounds(row))
+        return {'instance': func, 'associated_iot_id': iot_id}
+
+    if lazy:
+        ss.iot_devices = LazyEntityTable(cols["iot_id"], make_iot)
+        ss.functions = LazyEntityTable(cols["task_id"], make_task)
+    else:
+        for iot_id, cpu, tx_power, bandwidth, gain, noise, bs_id in zip(*(c.tolist() for c in iot_cols)):
+            iot = IoTDevice(id=iot_id, comp_resource=cpu, tx_power=tx_power, bandwidth=bandwidth,
+                            channel_gain=gain, noise_power=noise)
+            ss.add_iot_device(iot=iot, associated_bs_id=bs_id)
+        func_types = ss.function_types
+        for row, (task_id, data_size, workload, invocations, type_id, iot_id) in \
+                enumerate(zip(*(c.tolist() for c in task_cols))):
+            func = FunctionTask(id=task_id, data_size=data_size, workload=workload, invocations=invocations,
+                                func_type=func_types[type_id]['instance'], **task_bounds(row))
+            ss.add_function(func=func, associated_iot_id=iot_id)
+
+    # SEC 网络拓扑
+    sn = SECNetwork()
+    for sec in ss.get_sec_list():
+        sn.add_server(server=sec)
+    for u, v, latency, bandwidth in zip(cols["edge_src"].tolist(), cols["edge_dst"].tolist(),
+                                        cols["edge_latency"].tolist(), cols["edge_bandwidth"].tolist()):
+        sn.add_connection(u, v, latency, bandwidth)
+    ss.set_sec_network(sn)
+
+    return ss
+
+
+def load_columnar(scale: str, datasets_root: str = "datasets", lazy: bool = False) -> SystemState:
+    """Load a dataset from its memory-mapped columnar cache."""
+    with paused_gc():
+        return build_state_from_columns(open_columns(scale, datasets_root), lazy=lazy)
@@ -11,21 +11,59 @@ Author: Your Name
 
 import csv
 from pathlib import Path
+from typing import Iterator, List, Tuple
+
 from core.system_models.network_model import BaseStation, SECServer, IoTDevice, FunctionType, FunctionTask, SECNetwork
 from core.system_state import SystemState
 
 
-def load_dataset(scale: str = "large", datasets_root: str = "datasets") -> SystemState:
+def load_dataset(scale: str = "large", datasets_root: str = "datasets", use_columnar: bool = True,
+                 lazy: bool = False, use_cache: bool = True, cache_dir: str | None = None) -> SystemState:
     """
     Load a dataset of the given scale into a SystemState object.
 
     Args:
         scale (str): Dataset scale ("small", "medium", or "large"). Default is "large".
         datasets_root (str): Path to the root folder containing datasets.
+        use_columnar (bool): Use the memory-mapped columnar cache (see utils.dataset_columnar)
+            when it exists and still matches the CSV files.
+        lazy (bool): With the columnar cache, instantiate IoT devices and tasks on first access.
+        use_cache (bool): Reuse a pickled SystemState whose CSV fingerprints match (see
+            utils.dataset_cache). Not used together with lazy loading.
+        cache_dir (str): Directory of the pickled states. Default is .cache/datasets.
 
     Returns:
         SystemState: Fully populated system state ready for simulation.
     """
+    if use_cache and not lazy:
+        from utils.dataset_cache import DEFAULT_CACHE_DIR, load_cached_state
+        return load_cached_state(scale, datasets_root,
+                                 build=lambda: load_dataset(scale, datasets_root, use_columnar, use_cache=False),
+                                 cache_dir=cache_dir or DEFAULT_CACHE_DIR)
+
+    if use_columnar:
+        from utils.dataset_columnar import has_fresh_columnar, load_columnar
+        if has_fresh_columnar(scale, datasets_root):
+            return load_columnar(scale, datasets_root, lazy=lazy)
+
+    ss = load_infrastructure(scale, datasets_root)
+
+    # Load function task data and associate with IoT devices
+    for chunk in iter_task_chunks(ss, scale, datasets_root):
+        for func, iot_id in chunk:
+            ss.add_function(func=func, associated_iot_id=iot_id)
+
+    return ss
+
+
+def load_infrastructure(scale: str = "large", datasets_root: str = "datasets") -> SystemState:
+    """
+    Load the static infrastructure of a dataset (SEC servers, base stations, IoT devices, function types,
+    cached functions and the SEC network) without any function task.
+
+    Returns:
+        SystemState: System state whose function task table is empty.
+    """
     root = Path(datasets_root) / scale
     ss = SystemState()
 
@@ -73,19 +111,7 @@ def load_dataset(scale: str = "large", datasets_root: str = "datasets") -> Syste
                 sec = ss.get_sec_server_instance(int(r["sec_id"]))
                 sec.cached_functions.add(int(r["function_type_id"]))
 
-    # 6) Load function task data and associate with IoT devices
-    tasks_path = root / "function_task.csv"
-    with open(tasks_path, newline='') as f:
-        for r in csv.DictReader(f):
-            func_type = ss.function_types[int(r["func_type_id"])]["instance"]
-            func = FunctionTask(id=int(r["id"]),
-                                data_size=float(r["data_size"]),
-                                workload=float(r["workload"]),
-                                invocations=int(r["invocations"]),
-                                func_type=func_type)
-            ss.add_function(func=func, associated_iot_id=int(r["associated_iot_id"]))
-
-    # 7) Load SEC network topology (servers + connections)
+    # 6) Load SEC network topology (servers + connections)
     sn = SECNetwork()
     # Add SEC server objects to the network
     for sec_id, sec_record in ss.sec_servers.items():
@@ -100,3 +126,48 @@ def load_dataset(scale: str = "large", datasets_root: str = "datasets") -> Syste
     ss.set_sec_network(sn)
 
     return ss
+
+
+def iter_task_chunks(ss: SystemState, scale: str = "large", datasets_root: str = "datasets",
+                     chunk_size: int = 10000) -> Iterator[List[Tuple[FunctionTask, int]]]:
+    """
+    Stream function_task.csv in fixed-size chunks without materializing the whole file.
+
+    Args:
+        ss (SystemState): State holding the function types (e.g. from load_infrastructure).
+        scale (str): Dataset scale.
+        datasets_root (str): Path to the root folder containing datasets.
+        chunk_size (int): Number of tasks per chunk.
+
+    Yields:
+        list: (FunctionTask, associated IoT device id) pairs; the tasks are not added to ss.
+    """
+    tasks_path = Path(datasets_root) / scale / "function_task.csv"
+    chunk = []
+    with open(tasks_path, newline='') as f:
+        for r in csv.DictReader(f):
+            func_type = ss.function_types[int(r["func_type_id"])]["instance"]
+            func = FunctionTask(id=int(r["id"]),
+                                data_size=float(r["data_size"]),
+                                workload=float(r["workload"]),
+                                invocations=int(r["invocations"]),
+                                func_type=func_type)
+            chunk.append((func, int(r["associated_iot_id"])))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_scale(scale: str, datasets_root: str = "datasets") -> SystemState:
+    """
+    Load a named scale: CSV datasets from config.DATASET_SIZES, or synthetic instances from
+    config.SYNTHETIC_SIZES that are generated in memory.
+    """
+    from config import SYNTHETIC_SIZES
+
+    if scale in SYNTHETIC_SIZES:
+        from utils.synthetic import load_synthetic
+        return load_synthetic(scale)
+    return load_dataset(scale=scale, datasets_root=datasets_root)
@@ -4,6 +4,40 @@ from typing import List
 
 from config import *
 
+# 实验结果表头
+header = [
+    'Base Station Count', 'SEC Server Count', 'IoT Device Count', 'Function Type Count', 'Function Task Count',
+    'Latency Weight (OMEGA)', 'CPU MEM RATIO', 'Latency REF (s)', 'Energy REF (J)',
+    'Algorithm Full Name', 'Offloading Algorithm', 'Scheduling Algorithm', 'Resource Allocation Algorithm',
+    'System Cost', 'Real Latency (s)', 'Real Energy (J)', 'Offloading Ratio', 'Execution Time (s)'
+]
+
+# 多副本实验结果表头（每个配置一行，统计 R 个随机种子的结果）
+replicate_header = [
+    'Base Station Count', 'SEC Server Count', 'IoT Device Count', 'Function Type Count', 'Function Task Count',
+    'Latency Weight (OMEGA)', 'CPU MEM RATIO', 'Latency REF (s)', 'Energy REF (J)',
+    'Algorithm Full Name', 'Offloading Algorithm', 'Scheduling Algorithm', 'Resource Allocation Algorithm',
+    'Replicates', 'Seeds',
+    'System Cost Mean', 'System Cost Std', 'System Cost CI95 Low', 'System Cost CI95 High',
+    'Real Latency Mean (s)', 'Real Latency Std (s)', 'Real Energy Mean (J)', 'Real Energy Std (J)',
+    'Offloading Ratio Mean', 'Offloading Ratio Std', 'Execution Time Mean (s)'
+]
+
+# 动态负载模拟结果表头（每个时间步一行）
+dynamic_header = [
+    'Dataset', 'Mode', 'Resource Allocation Algorithm', 'Epoch', 'Function Task Count',
+    'Arrivals', 'Departures', 'Rate Changes', 'Handovers', 'Affected Functions',
+    'Decision Time (s)', 'Migrations', 'System Cost', 'Offloading Ratio', 'Status'
+]
+
+# 逐调用离散事件仿真结果表头（每个算法一行）
+event_header = [
+    'Dataset', 'Algorithm Full Name', 'Resource Allocation Algorithm', 'Period (s)', 'Keep Alive (s)', 'Arrival',
+    'Invocations', 'Dropped', 'Cold Starts', 'Latency Mean (s)', 'Latency P50 (s)', 'Latency P95 (s)',
+    'Latency P99 (s)', 'Latency Max (s)', 'Offloaded P99 (s)', 'Local P99 (s)', 'Events', 'Wall Time (s)',
+    'Cache Policy', 'Cache Hits', 'Cache Misses', 'Cache Evictions'
+]
+
 
 def new_csv_file(file_name: str, header: List[str]):
     out_dir = Path(__file__).resolve().parent.parent / "results" / file_name
@@ -21,3 +55,25 @@ def write_csv(file_name: str, rows: List[List[str]]):
     with open(out_dir, "a", newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerows(rows)
+
+
+# 缓冲写入：累积 batch_size 行后一次性追加到 CSV，避免每次写入都重新打开文件
+class BufferedCsvWriter:
+    def __init__(self, file_name: str, header: List[str], batch_size: int = 500):
+        self.file_name = file_name
+        self.batch_size = batch_size
+        self._rows = []
+        new_csv_file(file_name, header)
+
+    def write(self, rows: List[List[str]]):
+        self._rows.extend(rows)
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            write_csv(self.file_name, self._rows)
+            self._rows = []
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,225 @@
+"""
+results_store.py
+
+Local SQLite store of experiment results.
+
+Schema:
+    runs     (id, name, created_at, description)          one row per invocation (e.g. python -m elco run)
+    configs  (id, scale, bs_count, sec_count, iot_count,   distinct dataset/model settings, shared by runs
+              type_count, task_count, omega, ratio, t_ref, e_ref)
+    results  (id, run_id, config_id, header_name,           one row per result row of utils.results_recorder;
+              algorithm, offloading, scheduling,            the full row is kept as JSON next to the
+              alloc_method, row)                             indexed key columns
+
+Rows are written in batches inside one transaction (ResultsWriter). Parallel workers send their rows to a
+single ResultsWriterProcess through a multiprocessing queue, so SQLite only ever sees one writer and no row
+is lost when the workers finish at the same time.
+"""
+
+import json
+import multiprocessing as mp
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "results" / "results.db"
+
+# 结果行中配置列与算法列的位置（header 与 replicate_header 的前 13 列相同）
+CONFIG_COLUMNS = 9
+ALGORITHM_COLUMNS = slice(9, 13)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    created_at TEXT NOT NULL,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS configs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scale TEXT,
+    bs_count INTEGER, sec_count INTEGER, iot_count INTEGER, type_count INTEGER, task_count INTEGER,
+    omega REAL, ratio REAL, t_ref REAL, e_ref REAL,
+    UNIQUE (scale, bs_count, sec_count, iot_count, type_count, task_count, omega, ratio, t_ref, e_ref)
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    config_id INTEGER NOT NULL REFERENCES configs (id),
+    header_name TEXT NOT NULL,
+    algorithm TEXT, offloading TEXT, scheduling TEXT, alloc_method TEXT,
+    row TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+CREATE INDEX IF NOT EXISTS idx_results_config ON results (config_id);
+CREATE INDEX IF NOT EXISTS idx_results_algorithm ON results (algorithm);
+CREATE INDEX IF NOT EXISTS idx_configs_scale ON configs (scale);
+"""
+
+
+def _plain(value):
+    # numpy 标量转换为 Python 内置类型，便于 sqlite3 / json 处理
+    return value.item() if hasattr(value, 'item') else value
+
+
+class ResultsStore:
+    """Connection to the results database; creates the schema on first use."""
+
+    def __init__(self, db_path: str | Path = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self._config_ids = {}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def new_run(self, name: str | None = None, description: str | None = None) -> int:
+        with self.conn:
+            cur = self.conn.execute("INSERT INTO runs (name, created_at, description) VALUES (?, ?, ?)",
+                                    (name, datetime.now().isoformat(timespec='seconds'), description))
+        return cur.lastrowid
+
+    def _config_id(self, scale: str | None, config: tuple) -> int:
+        key = (scale,) + config
+        if key not in self._config_ids:
+            self.conn.execute("INSERT OR IGNORE INTO configs (scale, bs_count, sec_count, iot_count, type_count, "
+                              "task_count, omega, ratio, t_ref, e_ref) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", key)
+            # UNIQUE 不把 NULL 视为相等，scale 为空时按 IS 匹配
+            self._config_ids[key] = self.conn.execute(
+                "SELECT id FROM configs WHERE scale IS ? AND bs_count = ? AND sec_count = ? AND iot_count = ? "
+                "AND type_count = ? AND task_count = ? AND omega = ? AND ratio = ? AND t_ref = ? AND e_ref = ?",
+                key).fetchone()[0]
+        return self._config_ids[key]
+
+    def insert_rows(self, run_id: int, header_name: str, rows: Iterable[list], scale: str | None = None):
+        """Insert result rows (in the layout of results_recorder.header / replicate_header) in one transaction."""
+        with self.conn:
+            records = []
+            for row in rows:
+                if not row:
+                    continue
+                row = [_plain(v) for v in row]
+                config_id = self._config_id(scale, tuple(row[:CONFIG_COLUMNS]))
+                records.append((run_id, config_id, header_name, *row[ALGORITHM_COLUMNS], json.dumps(row)))
+            self.conn.executemany("INSERT INTO results (run_id, config_id, header_name, algorithm, offloading, "
+                                  "scheduling, alloc_method, row) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", records)
+
+    def list_runs(self) -> List[tuple]:
+        """(id, name, created_at, description, result count) of all runs."""
+        return self.conn.execute("SELECT runs.id, name, created_at, description, COUNT(results.id) FROM runs "
+                                 "LEFT JOIN results ON results.run_id = runs.id GROUP BY runs.id "
+                                 "ORDER BY runs.id").fetchall()
+
+    def query(self, header_name: str = 'header', scales: List[str] | None = None,
+              algorithms: List[str] | None = None, runs: List[int] | None = None) -> List[list]:
+        """Result rows of one header, optionally filtered by scale, algorithm (full name or pipeline) and run id."""
+        sql = ("SELECT results.row FROM results JOIN configs ON configs.id = results.config_id "
+               "WHERE results.header_name = ?")
+        args = [header_name]
+        for column, values in (('configs.scale', scales), ('results.run_id', runs)):
+            if values:
+                sql += f" AND {column} IN ({', '.join('?' * len(values))})"
+                args += list(values)
+        if algorithms:
+            # 匹配完整名称（如 'LEAO + PGES + WF'）或流水线（如 'LEAO+PGES'），忽略空格
+            names = [a.replace(' ', '') for a in algorithms]
+            marks = ', '.join('?' * len(names))
+            sql += (f" AND (REPLACE(results.algorithm, ' ', '') IN ({marks})"
+                    f" OR results.offloading || COALESCE('+' || NULLIF(results.scheduling, ''), '') IN ({marks}))")
+            args += names + names
+        sql += " ORDER BY results.id"
+        return [json.loads(row) for row, in self.conn.execute(sql, args)]
+
+
+class ResultsWriter:
+    """Buffer result rows and flush them to the store every batch_size rows (and on close)."""
+
+    def __init__(self, store: ResultsStore, run_id: int, batch_size: int = 500):
+        self.store = store
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self._buffer = {}  # (header_name, scale) -> rows
+        self._count = 0
+
+    def write(self, header_name: str, rows: Iterable[list], scale: str | None = None):
+        rows = list(rows)
+        self._buffer.setdefault((header_name, scale), []).extend(rows)
+        self._count += len(rows)
+        if self._count >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for (header_name, scale), rows in self._buffer.items():
+            self.store.insert_rows(self.run_id, header_name, rows, scale)
+        self._buffer.clear()
+        self._count = 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _writer_loop(queue, db_path: str, run_id: int, batch_size: int):
+    with ResultsStore(db_path) as store:
+        with ResultsWriter(store, run_id, batch_size) as writer:
+            while True:
+                item = queue.get()
+                if item is None:
+                    break
+                writer.write(*item)
+
+
+class ResultsWriterProcess:
+    """
+    Single writer process fed through a multiprocessing queue.
+
+    Pass ``queue`` to worker processes (e.g. via a pool initializer) and call ``send`` there; ``close`` waits
+    until every queued row has been written.
+    """
+
+    def __init__(self, db_path: str | Path = DEFAULT_DB_PATH, run_id: int | None = None, batch_size: int = 500,
+                 run_name: str | None = None, description: str | None = None):
+        if run_id is None:
+            with ResultsStore(db_path) as store:
+                run_id = store.new_run(run_name, description)
+        self.db_path = str(db_path)
+        self.run_id = run_id
+        self.queue = mp.Queue()
+        self.process = mp.Process(target=_writer_loop, args=(self.queue, self.db_path, run_id, batch_size),
+                                  daemon=True)
+        self.process.start()
+
+    def send(self, header_name: str, rows: List[list], scale: str | None = None):
+        send(self.queue, header_name, rows, scale)
+
+    def close(self):
+        self.queue.put(None)
+        self.process.join()
+        if self.process.exitcode != 0:
+            raise RuntimeError(f'results writer exited with code {self.process.exitcode}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def send(queue, header_name: str, rows: List[list], scale: str | None = None):
+    """Queue rows for a ResultsWriterProcess (usable from any worker process that holds the queue)."""
+    queue.put((header_name, [[_plain(v) for v in row] for row in rows if row], scale))
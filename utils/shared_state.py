@@ -0,0 +1,247 @@
+"""
+shared_state.py
+
+Shared-memory export of a SystemState for multiprocessing workers.
+
+The parent process writes the numeric tables of a SystemState (the columns of utils/dataset_columnar.py:
+entity attributes, mapping indexes, the SEC x function-type cache bitmap and the SEC edge list, plus the
+all-pairs routing matrices of the SEC network) into multiprocessing.shared_memory blocks. Workers receive only
+the small, picklable SharedStateHandle and attach zero-copy: the arrays are read-only views of the shared blocks,
+IoT devices and function tasks are instantiated lazily on first access, and routes are read from the shared
+matrices instead of running Dijkstra again. Worker start-up is therefore independent of the instance size and
+the tables exist once in memory regardless of the number of workers.
+
+Usage:
+    with SharedState.export(ss) as shared:
+        with ProcessPoolExecutor(initializer=init_worker, initargs=(shared.handle,)) as pool:
+            ...
+    # in the worker
+    ss = attach(handle)
+"""
+
+import math
+from dataclasses import asdict, dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from core.system_models.system_params import SystemParams
+from core.system_state import SystemState
+from utils.dataset_columnar import build_state_from_columns, paused_gc
+
+
+@dataclass(frozen=True)
+class SharedStateHandle:
+    """Picklable description of an exported SystemState: one shared memory block per column."""
+    blocks: Tuple[Tuple[str, str, str, tuple], ...]  # (column, block name, dtype, shape)
+    params: dict  # SystemParams fields
+
+
+class ReadOnlySystemState(SystemState):
+    """SystemState attached to shared memory; entities cannot be added or removed."""
+
+    _frozen = False
+
+    def _check_writable(self):
+        if self._frozen:
+            raise TypeError('共享内存上的 SystemState 是只读的')
+
+    def add_base_station(self, *args, **kwargs):
+        self._check_writable()
+        super().add_base_station(*args, **kwargs)
+
+    def add_sec_server(self, *args, **kwargs):
+        self._check_writable()
+        super().add_sec_server(*args, **kwargs)
+
+    def add_iot_device(self, *args, **kwargs):
+        self._check_writable()
+        super().add_iot_device(*args, **kwargs)
+
+    def add_function_type(self, *args, **kwargs):
+        self._check_writable()
+        super().add_function_type(*args, **kwargs)
+
+    def add_function(self, *args, **kwargs):
+        self._check_writable()
+        super().add_function(*args, **kwargs)
+
+    def remove_function(self, *args, **kwargs):
+        self._check_writable()
+        return super().remove_function(*args, **kwargs)
+
+    def set_sec_network(self, *args, **kwargs):
+        self._check_writable()
+        super().set_sec_network(*args, **kwargs)
+
+    def handover_iot(self, *args, **kwargs):
+        self._check_writable()
+        return super().handover_iot(*args, **kwargs)
+
+
+class SharedRoutes(dict):
+    """
+    Route cache of SECNetwork backed by the shared routing matrices.
+    A source's routes are materialized from its matrix row on first lookup; SECNetwork still clears the
+    cache (and falls back to Dijkstra) if the topology is modified.
+    """
+
+    def __init__(self, sec_ids: List, latency: np.ndarray, bandwidth: np.ndarray):
+        super().__init__()
+        self._sec_ids = sec_ids
+        self._row_of = {sec_id: i for i, sec_id in enumerate(sec_ids)}
+        self._latency = latency
+        self._bandwidth = bandwidth
+
+    def get(self, key, default=None):
+        if key not in self and key in self._row_of:
+            row = self._row_of[key]
+            routes = {}
+            for sec_id, lat, bw in zip(self._sec_ids, self._latency[row].tolist(), self._bandwidth[row].tolist()):
+                if not math.isnan(lat):
+                    routes[sec_id] = (lat, None if math.isnan(bw) else bw)
+            self[key] = routes
+        return super().get(key, default)
+
+    def clear(self):
+        super().clear()
+        self._row_of = {}
+
+
+def can_export(ss: SystemState) -> bool:
+    """True when the state fits the integer-id columnar layout (no container caches or non-int ids)."""
+    tables = (ss.sec_servers, ss.base_stations, ss.function_types, ss.iot_devices, ss.functions)
+    return all(isinstance(entity_id, int) for table in tables for entity_id in table) and \
+        all(sec.container_cache is None for sec in ss.get_sec_list())
+
+
+def state_to_columns(ss: SystemState) -> Dict[str, np.ndarray]:
+    """
+    Extract the numeric tables of a SystemState (the inverse of build_state_from_columns).
+
+    Returns:
+        dict: Column name -> array, including the routing matrices route_latency / route_bandwidth
+            (K x K, NaN when unreachable; the diagonal has latency 0 and bandwidth NaN).
+    """
+    cols = {}
+    secs = ss.get_sec_list()
+    cols["sec_id"] = np.array([sec.id for sec in secs], dtype=np.int64)
+    cols["sec_cpu"] = np.array([sec.comp_resource for sec in secs], dtype=np.float64)
+    cols["sec_mem"] = np.array([sec.memory for sec in secs], dtype=np.float64)
+    cols["sec_bh_bw"] = np.array([sec.backhaul_bw for sec in secs], dtype=np.float64)
+
+    cols["bs_id"] = np.array(list(ss.base_stations), dtype=np.int64)
+    cols["bs_sec"] = np.array([_val['associated_sec_id'] for _val in ss.base_stations.values()], dtype=np.int64)
+
+    iots = [(iot_id, _val['instance'], _val['associated_bs_id']) for iot_id, _val in ss.iot_devices.items()]
+    cols["iot_id"] = np.array([iot_id for iot_id, _, _ in iots], dtype=np.int64)
+    for col, attr in (("iot_cpu", "comp_resource"), ("iot_tx_power", "tx_power"), ("iot_bandwidth", "bandwidth"),
+                      ("iot_channel_gain", "channel_gain"), ("iot_noise_power", "noise_power")):
+        cols[col] = np.array([getattr(iot, attr) for _, iot, _ in iots], dtype=np.float64)
+    cols["iot_bs"] = np.array([bs_id for _, _, bs_id in iots], dtype=np.int64)
+
+    types = ss.get_function_type_list()
+    cols["type_id"] = np.array([t.id for t in types], dtype=np.int64)
+    cols["type_image_size"] = np.array([t.image_size for t in types], dtype=np.float64)
+    type_col = {t.id: j for j, t in enumerate(types)}
+    cached = np.zeros((len(secs), len(types)), dtype=bool)
+    for row, sec in enumerate(secs):
+        for type_id in sec.cached_functions:
+            cached[row, type_col[type_id]] = True
+    cols["cached"] = cached
+
+    tasks = [(_val['instance'], _val['associated_iot_id']) for _val in ss.functions.values()]
+    cols["task_id"] = np.array([func.id for func, _ in tasks], dtype=np.int64)
+    cols["task_data_size"] = np.array([func.data_size for func, _ in tasks], dtype=np.float64)
+    cols["task_workload"] = np.array([func.workload for func, _ in tasks], dtype=np.float64)
+    cols["task_invocations"] = np.array([func.invocations for func, _ in tasks], dtype=np.int64)
+    cols["task_type"] = np.array([func.func_type.id for func, _ in tasks], dtype=np.int64)
+    cols["task_iot"] = np.array([iot_id for _, iot_id in tasks], dtype=np.int64)
+    if any(func.min_cr is not None or func.max_cr is not None for func, _ in tasks):
+        cols["task_min_cr"] = np.array([np.nan if func.min_cr is None else func.min_cr for func, _ in tasks])
+        cols["task_max_cr"] = np.array([np.nan if func.max_cr is None else func.max_cr for func, _ in tasks])
+
+    sn = ss.sec_network
+    edges = list(sn.edges.items())
+    cols["edge_src"] = np.array([u for (u, _), _ in edges], dtype=np.int64)
+    cols["edge_dst"] = np.array([v for (_, v), _ in edges], dtype=np.int64)
+    cols["edge_latency"] = np.array([lat for _, (lat, _) in edges], dtype=np.float64)
+    cols["edge_bandwidth"] = np.array([bw for _, (_, bw) in edges], dtype=np.float64)
+
+    latency = np.full((len(secs), len(secs)), np.nan)
+    bandwidth = np.full((len(secs), len(secs)), np.nan)
+    for i, u in enumerate(secs):
+        latency[i, i] = 0.0
+        for j, v in enumerate(secs):
+            if i != j:
+                lat, bw = sn.get_latency_and_bandwidth(u.id, v.id)
+                if lat is not None:
+                    latency[i, j], bandwidth[i, j] = lat, bw
+    cols["route_latency"] = latency
+    cols["route_bandwidth"] = bandwidth
+    return cols
+
+
+class SharedState:
+    """Owner of the shared memory blocks of an exported SystemState (close and unlink when done)."""
+
+    def __init__(self, handle: SharedStateHandle, blocks: List[shared_memory.SharedMemory]):
+        self.handle = handle
+        self._blocks = blocks
+
+    @classmethod
+    def export(cls, ss: SystemState) -> 'SharedState':
+        """Copy the numeric tables of ss into new shared memory blocks."""
+        if not can_export(ss):
+            raise ValueError('只能导出整数 id、未启用容器缓存的 SystemState')
+        blocks, spec = [], []
+        try:
+            for name, arr in state_to_columns(ss).items():
+                arr = np.ascontiguousarray(arr)
+                shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+                blocks.append(shm)
+                np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+                spec.append((name, shm.name, arr.dtype.str, arr.shape))
+        except BaseException:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+            raise
+        return cls(SharedStateHandle(blocks=tuple(spec), params=asdict(ss.params)), blocks)
+
+    def close(self):
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def attach(handle: SharedStateHandle) -> ReadOnlySystemState:
+    """
+    Build a read-only SystemState view over the shared blocks of handle (zero-copy).
+
+    The returned state keeps the blocks open for its lifetime; only the exporting SharedState unlinks them.
+    """
+    blocks, cols = [], {}
+    for name, block_name, dtype, shape in handle.blocks:
+        shm = shared_memory.SharedMemory(name=block_name)
+        blocks.append(shm)
+        arr = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        arr.flags.writeable = False
+        cols[name] = arr
+
+    ss = ReadOnlySystemState(params=SystemParams(**handle.params))
+    with paused_gc():
+        build_state_from_columns(cols, lazy=True, ss=ss)
+    sec_ids = cols["sec_id"].tolist()
+    ss.sec_network._routes = SharedRoutes(sec_ids, cols["route_latency"], cols["route_bandwidth"])
+    ss._shared_blocks = blocks
+    ss._frozen = True
+    return ss
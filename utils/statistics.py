@@ -0,0 +1,26 @@
+import math
+from typing import Sequence
+
+# t 分布双侧 95% 分位数（自由度 1~30），自由度更大时取正态近似 1.96
+_T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+         2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+         2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def summarize(values: Sequence[float]) -> tuple[float, float, float, float]:
+    """
+    计算多次重复实验结果的统计量
+    :param values: 各副本的结果
+    :return: (均值, 样本标准差, 95%置信区间下界, 95%置信区间上界)
+    """
+    n = len(values)
+    if n == 0:
+        raise ValueError("没有可统计的结果")
+    mean = sum(values) / n
+    if n == 1:
+        return mean, 0.0, mean, mean
+
+    std = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+    t = _T_95[n - 2] if n - 1 <= len(_T_95) else 1.96
+    half_width = t * std / math.sqrt(n)
+    return mean, std, mean - half_width, mean + half_width
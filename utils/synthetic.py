@@ -0,0 +1,260 @@
+"""
+synthetic.py
+
+Generate synthetic ELCO instances directly in memory, without writing CSV files.
+Attributes follow the same distributions as scripts/generate_datasets.py, but every column
+is drawn in bulk from a seeded numpy Generator so that instances with tens of thousands of
+function tasks can be built in well under a second.
+"""
+
+import math
+from typing import Dict
+
+import numpy as np
+
+from config import SEC, FUNC, SYNTHETIC_SIZES
+from core.system_state import SystemState
+from utils.dataset_columnar import build_state_from_columns
+
+
+def draw_sec_servers(rng: np.random.Generator, bs_and_sec: int) -> Dict[str, np.ndarray]:
+    """Draw SEC servers and their base stations (one base station per SEC)."""
+    return {
+        "sec_id": np.arange(bs_and_sec),
+        "bs_id": np.arange(bs_and_sec),
+        "bs_sec": np.arange(bs_and_sec),
+        "sec_cpu": rng.choice(SEC["SEC_CPU"], size=bs_and_sec),
+        "sec_mem": rng.choice(SEC["SEC_MEM"], size=bs_and_sec),
+        "sec_bh_bw": rng.choice(SEC["SEC_BH_BW"], size=bs_and_sec),
+    }
+
+
+def draw_iot_devices(rng: np.random.Generator, iot_device: int, bs_and_sec: int) -> Dict[str, np.ndarray]:
+    """Draw IoT devices, each associated with a uniformly chosen base station."""
+    return {
+        "iot_id": np.arange(iot_device),
+        "iot_cpu": rng.integers(500, 1001, size=iot_device),
+        "iot_tx_power": rng.choice([0.1, 0.2], size=iot_device),
+        "iot_bandwidth": rng.choice([1_000_000, 2_000_000, 5_000_000], size=iot_device),
+        "iot_channel_gain": rng.uniform(1e-6, 5e-5, size=iot_device),
+        "iot_noise_power": rng.uniform(1e-8, 1e-6, size=iot_device),
+        "iot_bs": rng.integers(0, bs_and_sec, size=iot_device),
+    }
+
+
+def draw_function_types(rng: np.random.Generator, function_type: int, bs_and_sec: int) -> Dict[str, np.ndarray]:
+    """Draw function types and the cached-type bitmap (each SEC caches up to 3 types)."""
+    t = {
+        "type_id": np.arange(function_type),
+        "type_image_size": rng.integers(50, 151, size=function_type),
+    }
+    k = min(3, function_type)
+    cached_types = np.argsort(rng.random((bs_and_sec, function_type)), axis=1)[:, :k]
+    t["cached"] = np.zeros((bs_and_sec, function_type), dtype=bool)
+    np.put_along_axis(t["cached"], cached_types, True, axis=1)
+    return t
+
+
+def draw_function_tasks(rng: np.random.Generator, function_task: int, function_type: int, iot_device: int,
+                        start: int = 0) -> Dict[str, np.ndarray]:
+    """Draw function tasks with ids start .. start + function_task - 1."""
+    return {
+        "task_id": np.arange(start, start + function_task),
+        "task_data_size": rng.choice(FUNC["DATA_SIZE"], size=function_task),
+        "task_workload": rng.choice(FUNC["WORKLOAD"], size=function_task),
+        "task_invocations": rng.choice(FUNC["INVOCATION"], size=function_task),
+        "task_type": rng.integers(0, function_type, size=function_task),
+        "task_iot": rng.integers(0, iot_device, size=function_task),
+    }
+
+
+TOPOLOGIES = ('full', 'ring', 'grid', 'geometric', 'tree')
+
+
+def _ring_edges(n: int) -> set:
+    """Cycle 0 - 1 - ... - (n-1) - 0."""
+    return {(min(i, (i + 1) % n), max(i, (i + 1) % n)) for i in range(n) if n > 1 and i != (i + 1) % n}
+
+
+def _grid_edges(n: int) -> set:
+    """Row-major 2-D grid with ceil(sqrt(n)) columns; the last row may be partial."""
+    cols = max(1, math.ceil(math.sqrt(n)))
+    edges = set()
+    for i in range(n):
+        if (i + 1) % cols and i + 1 < n:
+            edges.add((i, i + 1))
+        if i + cols < n:
+            edges.add((i, i + cols))
+    return edges
+
+
+def _tree_edges(n: int, branching: int) -> set:
+    """Complete branching-ary tree rooted at SEC 0 (metro core -> aggregation -> access)."""
+    return {((i - 1) // branching, i) for i in range(1, n)}
+
+
+def _geometric_edges(rng: np.random.Generator, n: int, avg_degree: float) -> tuple:
+    """
+    Random geometric graph on the unit square with connection radius chosen for the expected degree,
+    plus the Euclidean minimum spanning forest links needed to make it connected.
+    """
+    pos = rng.random((n, 2))
+    src, dst = np.triu_indices(n, k=1)
+    dist = np.hypot(*(pos[src] - pos[dst]).T)
+    radius = math.sqrt(avg_degree / (math.pi * max(1, n - 1)))
+
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    edges = {}
+    components = n
+    for e in np.argsort(dist, kind='stable').tolist():
+        u, v, d = int(src[e]), int(dst[e]), float(dist[e])
+        ru, rv = find(u), find(v)
+        if d <= radius or ru != rv:
+            edges[(u, v)] = d
+            if ru != rv:
+                parent[ru] = rv
+                components -= 1
+        if d > radius and components <= 1:
+            break
+    return edges
+
+
+def _add_shortcuts(rng: np.random.Generator, edges: set, n: int, avg_degree: float):
+    """Add uniformly random extra links until the average degree reaches avg_degree."""
+    target = min(int(round(n * avg_degree / 2)), n * (n - 1) // 2)
+    while len(edges) < target:
+        u, v = rng.choice(n, size=2, replace=False).tolist()
+        edges.add((min(u, v), max(u, v)))
+
+
+def draw_sec_network(rng: np.random.Generator, bs_and_sec: int, topology: str = 'full',
+                     avg_degree: float | None = None) -> Dict[str, np.ndarray]:
+    """
+    Draw the SEC network.
+
+    Args:
+        rng (np.random.Generator): Random stream.
+        bs_and_sec (int): Number of SEC servers.
+        topology (str): One of TOPOLOGIES:
+            full      - every pair connected (default, as in the CSV datasets);
+            ring      - cycle through all SECs;
+            grid      - 2-D grid, SECs placed row-major;
+            geometric - random geometric graph on the unit square, latency grows with distance;
+            tree      - metro core (SEC 0), aggregation and access levels of a tree.
+        avg_degree (float): Target average degree. For geometric it sets the connection radius
+            (default 4); for ring, grid and tree random shortcut links are added on top of the base
+            topology until the degree is reached. Ignored for full.
+
+    Returns:
+        dict: edge_src, edge_dst, edge_latency (s) and edge_bandwidth (Mbps) columns.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology '{topology}', expected one of {TOPOLOGIES}")
+
+    if topology == 'full':
+        src, dst = np.triu_indices(bs_and_sec, k=1)
+        return {
+            "edge_src": src,
+            "edge_dst": dst,
+            "edge_latency": np.round(rng.uniform(0.02, 0.5, size=src.size), 6),
+            "edge_bandwidth": rng.integers(100, 1001, size=src.size),
+        }
+
+    if topology == 'geometric':
+        lengths = _geometric_edges(rng, bs_and_sec, 4.0 if avg_degree is None else avg_degree)
+        keys = sorted(lengths)
+        src = np.array([u for u, _ in keys], dtype=np.int64)
+        dst = np.array([v for _, v in keys], dtype=np.int64)
+        # Latency proportional to the distance (the diagonal of the square maps to 0.5s)
+        latency = 0.02 + 0.48 * np.array([lengths[k] for k in keys]) / math.sqrt(2)
+        return {
+            "edge_src": src,
+            "edge_dst": dst,
+            "edge_latency": np.round(latency, 6),
+            "edge_bandwidth": rng.integers(100, 1001, size=src.size),
+        }
+
+    branching = 4
+    if topology == 'ring':
+        edges = _ring_edges(bs_and_sec)
+    elif topology == 'grid':
+        edges = _grid_edges(bs_and_sec)
+    else:
+        edges = _tree_edges(bs_and_sec, branching)
+    if avg_degree is not None:
+        _add_shortcuts(rng, edges, bs_and_sec, avg_degree)
+
+    keys = sorted(edges)
+    src = np.array([u for u, _ in keys], dtype=np.int64)
+    dst = np.array([v for _, v in keys], dtype=np.int64)
+    latency = rng.uniform(0.02, 0.5, size=src.size)
+    bandwidth = rng.integers(100, 1001, size=src.size)
+    if topology == 'tree':
+        # Tree links into aggregation SECs (inner nodes) are shorter and wider than access links
+        tree = _tree_edges(bs_and_sec, branching)
+        backbone = np.array([(u, v) in tree and v * branching + 1 < bs_and_sec for u, v in keys], dtype=bool)
+        latency[backbone] = rng.uniform(0.02, 0.1, size=int(backbone.sum()))
+        bandwidth[backbone] = rng.integers(1000, 10001, size=int(backbone.sum()))
+    return {
+        "edge_src": src,
+        "edge_dst": dst,
+        "edge_latency": np.round(latency, 6),
+        "edge_bandwidth": bandwidth,
+    }
+
+
+def draw_tables(bs_and_sec: int, iot_device: int, function_type: int, function_task: int,
+                seed: int = 0, topology: str = 'full', avg_degree: float | None = None) -> Dict[str, np.ndarray]:
+    """
+    Draw all entity attributes as columnar arrays from a single seeded Generator.
+
+    Returns:
+        dict: column name -> numpy array, in the layout of utils.dataset_columnar.
+        Edge columns describe the SEC network of the given topology (see draw_sec_network).
+    """
+    rng = np.random.default_rng(seed)
+    t = {}
+    t.update(draw_sec_servers(rng, bs_and_sec))
+    t.update(draw_iot_devices(rng, iot_device, bs_and_sec))
+    t.update(draw_function_types(rng, function_type, bs_and_sec))
+    t.update(draw_function_tasks(rng, function_task, function_type, iot_device))
+    t.update(draw_sec_network(rng, bs_and_sec, topology, avg_degree))
+    return t
+
+
+def build_system_state(t: Dict[str, np.ndarray]) -> SystemState:
+    """Assemble a SystemState from columnar tables produced by draw_tables()."""
+    return build_state_from_columns(t)
+
+
+def generate_system_state(bs_and_sec: int, iot_device: int, function_type: int, function_task: int,
+                          seed: int = 0, topology: str = 'full', avg_degree: float | None = None) -> SystemState:
+    """
+    Generate a synthetic instance in memory.
+
+    Args:
+        bs_and_sec (int): Number of base stations / SEC servers.
+        iot_device (int): Number of IoT devices.
+        function_type (int): Number of function types.
+        function_task (int): Number of function tasks.
+        seed (int): Seed of the numpy Generator.
+        topology (str): SEC network topology, one of TOPOLOGIES.
+        avg_degree (float): Target average degree of the SEC network (see draw_sec_network).
+
+    Returns:
+        SystemState: Fully populated system state ready for simulation.
+    """
+    return build_system_state(draw_tables(bs_and_sec, iot_device, function_type, function_task, seed,
+                                          topology, avg_degree))
+
+
+def load_synthetic(scale: str) -> SystemState:
+    """Generate one of the predefined config.SYNTHETIC_SIZES instances."""
+    return generate_system_state(**SYNTHETIC_SIZES[scale])